@@ -39,7 +39,7 @@ from app.services.ai_service import ai_service
 from app.services.paper_service import paper_service
 from app.services.section_content_service import section_content_service
 from app.services.gemini_service import gemini_service
-from app.services.openai_service import openai_service
+from app.services.openai_service import openai_service, make_uploaded_file, parse_personalization
 from app.services.gpt_oss_service import gpt_oss_service
 from app.services.file_comparison_service import file_comparison_service
 from app.core.exceptions import (
@@ -389,7 +389,7 @@ async def send_chat_message(
                         openai_response = await openai_service.generate_response(
                             message=message_request.content,
                             files_content=[],
-                            personalization=personalization,
+                            personalization=parse_personalization(personalization),
                             paper_context=paper_ctx,
                             model=openai_model
                         )
@@ -625,11 +625,7 @@ async def send_chat_message_with_files(
 
             # Extract text from file
             extracted_text = await extract_text_from_file(file)
-            file_contents.append({
-                'filename': file.filename,
-                'content': extracted_text,
-                'size': file_size
-            })
+            file_contents.append(make_uploaded_file(file.filename, extracted_text, file_size))
 
         # Parse paper context if provided
         paper = None
@@ -793,7 +789,7 @@ async def send_chat_message_with_files(
                         openai_response = await openai_service.generate_response(
                             message=user_message_with_comparison,
                             files_content=file_contents,
-                            personalization=personalization,
+                            personalization=parse_personalization(personalization),
                             paper_context=paper_ctx,
                             model=openai_model
                         )
@@ -1352,33 +1348,24 @@ async def get_section_content(
     logger.debug(f"Fetching {section_type} content for paper {paper_id}")
 
     try:
-        content = await section_content_service.get_section_content(
+        section = await section_content_service.get_section_content(
             db=db,
             paper_id=paper_id,
             section_type=section_type,
             user_id=str(current_user.id)
         )
 
-        if content is None:
+        if section is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Section not found or you don't have access"
             )
 
-        # Get paper to retrieve section details
-        paper = await db.get(Paper, paper_id)
-        section_obj = None
-
-        for s in paper.sections:
-            if s.title == section_content_service.SECTION_TITLES.get(section_type):
-                section_obj = s
-                break
-
         return GetSectionContentResponse(
-            content=content,
+            content=section.content or "",
             sectionType=section_type,
-            wordCount=section_obj.word_count if section_obj else 0,
-            status=section_obj.status.value if section_obj else "not-started"
+            wordCount=section.word_count or 0,
+            status=section.status.value
         )
 
     except HTTPException:
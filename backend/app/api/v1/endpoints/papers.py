@@ -1,11 +1,11 @@
 """
 Paper management CRUD API endpoints
 """
-from typing import List, Optional
+from typing import BinaryIO, Iterator, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 
 from app.api.v1.endpoints.auth import get_current_user
@@ -17,12 +17,25 @@ from app.schemas.paper import (
     PaperSectionCreate, PaperSectionUpdate, PaperSectionResponse
 )
 from app.core.exceptions import NotFoundException, AuthorizationException, ValidationException
-from app.services.paper_service import paper_service
+from app.core.pagination import CursorResponse, NEXT_CURSOR_HEADER
+from app.services.paper_service import paper_service, encode_paper_cursor
 from app.services.paper_export_service import paper_export_service
+from app.services.openai_service import openai_service
 from app.schemas.paper import PaperAISettingsUpdate, PaperAISettingsResponse
 
 router = APIRouter()
 
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_export(stream: BinaryIO) -> Iterator[bytes]:
+    """Yield an export stream in chunks, closing it once fully sent"""
+    try:
+        while chunk := stream.read(EXPORT_CHUNK_SIZE):
+            yield chunk
+    finally:
+        stream.close()
+
 
 @router.post("/", response_model=PaperResponse)
 async def create_paper(
@@ -59,17 +72,24 @@ async def create_paper(
 
 @router.get("/", response_model=List[PaperListResponse])
 async def get_papers(
+        response: Response,
         current_user: User = Depends(get_current_user),
         db: AsyncSession = Depends(get_db),
         status_filter: Optional[str] = Query(None, description="Filter by paper status"),
         research_area: Optional[str] = Query(None, description="Filter by research area"),
         search: Optional[str] = Query(None, description="Search in title and abstract"),
         skip: int = Query(0, ge=0, description="Number of papers to skip"),
-        limit: int = Query(50, ge=1, le=100, description="Number of papers to return")
+        limit: int = Query(50, ge=1, le=100, description="Number of papers to return"),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page (replaces skip)")
 ):
     """
     Get user's papers with optional filtering and pagination
     Returns papers where user is EITHER owner OR collaborator
+
+    The body is the list of papers, paged by skip/limit as before. When more
+    papers follow, the X-Next-Cursor response header holds a cursor; passing
+    it back as cursor fetches the next page by keyset instead of OFFSET, so
+    deep pages cost the same as the first.
     """
 
     import logging
@@ -77,107 +97,24 @@ async def get_papers(
 
     logger.info(f"📄 Fetching papers for user {current_user.id}")
 
-    # Import selectinload for loading collaborators
-    from sqlalchemy.orm import selectinload
-
-    # ✅ STEP 1: Get papers where user is OWNER
-    owned_query = select(Paper).where(Paper.owner_id == current_user.id).options(
-        selectinload(Paper.collaborators)
-    )
-
-    # Apply filters to owned papers
-    if status_filter:
-        try:
-            status_enum = PaperStatus(status_filter)
-            owned_query = owned_query.where(Paper.status == status_enum)
-        except ValueError:
-            raise ValidationException(f"Invalid status: {status_filter}")
-
-    if research_area:
-        owned_query = owned_query.where(Paper.research_area.ilike(f"%{research_area}%"))
-
-    if search:
-        search_filter = or_(
-            Paper.title.ilike(f"%{search}%"),
-            Paper.abstract.ilike(f"%{search}%")
-        )
-        owned_query = owned_query.where(search_filter)
-
-    owned_query = owned_query.order_by(Paper.updated_at.desc())
-
-    owned_result = await db.execute(owned_query)
-    owned_papers = owned_result.scalars().all()
-
-    logger.info(f"👑 User owns {len(owned_papers)} papers")
-
-    # ✅ STEP 2: Get papers where user is COLLABORATOR
-    from app.models.paper import PaperCollaborator
-
-    collab_query = select(PaperCollaborator).where(
-        and_(
-            PaperCollaborator.user_id == current_user.id,
-            PaperCollaborator.status == "accepted"
-        )
+    # Owned and accepted-collaboration papers, filtered, ordered and paged in one query
+    papers = await paper_service.get_user_papers(
+        db=db,
+        user_id=current_user.id,
+        status_filter=status_filter,
+        research_area=research_area,
+        search=search,
+        skip=skip,
+        limit=limit + 1,  # One extra row tells whether another page follows
+        cursor=cursor
     )
 
-    collab_result = await db.execute(collab_query)
-    collaborations = collab_result.scalars().all()
-
-    logger.info(f"🤝 User is collaborator on {len(collaborations)} papers")
-
-    # Get the actual papers from collaborations
-    collab_paper_ids = [c.paper_id for c in collaborations]
-
-    collab_papers = []
-    if collab_paper_ids:
-        collab_papers_query = select(Paper).where(
-            Paper.id.in_(collab_paper_ids)
-        ).options(
-            selectinload(Paper.collaborators)
-        )
-
-        # Apply same filters to collaborative papers
-        if status_filter:
-            collab_papers_query = collab_papers_query.where(Paper.status == status_enum)
-        if research_area:
-            collab_papers_query = collab_papers_query.where(Paper.research_area.ilike(f"%{research_area}%"))
-        if search:
-            collab_papers_query = collab_papers_query.where(search_filter)
-
-        collab_papers_query = collab_papers_query.order_by(Paper.updated_at.desc())
-
-        collab_papers_result = await db.execute(collab_papers_query)
-        collab_papers = collab_papers_result.scalars().all()
-
-        logger.info(f"📋 Fetched {len(collab_papers)} collaborative papers")
-
-    # ✅ STEP 3: Combine both lists
-    all_papers = list(owned_papers) + list(collab_papers)
-
-    # Remove duplicates (if user is both owner and collaborator)
-    seen_ids = set()
-    unique_papers = []
-    for paper in all_papers:
-        if paper.id not in seen_ids:
-            seen_ids.add(paper.id)
-            unique_papers.append(paper)
-
-    # Sort by updated_at
-    unique_papers.sort(key=lambda p: p.updated_at, reverse=True)
-
-    # Apply pagination
-    paginated_papers = unique_papers[skip:skip + limit]
-
-    logger.info(f"✅ Returning {len(paginated_papers)} papers (total: {len(unique_papers)})")
-
     # Convert to PaperListResponse with collaborator count
     response_papers = []
-    for paper in paginated_papers:
+    for paper in papers:
         # Count accepted collaborators
         collab_count = len([c for c in (paper.collaborators or []) if c.status == "accepted"])
 
-        logger.info(f"📊 Paper '{paper.title[:30]}': {len(paper.collaborators or [])} total collabs, {collab_count} accepted")
-
         paper_dict = {
             "id": str(paper.id),
             "title": paper.title,
@@ -195,7 +132,13 @@ async def get_papers(
         }
         response_papers.append(PaperListResponse.model_validate(paper_dict))
 
-    return response_papers
+    page = CursorResponse[PaperListResponse].create(response_papers, encode_paper_cursor, limit)
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+
+    logger.info(f"✅ Returning {len(page.items)} papers (more: {page.has_more})")
+
+    return page.items
 
 @router.get("/{paper_id}", response_model=PaperResponse)
 async def get_paper(
@@ -572,6 +515,109 @@ async def update_paper_ai_settings(
     }
 
 
+def _generate_all_metadata(paper: Paper, user: User) -> dict:
+    """Batch metadata tying a generate-all batch to its paper and requesting user"""
+    return {"purpose": "generate-all", "paper_id": str(paper.id), "user_id": str(user.id)}
+
+
+@router.post("/{paper_id}/generate-all")
+async def generate_all_sections(
+        paper_id: str,
+        model: str = Query("gpt-3.5-turbo", description="OpenAI model for the drafts"),
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Queue a first draft of every section through the OpenAI Batch API
+
+    The drafts are produced asynchronously; poll
+    GET /{paper_id}/generate-all/{batch_id} for the results. The batch is
+    tagged with the paper and the requesting user, and only that user can
+    read it back through that paper.
+    """
+    if not openai_service.enabled:
+        raise ValidationException("OpenAI service is not configured")
+
+    paper = await paper_service.get_paper_by_id(db, paper_id)
+    if not paper:
+        raise NotFoundException("Paper")
+
+    if not paper.is_editable_by(str(current_user.id)):
+        raise AuthorizationException("You don't have permission to edit this paper")
+
+    if not paper.sections:
+        raise ValidationException("Paper has no sections to generate")
+
+    paper_ctx = {
+        'title': paper.title,
+        'research_area': paper.research_area or '',
+        'status': paper.status.value,
+        'progress': paper.progress,
+        'current_word_count': paper.current_word_count,
+        'target_word_count': paper.target_word_count,
+    }
+
+    jobs = []
+    for section in paper.sections:
+        system_prompt, user_prompt, _ = openai_service.fit_research_prompt(
+            message=f"Write a complete first draft of the \"{section.title}\" section of this paper.",
+            files_content=[],
+            personalization=None,
+            paper_context=paper_ctx,
+            model=model
+        )
+        jobs.append({
+            "custom_id": str(section.id),
+            "body": openai_service.build_chat_payload(system_prompt, user_prompt, model)
+        })
+
+    batch_id = await openai_service.submit_batch(jobs, metadata=_generate_all_metadata(paper, current_user))
+
+    return {
+        "paperId": str(paper.id),
+        "batchId": batch_id,
+        "sectionCount": len(jobs)
+    }
+
+
+@router.get("/{paper_id}/generate-all/{batch_id}")
+async def get_generate_all_status(
+        paper_id: str,
+        batch_id: str,
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """Get the status of a generate-all batch and, once completed, the drafts by section ID"""
+    if not openai_service.enabled:
+        raise ValidationException("OpenAI service is not configured")
+
+    paper = await paper_service.get_paper_by_id(db, paper_id)
+    if not paper:
+        raise NotFoundException("Paper")
+
+    if not paper.is_editable_by(str(current_user.id)):
+        raise AuthorizationException("You don't have permission to edit this paper")
+
+    # 404s unless the batch was queued by this user for this paper
+    batch = await openai_service.fetch_batch(batch_id, metadata=_generate_all_metadata(paper, current_user))
+
+    # Only expose drafts that belong to this paper's sections
+    section_ids = {str(section.id) for section in paper.sections}
+    drafts = {
+        section_id: content
+        for section_id, content in batch["results"].items()
+        if section_id in section_ids
+    }
+
+    return {
+        "paperId": str(paper.id),
+        "batchId": batch["id"],
+        "status": batch["status"],
+        "requestCounts": batch["request_counts"],
+        "drafts": drafts
+    }
+
+
 @router.get("/{paper_id}/export")
 async def export_paper(
         paper_id: str,
@@ -622,18 +668,17 @@ async def export_paper(
     if not paper.is_viewable_by(str(current_user.id)):
         raise AuthorizationException("You don't have permission to view this paper")
 
-    # Generate export based on format
+    # Generate export based on format (cached until the paper or its authors change)
+    fmt = format.lower()
     try:
-        if format.lower() == "pdf":
-            content = paper_export_service.export_to_pdf(paper)
+        stream = await paper_export_service.export(paper, fmt)
+        if fmt == "pdf":
             media_type = "application/pdf"
             extension = "pdf"
-        elif format.lower() == "word":
-            content = paper_export_service.export_to_word(paper)
+        elif fmt == "word":
             media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
             extension = "docx"
         else:  # latex
-            content = paper_export_service.export_to_latex(paper)
             media_type = "application/x-latex"
             extension = "tex"
 
@@ -644,8 +689,8 @@ async def export_paper(
 
         logger.info(f"✅ Export completed: {filename}")
 
-        return Response(
-            content=content,
+        return StreamingResponse(
+            _iter_export(stream),
             media_type=media_type,
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
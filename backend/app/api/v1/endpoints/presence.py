@@ -7,7 +7,7 @@ from typing import List, Dict
 from app.database.session import get_db
 from app.api.v1.endpoints.auth import get_current_user
 from app.models.user import User
-from app.services.presence_service import presence_service
+from app.services.presence_service import presence_service, to_iso
 
 router = APIRouter()
 
@@ -44,7 +44,7 @@ async def get_user_status(
     return {
         "user_id": user_id,
         "status": status_data['status'],
-        "last_seen": status_data['last_seen'].isoformat() if status_data['last_seen'] else None
+        "last_seen": to_iso(status_data['last_seen'])
     }
 
 
@@ -73,7 +73,7 @@ async def get_bulk_status(
     for user_id, status_data in statuses.items():
         result[user_id] = {
             "status": status_data['status'],
-            "last_seen": status_data['last_seen'].isoformat() if status_data['last_seen'] else None
+            "last_seen": to_iso(status_data['last_seen'])
         }
 
     return result
@@ -92,7 +92,7 @@ async def get_online_users(
         "users": {
             user_id: {
                 "status": data['status'],
-                "last_seen": data['last_seen'].isoformat() if data['last_seen'] else None
+                "last_seen": to_iso(data['last_seen'])
             }
             for user_id, data in online_users.items()
         }
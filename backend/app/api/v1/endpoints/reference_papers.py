@@ -95,14 +95,10 @@ async def upload_reference_paper(
 
         logger.info(f"📄 Saved reference paper: {file_path}")
 
-        # Extract text from PDF
-        extracted_text = pdf_analyzer.extract_text_from_pdf(str(file_path))
-
-        # Analyze writing style
-        writing_features = {}
+        # Extract text from PDF and analyze writing style (in a worker thread)
+        extracted_text, writing_features = await pdf_analyzer.aextract_and_analyze(str(file_path))
         is_analyzed = False
         if extracted_text:
-            writing_features = pdf_analyzer.analyze_writing_style(extracted_text)
             is_analyzed = True
             logger.info(f"✅ Analyzed paper writing style")
 
@@ -338,14 +334,13 @@ async def reanalyze_reference_paper(
             detail="Reference paper not found"
         )
 
-    # Re-extract text if needed
+    # Re-extract text if needed, then re-analyze writing style (in a worker thread)
     if not paper.content_text:
-        extracted_text = pdf_analyzer.extract_text_from_pdf(paper.file_url)
-        paper.content_text = extracted_text
+        paper.content_text, writing_features = await pdf_analyzer.aextract_and_analyze(paper.file_url)
+    else:
+        writing_features = await pdf_analyzer.aanalyze_writing_style(paper.content_text)
 
-    # Re-analyze writing style
     if paper.content_text:
-        writing_features = pdf_analyzer.analyze_writing_style(paper.content_text)
         paper.mark_as_analyzed(writing_features)
         await db.commit()
         await db.refresh(paper)
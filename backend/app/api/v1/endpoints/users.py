@@ -300,7 +300,7 @@ async def deactivate_account(
         print(f"🔍 [DELETE /users/me/account] User: {current_user.email}")
 
         # Verify password
-        if not auth_service.verify_password(deletion_request.password, current_user.hashed_password):
+        if not await auth_service.averify_password(deletion_request.password, current_user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Password is incorrect"
@@ -343,7 +343,7 @@ async def change_email(
         print(f"🔍 [POST /users/me/change-email] User: {current_user.email} -> {email_data.new_email}")
 
         # Verify password
-        if not auth_service.verify_password(email_data.password, current_user.hashed_password):
+        if not await auth_service.averify_password(email_data.password, current_user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Password is incorrect"
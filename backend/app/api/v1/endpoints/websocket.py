@@ -2,6 +2,7 @@
 WebSocket endpoints for real-time communication
 """
 import logging
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, status
 from app.services.websocket_service import connection_manager
 from app.api.v1.endpoints.auth import get_current_user_ws, get_current_user
@@ -58,7 +59,7 @@ async def websocket_endpoint(
 
     # Send welcome message (wrapped in try-catch in case connection closes immediately)
     try:
-        await websocket.send_json({
+        await connection_manager.send_json(websocket, {
             "type": "connected",
             "message": "WebSocket connection established",
             "user_id": user_id
@@ -72,7 +73,7 @@ async def websocket_endpoint(
         # Keep connection alive and handle incoming messages
         while True:
             # Receive message from client
-            data = await websocket.receive_json()
+            data = orjson.loads(await websocket.receive_text())
 
             # Handle different message types
             message_type = data.get("type")
@@ -80,7 +81,7 @@ async def websocket_endpoint(
             if message_type == "ping":
                 # Respond to ping with pong
                 try:
-                    await websocket.send_json({"type": "pong"})
+                    await connection_manager.send_json(websocket, {"type": "pong"})
                 except Exception as e:
                     logger.warning(f"⚠️ Failed to send pong: {str(e)}")
                     break
@@ -90,7 +91,7 @@ async def websocket_endpoint(
                 channel = data.get("channel")
                 logger.info(f"📡 User {user_id} subscribed to channel: {channel}")
                 try:
-                    await websocket.send_json({
+                    await connection_manager.send_json(websocket, {
                         "type": "subscribed",
                         "channel": channel
                     })
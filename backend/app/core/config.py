@@ -55,6 +55,10 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_MODEL: str = "gpt-4"
     OPENAI_MAX_TOKENS: int = 2000
+    OPENAI_MAX_CONCURRENCY: int = 10
+    OPENAI_REQUESTS_PER_MINUTE: int = 500
+    OPENAI_TOKENS_PER_MINUTE: int = 200000
+    OPENAI_MAX_RETRIES: int = 5
 
     # Google Gemini AI (FREE!)
     GEMINI_API_KEY: Optional[str] = None
@@ -10,6 +10,9 @@ from sqlalchemy.sql import Select
 
 T = TypeVar("T")
 
+# Response header carrying the next page's cursor for endpoints that return a bare list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 class PageParams(BaseModel):
     """Pagination parameters"""
@@ -15,7 +15,7 @@ engine: AsyncEngine = create_async_engine(
     echo=settings.DEBUG,  # Log SQL queries in debug mode
     future=True,
     pool_pre_ping=True,  # Verify connections before use
-    pool_recycle=3600,   # Recycle connections after 1 hour
+    pool_recycle=1800,   # Recycle connections after 30 minutes
     pool_size=10,        # Connection pool size
     max_overflow=20,     # Additional connections beyond pool_size
     # For SQLite in development (if using file-based DB)
@@ -0,0 +1,37 @@
+"""add unique constraint on paper collaborator (paper_id, user_id)
+
+Revision ID: add_paper_collaborator_unique
+Revises: add_reference_papers
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_paper_collaborator_unique'
+down_revision = 'add_reference_papers'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep a single row of any duplicated collaboration before adding the constraint
+    op.execute(
+        """
+        DELETE FROM paper_collaborators a
+        USING paper_collaborators b
+        WHERE a.paper_id = b.paper_id
+          AND a.user_id = b.user_id
+          AND a.ctid > b.ctid
+        """
+    )
+    op.create_unique_constraint(
+        'uq_paper_collaborators_paper_user',
+        'paper_collaborators',
+        ['paper_id', 'user_id']
+    )
+
+
+def downgrade():
+    op.drop_constraint('uq_paper_collaborators_paper_user', 'paper_collaborators', type_='unique')
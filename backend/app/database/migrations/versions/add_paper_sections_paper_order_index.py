@@ -0,0 +1,23 @@
+"""add paper_sections (paper_id, order) index for ordered section loads
+
+Revision ID: add_paper_sections_paper_order_index
+Revises: add_user_scheduler_cursors
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_paper_sections_paper_order_index'
+down_revision = 'add_user_scheduler_cursors'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_paper_sections_paper_order', 'paper_sections', ['paper_id', 'order'])
+
+
+def downgrade():
+    op.drop_index('ix_paper_sections_paper_order', table_name='paper_sections')
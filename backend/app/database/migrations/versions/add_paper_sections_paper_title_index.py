@@ -0,0 +1,23 @@
+"""add paper_sections (paper_id, title) index for section lookup by title
+
+Revision ID: add_paper_sections_paper_title_index
+Revises: add_users_preferences_gin
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_paper_sections_paper_title_index'
+down_revision = 'add_users_preferences_gin'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_paper_sections_paper_title', 'paper_sections', ['paper_id', 'title'])
+
+
+def downgrade():
+    op.drop_index('ix_paper_sections_paper_title', table_name='paper_sections')
@@ -0,0 +1,23 @@
+"""add papers (owner_id, updated_at, id) index for keyset pagination
+
+Revision ID: add_papers_owner_updated_index
+Revises: add_paper_collaborator_unique
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_papers_owner_updated_index'
+down_revision = 'add_paper_collaborator_unique'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_papers_owner_updated_id', 'papers', ['owner_id', 'updated_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_papers_owner_updated_id', table_name='papers')
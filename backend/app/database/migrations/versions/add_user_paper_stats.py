@@ -0,0 +1,159 @@
+"""add trigger-maintained user_paper_stats summary table
+
+Revision ID: add_user_paper_stats
+Revises: add_papers_owner_updated_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_paper_stats'
+down_revision = 'add_papers_owner_updated_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create user_paper_stats, the trigger keeping it current, and backfill it"""
+    op.create_table(
+        'user_paper_stats',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('total_papers', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_words', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('progress_sum', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('active_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('by_status', postgresql.JSONB(), nullable=False, server_default='{}'),
+        sa.Column('by_research_area', postgresql.JSONB(), nullable=False, server_default='{}'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text("(now() at time zone 'utc')")),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Keep each owner's row current by applying the changed paper's own
+    # contribution, instead of re-scanning all of the owner's papers. The
+    # upsert's ON CONFLICT DO UPDATE locks the stats row and re-reads its latest
+    # version, so concurrent writes to one owner's papers queue up and add up
+    # (a READ COMMITTED recompute could commit a count that missed the other)
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION jsonb_add_count(counts jsonb, k text, d integer) RETURNS jsonb AS $$
+            SELECT CASE
+                WHEN k IS NULL THEN counts
+                WHEN coalesce((counts->>k)::integer, 0) + d <= 0 THEN counts - k
+                ELSE counts || jsonb_build_object(k, coalesce((counts->>k)::integer, 0) + d)
+            END
+        $$ LANGUAGE sql IMMUTABLE;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION add_user_paper_stats(
+            uid uuid, sign integer, paper_status text, area text, words integer, paper_progress integer
+        ) RETURNS void AS $$
+        DECLARE
+            active integer := CASE WHEN paper_status <> 'ARCHIVED' THEN 1 ELSE 0 END;
+        BEGIN
+            area := nullif(area, '');
+
+            INSERT INTO user_paper_stats AS s (
+                user_id, total_papers, total_words, progress_sum, active_count,
+                by_status, by_research_area, updated_at
+            )
+            VALUES (
+                uid,
+                sign,
+                sign * words,
+                sign * active * paper_progress,
+                sign * active,
+                jsonb_add_count('{}'::jsonb, paper_status, sign),
+                jsonb_add_count('{}'::jsonb, area, sign),
+                now() at time zone 'utc'
+            )
+            ON CONFLICT (user_id) DO UPDATE SET
+                total_papers = s.total_papers + sign,
+                total_words = s.total_words + sign * words,
+                progress_sum = s.progress_sum + sign * active * paper_progress,
+                active_count = s.active_count + sign * active,
+                by_status = jsonb_add_count(s.by_status, paper_status, sign),
+                by_research_area = jsonb_add_count(s.by_research_area, area, sign),
+                updated_at = EXCLUDED.updated_at;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION papers_user_stats_trigger() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE'
+               AND (NEW.owner_id, NEW.status, NEW.current_word_count, NEW.progress, NEW.research_area)
+                   IS NOT DISTINCT FROM
+                   (OLD.owner_id, OLD.status, OLD.current_word_count, OLD.progress, OLD.research_area) THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP <> 'INSERT' THEN
+                PERFORM add_user_paper_stats(OLD.owner_id, -1, OLD.status::text, OLD.research_area,
+                                             OLD.current_word_count, OLD.progress);
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                PERFORM add_user_paper_stats(NEW.owner_id, 1, NEW.status::text, NEW.research_area,
+                                             NEW.current_word_count, NEW.progress);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE TRIGGER papers_user_stats
+        AFTER INSERT OR DELETE OR UPDATE OF owner_id, status, current_word_count, progress, research_area
+        ON papers
+        FOR EACH ROW EXECUTE FUNCTION papers_user_stats_trigger();
+        """
+    )
+
+    # Backfill existing owners. CREATE TRIGGER holds a lock on papers that blocks
+    # writes until this migration commits, so no delta can race the backfill
+    op.execute(
+        """
+        INSERT INTO user_paper_stats (
+            user_id, total_papers, total_words, progress_sum, active_count,
+            by_status, by_research_area
+        )
+        SELECT
+            p.owner_id,
+            count(*),
+            sum(p.current_word_count),
+            coalesce(sum(p.progress) FILTER (WHERE p.status <> 'ARCHIVED'), 0),
+            count(*) FILTER (WHERE p.status <> 'ARCHIVED'),
+            coalesce((
+                SELECT jsonb_object_agg(g.status, g.n)
+                FROM (SELECT status, count(*) AS n FROM papers
+                      WHERE owner_id = p.owner_id GROUP BY status) g
+            ), '{}'::jsonb),
+            coalesce((
+                SELECT jsonb_object_agg(g.research_area, g.n)
+                FROM (SELECT research_area, count(*) AS n FROM papers
+                      WHERE owner_id = p.owner_id AND research_area IS NOT NULL AND research_area <> ''
+                      GROUP BY research_area) g
+            ), '{}'::jsonb)
+        FROM papers p
+        GROUP BY p.owner_id
+        """
+    )
+
+
+def downgrade():
+    """Drop the trigger, its functions and user_paper_stats"""
+    op.execute("DROP TRIGGER IF EXISTS papers_user_stats ON papers")
+    op.execute("DROP FUNCTION IF EXISTS papers_user_stats_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS add_user_paper_stats(uuid, integer, text, text, integer, integer)")
+    op.execute("DROP FUNCTION IF EXISTS jsonb_add_count(jsonb, text, integer)")
+    op.drop_table('user_paper_stats')
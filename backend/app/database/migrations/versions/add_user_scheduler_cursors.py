@@ -0,0 +1,30 @@
+"""add user scheduler send cursors
+
+Revision ID: add_user_scheduler_cursors
+Revises: generate_paper_section_word_count
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_scheduler_cursors'
+down_revision = 'generate_paper_section_word_count'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # When the weekly report / AI suggestion emails were last sent to a user
+    op.add_column('users', sa.Column('last_weekly_report_at', sa.DateTime(), nullable=True))
+    op.add_column('users', sa.Column('last_ai_suggestion_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_users_last_weekly_report_at', 'users', ['last_weekly_report_at'])
+    op.create_index('ix_users_last_ai_suggestion_at', 'users', ['last_ai_suggestion_at'])
+
+
+def downgrade():
+    op.drop_index('ix_users_last_ai_suggestion_at', table_name='users')
+    op.drop_index('ix_users_last_weekly_report_at', table_name='users')
+    op.drop_column('users', 'last_ai_suggestion_at')
+    op.drop_column('users', 'last_weekly_report_at')
@@ -0,0 +1,28 @@
+"""add GIN index on users.preferences for notification flag filters
+
+Revision ID: add_users_preferences_gin
+Revises: add_user_paper_stats
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_users_preferences_gin'
+down_revision = 'add_user_paper_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # preferences is a JSON column, so the index is on its JSONB cast; the
+    # scheduler's @> filters use the same expression
+    op.execute(
+        "CREATE INDEX ix_users_preferences_gin ON users "
+        "USING gin ((preferences::jsonb) jsonb_path_ops)"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_users_preferences_gin', table_name='users')
@@ -0,0 +1,35 @@
+"""generate paper_sections.word_count from content
+
+Revision ID: generate_paper_section_word_count
+Revises: add_paper_sections_paper_title_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'generate_paper_section_word_count'
+down_revision = 'add_paper_sections_paper_title_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A column cannot be turned into a generated one in place, so it is
+    # re-added; existing rows are computed from their content
+    op.drop_column('paper_sections', 'word_count')
+    op.add_column(
+        'paper_sections',
+        sa.Column(
+            'word_count',
+            sa.Integer(),
+            sa.Computed(r"coalesce(regexp_count(content, '\S+'), 0)", persisted=True),
+            nullable=False
+        )
+    )
+
+
+def downgrade():
+    # Keeps the current values as a plain column
+    op.execute("ALTER TABLE paper_sections ALTER COLUMN word_count DROP EXPRESSION")
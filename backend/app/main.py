@@ -3,7 +3,7 @@ Research Platform API - Main FastAPI Application
 """
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 import logging
 from contextlib import asynccontextmanager
@@ -11,11 +11,14 @@ from contextlib import asynccontextmanager
 from app.api.router import api_router
 from app.core.config import settings
 from app.core.exceptions import ResearchPlatformException
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.database.connection import engine
 from app.database.session import DatabaseSession
 from app.models.base import Base
 from app.services.scheduler_service import scheduler_service
 from app.services.presence_service import presence_service
+from app.services.openai_service import openai_service
+from app.services.zotero_service import zotero_service
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -61,6 +64,10 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Scheduler service failed to stop: {str(e)}")
 
+    # Close pooled HTTP connections
+    await openai_service.aclose()
+    await zotero_service.aclose()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -69,6 +76,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    # Responses are encoded with orjson rather than the stdlib json module
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -79,6 +88,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -44,6 +44,7 @@ from app.models.comment import PaperComment
 # Analytics models
 from app.models.analytics import (
     UserAnalytics,
+    UserPaperStats,
     PaperAnalytics,
     ActivityLog
 )
@@ -94,6 +95,7 @@ __all__ = [
 
     # Analytics
     "UserAnalytics",
+    "UserPaperStats",
     "PaperAnalytics",
     "ActivityLog",
 
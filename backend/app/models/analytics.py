@@ -3,9 +3,9 @@ Analytics models (app/models/analytics.py)
 """
 from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, JSON, Text
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from datetime import datetime
-from app.models.base import BaseModel
+from app.models.base import Base, BaseModel
 
 
 class UserAnalytics(BaseModel):
@@ -38,6 +38,32 @@ class UserAnalytics(BaseModel):
     user = relationship("User", back_populates="analytics")
 
 
+class UserPaperStats(Base):
+    """
+    Per-owner paper aggregates, maintained by a trigger on papers
+
+    Read-only from the app: the papers_user_stats trigger subtracts a
+    paper's old contribution and adds its new one whenever the paper is
+    inserted, deleted, or has its owner, status, word count, progress or
+    research area changed.
+    """
+    __tablename__ = "user_paper_stats"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+
+    total_papers = Column(Integer, default=0, nullable=False)
+    total_words = Column(Integer, default=0, nullable=False)
+
+    # Progress of non-archived papers, averaged on read
+    progress_sum = Column(Integer, default=0, nullable=False)
+    active_count = Column(Integer, default=0, nullable=False)
+
+    by_status = Column(JSONB, nullable=False, default={})  # {STATUS_NAME: count}
+    by_research_area = Column(JSONB, nullable=False, default={})  # {area: count}
+
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class PaperAnalytics(BaseModel):
     """Paper-specific analytics"""
     __tablename__ = "paper_analytics"
@@ -5,7 +5,7 @@ backend/app/models/oauth_token.py
 from sqlalchemy import Column, String, DateTime, Text, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import uuid
 
 from app.models.base import BaseModel
@@ -38,11 +38,13 @@ class OAuthToken(BaseModel):
     def __repr__(self) -> str:
         return f"<OAuthToken(user_id={self.user_id}, service='{self.service}')>"
 
-    def is_expired(self) -> bool:
-        """Check if the token is expired"""
+    def is_expired(self, leeway_seconds: int = 0) -> bool:
+        """Check if the token is expired (or will be within leeway_seconds)"""
         if not self.expires_at:
             return False
-        return datetime.utcnow() >= self.expires_at
+        # expires_at is stored as naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return now + timedelta(seconds=leeway_seconds) >= self.expires_at
 
     def to_dict(self) -> dict:
         """Convert to dictionary"""
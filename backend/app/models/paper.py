@@ -2,7 +2,7 @@
 Paper database model - COMPLETE CLEAN VERSION
 backend/app/models/paper.py
 """
-from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, ForeignKey, JSON, Enum
+from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, ForeignKey, JSON, Enum, UniqueConstraint, Index, Computed
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy.dialects.postgresql import UUID
@@ -34,6 +34,10 @@ class SectionStatus(str, enum.Enum):
 class Paper(BaseModel):
     """Paper model for research paper management"""
     __tablename__ = "papers"
+    __table_args__ = (
+        # Serves owner-scoped "newest first" keyset pagination (scanned backwards)
+        Index('ix_papers_owner_updated_id', 'owner_id', 'updated_at', 'id'),
+    )
 
     # Basic paper information
     title = Column(String(500), nullable=False)
@@ -295,12 +299,25 @@ class Paper(BaseModel):
 class PaperSection(BaseModel):
     """Paper section model"""
     __tablename__ = "paper_sections"
+    __table_args__ = (
+        # Section lookup by title within a paper (titles are not unique)
+        Index('ix_paper_sections_paper_title', 'paper_id', 'title'),
+        # Serves Paper.sections loads, which are ordered by "order"
+        Index('ix_paper_sections_paper_order', 'paper_id', 'order'),
+    )
+    # Fetch the generated word_count with RETURNING on INSERT and UPDATE
+    __mapper_args__ = {"eager_defaults": True}
 
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=True, default="")
     status = Column(Enum(SectionStatus), default=SectionStatus.NOT_STARTED, nullable=False)
     order = Column(Integer, nullable=False, default=0)
-    word_count = Column(Integer, default=0, nullable=False)
+    # Generated by PostgreSQL from content (whitespace-separated words)
+    word_count = Column(
+        Integer,
+        Computed(r"coalesce(regexp_count(content, '\S+'), 0)", persisted=True),
+        nullable=False
+    )
 
     # Parent paper relationship
     paper_id = Column(UUID(as_uuid=True), ForeignKey("papers.id"), nullable=False)
@@ -317,21 +334,9 @@ class PaperSection(BaseModel):
     def __repr__(self) -> str:
         return f"<PaperSection(id={self.id}, title='{self.title}', status='{self.status}')>"
 
-    def update_word_count(self) -> int:
-        """Update word count based on content"""
-        if self.content:
-            # Simple word count (can be improved with better text processing)
-            words = len(self.content.split())
-            self.word_count = words
-        else:
-            self.word_count = 0
-
-        return self.word_count
-
     def set_content(self, content: str) -> None:
-        """Set section content and update word count"""
+        """Set section content (word_count is regenerated by the database)"""
         self.content = content
-        self.update_word_count()
         self.updated_at = datetime.utcnow()
 
         # Auto-update status based on content
@@ -345,6 +350,9 @@ class PaperSection(BaseModel):
 class PaperCollaborator(BaseModel):
     """Paper collaborator relationship model"""
     __tablename__ = "paper_collaborators"
+    __table_args__ = (
+        UniqueConstraint('paper_id', 'user_id', name='uq_paper_collaborators_paper_user'),
+    )
 
     # Collaboration role
     role = Column(String(50), default="viewer", nullable=False)  # viewer, editor, co-author
@@ -39,6 +39,10 @@ class User(BaseModel):
     last_active_at = Column(DateTime, nullable=True)
     email_verified_at = Column(DateTime, nullable=True)
 
+    # When the scheduler last sent each periodic email (its "due" cursor)
+    last_weekly_report_at = Column(DateTime, nullable=True, index=True)
+    last_ai_suggestion_at = Column(DateTime, nullable=True, index=True)
+
     # User preferences stored as JSON with proper default
     preferences = Column(JSON, nullable=True, default=lambda: {
         "theme": "light",
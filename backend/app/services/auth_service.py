@@ -1,6 +1,7 @@
 """
 Authentication service for user management and JWT token handling
 """
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from passlib.context import CryptContext
@@ -48,6 +49,14 @@ class AuthService:
                 password = password[:72]
         return self.pwd_context.hash(password)
 
+    async def averify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password in a worker thread (bcrypt is slow and CPU bound)"""
+        return await asyncio.to_thread(self.verify_password, plain_password, hashed_password)
+
+    async def aget_password_hash(self, password: str) -> str:
+        """Hash a password in a worker thread (bcrypt is slow and CPU bound)"""
+        return await asyncio.to_thread(self.get_password_hash, password)
+
     def create_access_token(self, data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
         """Create JWT access token"""
         to_encode = data.copy()
@@ -91,7 +100,7 @@ class AuthService:
         if not user:
             return None
 
-        if not self.verify_password(password, user.hashed_password):
+        if not await self.averify_password(password, user.hashed_password):
             return None
 
         if not user.is_active:
@@ -123,7 +132,7 @@ class AuthService:
             raise ValidationException("Password must be at least 8 characters long")
 
         # Create new user
-        hashed_password = self.get_password_hash(password)
+        hashed_password = await self.aget_password_hash(password)
 
         user = User(
             email=email,
@@ -198,7 +207,7 @@ class AuthService:
         """Change user password"""
 
         # Verify current password
-        if not self.verify_password(current_password, user.hashed_password):
+        if not await self.averify_password(current_password, user.hashed_password):
             raise ValidationException("Current password is incorrect")
 
         # Validate new password
@@ -209,7 +218,7 @@ class AuthService:
             raise ValidationException("New password must be different from current password")
 
         # Update password
-        user.hashed_password = self.get_password_hash(new_password)
+        user.hashed_password = await self.aget_password_hash(new_password)
         user.updated_at = datetime.utcnow()
 
         await db.commit()
@@ -254,7 +263,7 @@ class AuthService:
                 raise ValidationException("Password must be at least 8 characters long")
 
             # Update password
-            user.hashed_password = self.get_password_hash(new_password)
+            user.hashed_password = await self.aget_password_hash(new_password)
             user.updated_at = datetime.utcnow()
 
             await db.commit()
@@ -240,6 +240,88 @@ class EmailService:
             html_content=html
         )
 
+    async def send_weekly_report(
+        self,
+        to_email: str,
+        to_name: str,
+        papers_worked_on: int,
+        total_words_written: int,
+        comments_received: int,
+        upcoming_deadlines: List[Dict[str, Any]],
+        paper_progress: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Send weekly progress report"""
+        progress_rows = "".join(
+            f"<li>{paper['title']}: <strong>{paper['progress']}%</strong></li>"
+            for paper in paper_progress
+        )
+        deadline_rows = "".join(
+            f"<li>{deadline['title']}: {deadline['deadline']}</li>"
+            for deadline in upcoming_deadlines
+        )
+
+        html = f"""
+        <html>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <h2>Your Weekly Research Report 📊</h2>
+                <p>Hi {to_name},</p>
+                <p>Here is your progress this week:</p>
+                <ul>
+                    <li>📄 Papers worked on: <strong>{papers_worked_on}</strong></li>
+                    <li>✍️ Words written: <strong>{total_words_written}</strong></li>
+                    <li>💬 Comments received: <strong>{comments_received}</strong></li>
+                </ul>
+                {f"<h3>Paper Progress</h3><ul>{progress_rows}</ul>" if progress_rows else ""}
+                {f"<h3>Upcoming Deadlines</h3><ul>{deadline_rows}</ul>" if deadline_rows else ""}
+                <br>
+                <p>Keep up the great work!</p>
+                <p>Best regards,<br>The Research Platform Team</p>
+            </div>
+        </body>
+        </html>
+        """
+
+        return await self.send_email(
+            to_email=to_email,
+            subject="Your Weekly Research Report 📊",
+            html_content=html
+        )
+
+    async def send_ai_suggestion(
+        self,
+        to_email: str,
+        to_name: str,
+        paper_title: str,
+        suggestions: List[str],
+        paper_url: str
+    ) -> Dict[str, Any]:
+        """Send AI research suggestions for a paper"""
+        suggestion_rows = "".join(f"<li>{suggestion}</li>" for suggestion in suggestions)
+
+        html = f"""
+        <html>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <h2>AI Suggestions for Your Paper 🤖</h2>
+                <p>Hi {to_name},</p>
+                <p>Here are some suggestions for <strong>"{paper_title}"</strong>:</p>
+                <ul>{suggestion_rows}</ul>
+                <br>
+                <p><a href="{paper_url}" style="background-color: #4F46E5; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">Open Paper</a></p>
+                <br>
+                <p>You received this email because AI suggestions are enabled in your notification settings.</p>
+            </div>
+        </body>
+        </html>
+        """
+
+        return await self.send_email(
+            to_email=to_email,
+            subject=f"AI Suggestions: {paper_title}",
+            html_content=html
+        )
+
 
 # Create singleton instance
 email_service = EmailService()
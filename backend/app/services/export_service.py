@@ -80,7 +80,7 @@ class ExportService:
                     "order": section.order,
                     "word_count": section.word_count
                 }
-                for section in sorted(sections, key=lambda x: x.order)
+                for section in sections
             ],
             "export_metadata": {
                 "format": "json",
@@ -127,7 +127,7 @@ class ExportService:
             content += ", ".join(collaborator_names) + "\n\n"
 
         # Add sections
-        for section in sorted(sections, key=lambda x: x.order):
+        for section in sections:
             content += f"## {section.title}\n\n"
             if section.content:
                 content += f"{section.content}\n\n"
@@ -177,7 +177,7 @@ class ExportService:
             content += "\\end{abstract}\n\n"
 
         # Add sections
-        for section in sorted(sections, key=lambda x: x.order):
+        for section in sections:
             content += f"\\section{{{section.title}}}\n\n"
             if section.content:
                 content += f"{section.content}\n\n"
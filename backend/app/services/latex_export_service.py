@@ -2,15 +2,67 @@
 LaTeX export service
 backend/app/services/latex_export_service.py
 """
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
+
+# Contiguous runs of markdown list lines, matched as whole blocks
+_BULLET_BLOCK = re.compile(r'(?:^[ \t]*[-*] .*(?:\n|$))+', re.M)
+_NUM_BLOCK = re.compile(r'(?:^[ \t]*\d+\.\s.*(?:\n|$))+', re.M)
+_NUM_PREFIX = re.compile(r'^\d+\.\s')
+
+# Inline markdown spans, recognised in one left-to-right scan
+_INLINE_MARKUP = re.compile(
+    r'\*\*(?P<bold>.+?)\*\*'
+    r'|\*(?P<italic>(?!\s).+?)\*'
+    r'|`(?P<code>.+?)`'
+    r'|\[(?P<link_text>.+?)\]\((?P<url>.+?)\)'
+)
+
+# LaTeX special characters and their escapes, applied in a single str.translate pass
+_LATEX_ESCAPES = str.maketrans({
+    '\\': '\\textbackslash{}',
+    '&': '\\&',
+    '%': '\\%',
+    '$': '\\$',
+    '#': '\\#',
+    '_': '\\_',
+    '{': '\\{',
+    '}': '\\}',
+    '~': '\\textasciitilde{}',
+    '^': '\\textasciicircum{}'
+})
+
+# Heading command per section level; deeper levels fall back to \paragraph
+_SECTION_CMDS = {1: '\\section', 2: '\\subsection', 3: '\\subsubsection'}
+
+
+def _wrap_list_block(block: str, environment: str, strip_marker: Callable[[str], str]) -> str:
+    """Rewrite a matched list block as a LaTeX list environment"""
+    trailing = '\n' if block.endswith('\n') else ''
+    items = [
+        f'  \\item {strip_marker(line.strip())}'
+        for line in block.rstrip('\n').split('\n')
+    ]
+    return '\n'.join([f'\\begin{{{environment}}}', *items, f'\\end{{{environment}}}']) + trailing
+
+
+def _wrap_itemize(match: re.Match[str]) -> str:
+    return _wrap_list_block(match.group(0), 'itemize', lambda item: item[2:])
+
+
+def _wrap_enumerate(match: re.Match[str]) -> str:
+    return _wrap_list_block(match.group(0), 'enumerate', lambda item: _NUM_PREFIX.sub('', item))
+
 
 class LaTeXExportService:
     """Service for exporting papers to LaTeX format"""
 
-    def __init__(self):
-        self.document_classes = {
+    def __init__(self) -> None:
+        self.document_classes: Dict[str, str] = {
             'article': 'article',
             'paper': 'article',
             'thesis': 'report',
@@ -24,9 +76,10 @@ class LaTeXExportService:
         include_bibliography: bool = True
     ) -> str:
         """Convert a paper to LaTeX format"""
+        escape = self._escape_latex
         try:
             # Start building LaTeX document
-            latex_content = []
+            latex_content: List[str] = []
 
             # Document class
             latex_content.append(f"\\documentclass[12pt,a4paper]{{{document_class}}}")
@@ -48,13 +101,13 @@ class LaTeXExportService:
             latex_content.append("")
 
             # Title, author, date
-            title = self._escape_latex(paper_data.get('title', 'Untitled'))
+            title = escape(paper_data.get('title', 'Untitled'))
             latex_content.append(f"\\title{{{title}}}")
 
             # Authors
             authors = paper_data.get('authors', [])
             if authors:
-                author_str = " \\and ".join([self._escape_latex(a) for a in authors])
+                author_str = " \\and ".join(map(escape, authors))
                 latex_content.append(f"\\author{{{author_str}}}")
             else:
                 latex_content.append("\\author{Author Name}")
@@ -72,15 +125,15 @@ class LaTeXExportService:
             abstract = paper_data.get('abstract', '')
             if abstract:
                 latex_content.append("\\begin{abstract}")
-                latex_content.append(self._escape_latex(abstract))
+                latex_content.append(escape(abstract))
                 latex_content.append("\\end{abstract}")
                 latex_content.append("")
 
             # Sections
             sections = paper_data.get('sections', [])
+            convert_section = self._convert_section_to_latex
             for section in sections:
-                section_latex = self._convert_section_to_latex(section)
-                latex_content.append(section_latex)
+                latex_content.append(convert_section(section))
                 latex_content.append("")
 
             # Bibliography
@@ -92,26 +145,20 @@ class LaTeXExportService:
 
             return "\n".join(latex_content)
 
-        except Exception as e:
-            print(f"❌ Failed to export to LaTeX: {str(e)}")
+        except Exception:
+            logger.exception("❌ Failed to export to LaTeX")
             raise
 
     def _convert_section_to_latex(self, section: Dict) -> str:
         """Convert a section to LaTeX format"""
-        latex_lines = []
+        latex_lines: List[str] = []
 
         # Section title
         title = self._escape_latex(section.get('title', ''))
         level = section.get('level', 1)
 
-        if level == 1:
-            latex_lines.append(f"\\section{{{title}}}")
-        elif level == 2:
-            latex_lines.append(f"\\subsection{{{title}}}")
-        elif level == 3:
-            latex_lines.append(f"\\subsubsection{{{title}}}")
-        else:
-            latex_lines.append(f"\\paragraph{{{title}}}")
+        cmd = _SECTION_CMDS.get(level, '\\paragraph')
+        latex_lines.append(f"{cmd}{{{title}}}")
 
         # Section content
         content = section.get('content', '')
@@ -124,68 +171,48 @@ class LaTeXExportService:
 
     def _convert_content_to_latex(self, content: str) -> str:
         """Convert content with markdown-like formatting to LaTeX"""
-        # Escape special LaTeX characters first
-        text = self._escape_latex(content)
-
-        # Convert **bold** to \textbf{}
-        text = re.sub(r'\*\*(.+?)\*\*', r'\\textbf{\1}', text)
-
-        # Convert *italic* to \textit{}
-        text = re.sub(r'\*(.+?)\*', r'\\textit{\1}', text)
-
-        # Convert `code` to \texttt{}
-        text = re.sub(r'`(.+?)`', r'\\texttt{\1}', text)
-
-        # Convert [text](url) to \href{url}{text}
-        text = re.sub(r'\[(.+?)\]\((.+?)\)', r'\\href{\2}{\1}', text)
+        # Escape and convert inline formatting in a single pass
+        text = self._convert_inline_to_latex(content)
 
         # Convert bullet lists
         text = self._convert_lists_to_latex(text)
 
         return text
 
-    def _convert_lists_to_latex(self, text: str) -> str:
-        """Convert markdown lists to LaTeX itemize/enumerate"""
-        lines = text.split('\n')
-        result = []
-        in_list = False
-        list_type = None
-
-        for line in lines:
-            # Check for bullet list
-            if line.strip().startswith('- ') or line.strip().startswith('* '):
-                if not in_list:
-                    result.append('\\begin{itemize}')
-                    in_list = True
-                    list_type = 'itemize'
-                item_text = line.strip()[2:]
-                result.append(f'  \\item {item_text}')
-
-            # Check for numbered list
-            elif re.match(r'^\d+\.\s', line.strip()):
-                if not in_list:
-                    result.append('\\begin{enumerate}')
-                    in_list = True
-                    list_type = 'enumerate'
-                item_text = re.sub(r'^\d+\.\s', '', line.strip())
-                result.append(f'  \\item {item_text}')
-
+    def _convert_inline_to_latex(self, text: str) -> str:
+        """Escape text and convert **bold**, *italic*, `code` and [text](url) spans"""
+        escape = self._escape_latex
+        parts: List[str] = []
+        pos = 0
+
+        for match in _INLINE_MARKUP.finditer(text):
+            parts.append(escape(text[pos:match.start()]))
+            bold, italic, code, link_text, url = match.groups()
+
+            if bold is not None:
+                parts.append(f"\\textbf{{{self._convert_inline_to_latex(bold)}}}")
+            elif italic is not None:
+                parts.append(f"\\textit{{{self._convert_inline_to_latex(italic)}}}")
+            elif code is not None:
+                parts.append(f"\\texttt{{{escape(code)}}}")
             else:
-                if in_list:
-                    result.append(f'\\end{{{list_type}}}')
-                    in_list = False
-                    list_type = None
-                result.append(line)
+                parts.append(f"\\href{{{escape(url)}}}{{{self._convert_inline_to_latex(link_text)}}}")
+
+            pos = match.end()
 
-        # Close list if still open
-        if in_list:
-            result.append(f'\\end{{{list_type}}}')
+        parts.append(escape(text[pos:]))
+        return ''.join(parts)
 
-        return '\n'.join(result)
+    def _convert_lists_to_latex(self, text: str) -> str:
+        """Convert markdown lists to LaTeX itemize/enumerate"""
+        text = _BULLET_BLOCK.sub(_wrap_itemize, text)
+        text = _NUM_BLOCK.sub(_wrap_enumerate, text)
+        return text
 
     def _create_bibliography(self, references: List[Dict]) -> str:
         """Create bibliography section"""
-        bib_lines = []
+        bib_lines: List[str] = []
+        escape = self._escape_latex
 
         bib_lines.append("\\begin{thebibliography}{99}")
         bib_lines.append("")
@@ -193,7 +220,7 @@ class LaTeXExportService:
         for i, ref in enumerate(references, 1):
             # Format: \bibitem{ref1} Author, "Title," Publication, Year.
             authors = ', '.join(ref.get('authors', []))
-            title = self._escape_latex(ref.get('title', ''))
+            title = escape(ref.get('title', ''))
             publication = ref.get('publication', '')
             year = ref.get('year', '')
 
@@ -221,24 +248,7 @@ class LaTeXExportService:
         if not text:
             return ""
 
-        # Characters that need escaping in LaTeX
-        replacements = {
-            '\\': '\\textbackslash{}',
-            '&': '\\&',
-            '%': '\\%',
-            '$': '\\$',
-            '#': '\\#',
-            '_': '\\_',
-            '{': '\\{',
-            '}': '\\}',
-            '~': '\\textasciitilde{}',
-            '^': '\\textasciicircum{}'
-        }
-
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-
-        return text
+        return text.translate(_LATEX_ESCAPES)
 
     def export_to_file(
         self,
@@ -264,7 +274,7 @@ class LaTeXExportService:
             }
 
         except Exception as e:
-            print(f"❌ Failed to export LaTeX file: {str(e)}")
+            logger.exception("❌ Failed to export LaTeX file to %s", output_path)
             return {
                 'success': False,
                 'error': str(e)
@@ -3,22 +3,48 @@ OAuth service for handling third-party integrations
 backend/app/services/oauth_service.py
 """
 import os
+import asyncio
 import httpx
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.models.oauth_token import OAuthToken
 from app.core.config import settings
+from app.database.session import async_session_maker
 
 logger = logging.getLogger(__name__)
 
+# Refresh tokens slightly before they actually expire
+TOKEN_EXPIRY_LEEWAY_SECONDS = 60
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, matching the DateTime columns"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 
 class OAuthService:
     """Service for managing OAuth tokens and exchanges"""
 
+    def __init__(self):
+        # One lock per (user_id, service) so concurrent callers share a single refresh.
+        # Weakly held: a lock goes away once no caller holds or waits on it
+        self._refresh_locks: "weakref.WeakValueDictionary[Tuple[str, str], asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def _refresh_lock(self, user_id: str, service: str) -> asyncio.Lock:
+        """The refresh lock for (user_id, service); callers keep it alive while they use it"""
+        key = (user_id, service)
+        lock = self._refresh_locks.get(key)
+        if lock is None:
+            lock = self._refresh_locks[key] = asyncio.Lock()
+        return lock
+
     async def exchange_google_code(
         self,
         code: str,
@@ -58,7 +84,7 @@ class OAuthService:
             )
 
             if response.status_code != 200:
-                logger.error(f"Google token exchange failed: {response.text}")
+                logger.error("Google token exchange failed: %s", response.text)
                 raise ValueError(f"Failed to exchange code: {response.text}")
 
             token_data = response.json()
@@ -73,7 +99,7 @@ class OAuthService:
             expires_in=token_data.get("expires_in", 3600)
         )
 
-        logger.info(f"✅ Google Drive OAuth token stored for user {user_id}")
+        logger.info("✅ Google Drive OAuth token stored for user %s", user_id)
         return token_data
 
     async def exchange_dropbox_code(
@@ -116,7 +142,7 @@ class OAuthService:
             )
 
             if response.status_code != 200:
-                logger.error(f"Dropbox token exchange failed: {response.text}")
+                logger.error("Dropbox token exchange failed: %s", response.text)
                 raise ValueError(f"Failed to exchange code: {response.text}")
 
             token_data = response.json()
@@ -131,7 +157,7 @@ class OAuthService:
             expires_in=token_data.get("expires_in", 14400)  # Dropbox default: 4 hours
         )
 
-        logger.info(f"✅ Dropbox OAuth token stored for user {user_id}")
+        logger.info("✅ Dropbox OAuth token stored for user %s", user_id)
         return token_data
 
     async def exchange_mendeley_code(
@@ -173,7 +199,7 @@ class OAuthService:
             )
 
             if response.status_code != 200:
-                logger.error(f"Mendeley token exchange failed: {response.text}")
+                logger.error("Mendeley token exchange failed: %s", response.text)
                 raise ValueError(f"Failed to exchange code: {response.text}")
 
             token_data = response.json()
@@ -188,7 +214,7 @@ class OAuthService:
             expires_in=token_data.get("expires_in", 3600)
         )
 
-        logger.info(f"✅ Mendeley OAuth token stored for user {user_id}")
+        logger.info("✅ Mendeley OAuth token stored for user %s", user_id)
         return token_data
 
     async def store_zotero_key(
@@ -218,7 +244,7 @@ class OAuthService:
             token_metadata=f'{{"zotero_user_id": "{zotero_user_id}"}}' if zotero_user_id else None
         )
 
-        logger.info(f"✅ Zotero API key stored for user {user_id}")
+        logger.info("✅ Zotero API key stored for user %s", user_id)
 
     async def store_token(
         self,
@@ -258,7 +284,7 @@ class OAuthService:
         # Calculate expiration time
         expires_at = None
         if expires_in:
-            expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
+            expires_at = _utcnow() + timedelta(seconds=expires_in)
 
         if existing_token:
             # Update existing token
@@ -268,7 +294,7 @@ class OAuthService:
             existing_token.expires_at = expires_at
             if token_metadata:
                 existing_token.token_metadata = token_metadata
-            existing_token.updated_at = datetime.utcnow()
+            existing_token.updated_at = _utcnow()
 
             token = existing_token
         else:
@@ -283,8 +309,9 @@ class OAuthService:
             )
             db.add(token)
 
+        # id/created_at/updated_at are client-side defaults populated at flush, and
+        # the session keeps attributes loaded after commit, so no reload is needed
         await db.commit()
-        await db.refresh(token)
 
         return token
 
@@ -340,7 +367,7 @@ class OAuthService:
         await db.delete(token)
         await db.commit()
 
-        logger.info(f"🗑️ OAuth token revoked for user {user_id}, service {service}")
+        logger.info("🗑️ OAuth token revoked for user %s, service %s", user_id, service)
         return True
 
     async def refresh_token_if_needed(
@@ -364,29 +391,60 @@ class OAuthService:
         if not token:
             return None
 
-        # Check if token is expired
-        if not token.is_expired():
+        # Check if token is expired; expires_at comes from the row just fetched,
+        # so a refresh by another worker is seen here
+        if not token.is_expired(TOKEN_EXPIRY_LEEWAY_SECONDS):
             return token
 
-        if not token.refresh_token:
-            logger.warning(f"⚠️ Token expired and no refresh token available for {service}")
-            return None
+        async with self._refresh_lock(user_id, service):
+            # Another caller (or worker) may have refreshed the token while we waited
+            await db.refresh(token)
+            if not token.is_expired(TOKEN_EXPIRY_LEEWAY_SECONDS):
+                return token
 
-        # Refresh based on service
-        try:
-            if service == "google_drive":
-                await self._refresh_google_token(db, token)
-            elif service == "dropbox":
-                await self._refresh_dropbox_token(db, token)
-            elif service == "mendeley":
-                await self._refresh_mendeley_token(db, token)
+            if not token.refresh_token:
+                logger.warning("⚠️ Token expired and no refresh token available for %s", service)
+                return None
 
-            await db.refresh(token)
-            return token
+            # Refresh based on service
+            try:
+                if service == "google_drive":
+                    await self._refresh_google_token(db, token)
+                elif service == "dropbox":
+                    await self._refresh_dropbox_token(db, token)
+                elif service == "mendeley":
+                    await self._refresh_mendeley_token(db, token)
 
-        except Exception as e:
-            logger.error(f"❌ Failed to refresh {service} token: {e}")
-            return None
+                return token
+
+            except Exception as e:
+                logger.error("❌ Failed to refresh %s token: %s", service, e)
+                return None
+
+    async def refresh_tokens_if_needed(
+        self,
+        user_id: str,
+        services: List[str]
+    ) -> Dict[str, Optional[OAuthToken]]:
+        """
+        Refresh tokens for several services concurrently
+
+        Each service gets its own database session, since a single
+        AsyncSession cannot be shared between concurrent tasks.
+
+        Args:
+            user_id: User ID
+            services: Service names
+
+        Returns:
+            Dict mapping service name to its OAuthToken (or None)
+        """
+        async def _refresh(service: str) -> Optional[OAuthToken]:
+            async with async_session_maker() as session:
+                return await self.refresh_token_if_needed(session, user_id, service)
+
+        tokens = await asyncio.gather(*(_refresh(service) for service in services))
+        return dict(zip(services, tokens))
 
     async def _refresh_google_token(self, db: AsyncSession, token: OAuthToken) -> None:
         """Refresh Google OAuth token"""
@@ -407,8 +465,8 @@ class OAuthService:
             if response.status_code == 200:
                 data = response.json()
                 token.access_token = data["access_token"]
-                token.expires_at = datetime.utcnow() + timedelta(seconds=data.get("expires_in", 3600))
-                token.updated_at = datetime.utcnow()
+                token.expires_at = _utcnow() + timedelta(seconds=data.get("expires_in", 3600))
+                token.updated_at = _utcnow()
                 await db.commit()
                 logger.info("✅ Google token refreshed")
             else:
@@ -432,8 +490,8 @@ class OAuthService:
             if response.status_code == 200:
                 data = response.json()
                 token.access_token = data["access_token"]
-                token.expires_at = datetime.utcnow() + timedelta(seconds=data.get("expires_in", 14400))
-                token.updated_at = datetime.utcnow()
+                token.expires_at = _utcnow() + timedelta(seconds=data.get("expires_in", 14400))
+                token.updated_at = _utcnow()
                 await db.commit()
                 logger.info("✅ Dropbox token refreshed")
             else:
@@ -458,8 +516,8 @@ class OAuthService:
             if response.status_code == 200:
                 data = response.json()
                 token.access_token = data["access_token"]
-                token.expires_at = datetime.utcnow() + timedelta(seconds=data.get("expires_in", 3600))
-                token.updated_at = datetime.utcnow()
+                token.expires_at = _utcnow() + timedelta(seconds=data.get("expires_in", 3600))
+                token.updated_at = _utcnow()
                 await db.commit()
                 logger.info("✅ Mendeley token refreshed")
             else:
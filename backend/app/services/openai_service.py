@@ -2,23 +2,225 @@
 OpenAI Service for GPT-3.5 and GPT-4 models
 Provides integration with OpenAI API for research assistance
 """
+import asyncio
 import logging
 import os
-from typing import Optional, Dict, List, Any
+import random
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Dict, List, Any, Tuple, Deque, TypedDict
 import httpx
+import orjson
 from app.core.config import settings
+from app.core.exceptions import NotFoundException
 
 logger = logging.getLogger(__name__)
 
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+    logger.warning("⚠️ tiktoken not available - prompt token counts will be estimated")
+
+# Citation placeholders like [Author, Year] or (Author et al., Year)
+_CITATION_RE = re.compile(r'[\[\(]([A-Z][a-z]+(?:\set\sal\.)?),?\s*(\d{4})[\]\)]')
+
+# Characters of each uploaded file included in the prompt
+FILE_PREVIEW_CHARS = 3000
+
+
+class UploadedFile(TypedDict, total=False):
+    """Uploaded file as passed to build_research_prompt
+
+    preview and length are computed once when the file is parsed, so prompt
+    builds neither slice nor measure the full extracted text.
+    """
+    filename: str
+    size: int
+    content: str
+    preview: str
+    length: int
+
+
+def make_uploaded_file(filename: str, content: str, size: int) -> UploadedFile:
+    """Build an UploadedFile with its prompt preview precomputed"""
+    return {
+        'filename': filename,
+        'content': content,
+        'size': size,
+        'preview': content[:FILE_PREVIEW_CHARS],
+        'length': len(content)
+    }
+
+
+# Context window (prompt + completion tokens) per model
+MODEL_CTX = {"gpt-3.5-turbo": 16385, "gpt-4": 8192, "gpt-4-turbo": 128000}
+
+# Completion tokens requested per chat call
+MAX_COMPLETION_TOKENS = settings.OPENAI_MAX_TOKENS
+
+# Headroom for message framing and tokenizer differences between models
+PROMPT_SAFETY_TOKENS = 256
+
+# Rounds of proportional preview trimming before giving up
+MAX_TRIM_ROUNDS = 4
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str) -> Optional[Any]:
+    """tiktoken encoding for a model (cached), or None when unavailable"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not load tiktoken encoding for {model}: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Count prompt tokens for a model, estimating ~4 chars/token without tiktoken"""
+    enc = _encoding(model)
+    if enc is None:
+        return len(text) // 4 + 1
+    return len(enc.encode(text))
+
+
+def prompt_budget(model: str) -> int:
+    """Prompt tokens that fit alongside the completion in the model's context window"""
+    return MODEL_CTX.get(model, MODEL_CTX["gpt-3.5-turbo"]) - MAX_COMPLETION_TOKENS - PROMPT_SAFETY_TOKENS
+
+
+# Serialized chat requests are sent pre-encoded with orjson
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Transient failures worth retrying with backoff
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Kept identical across requests so OpenAI can cache the prompt prefix;
+# per-request context goes into the user message instead
+SYSTEM_PROMPT = """You are an expert academic research assistant specialized in helping researchers write high-quality research papers.
+
+INSTRUCTIONS:
+1. Provide clear, academic-style responses
+2. Suggest relevant citations where applicable (use placeholder format: [Author, Year])
+3. Identify connections to existing literature
+4. Highlight research gaps and opportunities
+5. Offer specific suggestions for paper sections (Abstract, Introduction, Methodology, etc.)
+6. Use formal academic language appropriate for publication
+7. If comparing files, analyze content similarities and differences
+8. Suggest statistical/analytical methods when relevant
+9. Follow the writing style preferences and paper context given in the user message
+
+Format your response with:
+- Clear section headings
+- Bullet points for suggestions
+- Academic tone and precision
+- Actionable recommendations"""
+
+
+@dataclass(frozen=True, slots=True)
+class Personalization:
+    """Validated AI personalization levels (1-10); hashable so rendered prompts can be cached"""
+    lab_level: int = 5
+    personal_level: int = 5
+    global_level: int = 5
+
+
+def parse_personalization(settings: Optional[Dict[str, Any]]) -> Optional[Personalization]:
+    """Validate a personalization settings dict once, clamping each level to 1-10"""
+    if not settings:
+        return None
+
+    def level(key: str) -> int:
+        try:
+            return min(max(int(settings.get(key, 5)), 1), 10)
+        except (TypeError, ValueError):
+            return 5
+
+    return Personalization(level('lab_level'), level('personal_level'), level('global_level'))
+
+
+@lru_cache(maxsize=1024)
+def render_style(personalization: Personalization) -> str:
+    """Render the writing-style preferences block (memoized per setting combination)"""
+    return f"""
+WRITING STYLE PREFERENCES:
+- Lab Research Influence: {personalization.lab_level}/10 (use terminology and style from lab papers)
+- Personal Writing Style: {personalization.personal_level}/10 (match user's personal academic writing)
+- Global Academic Standards: {personalization.global_level}/10 (follow international conventions)
+"""
+
+
+@lru_cache(maxsize=256)
+def _paper_block(
+    title: str,
+    research_area: str,
+    status: str,
+    progress: int,
+    current_word_count: int,
+    target_word_count: int
+) -> str:
+    """Render the current-paper context block (memoized per paper state)"""
+    return f"""
+CURRENT PAPER CONTEXT:
+- Title: {title}
+- Research Area: {research_area}
+- Status: {status}
+- Progress: {progress}%
+- Current Words: {current_word_count}/{target_word_count}
+"""
+
+
+class RateLimiter:
+    """Sliding one-minute window that throttles requests and tokens per minute"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._window_tokens = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until a request costing `tokens` fits in the current window"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._window and now - self._window[0][0] >= 60:
+                    _, expired_tokens = self._window.popleft()
+                    self._window_tokens -= expired_tokens
+
+                fits_tokens = self._window_tokens + tokens <= self.tokens_per_minute
+                if len(self._window) < self.requests_per_minute and (fits_tokens or not self._window):
+                    self._window.append((now, tokens))
+                    self._window_tokens += tokens
+                    return
+
+                await asyncio.sleep(60 - (now - self._window[0][0]))
+
 
 class OpenAIService:
     """Service for interacting with OpenAI GPT models"""
 
     def __init__(self):
         """Initialize OpenAI service with API key"""
+        self._semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+        self._rate_limiter = RateLimiter(
+            settings.OPENAI_REQUESTS_PER_MINUTE,
+            settings.OPENAI_TOKENS_PER_MINUTE
+        )
+        self.max_retries = settings.OPENAI_MAX_RETRIES
+
         try:
             self.api_key = getattr(settings, 'OPENAI_API_KEY', None)
-            self.api_url = "https://api.openai.com/v1/chat/completions"
+            self.api_url = "/v1/chat/completions"
 
             if self.api_key and self.api_key.strip():
                 self.enabled = True
@@ -30,90 +232,122 @@ class OpenAIService:
             self.enabled = False
             logger.error(f"❌ Failed to initialize OpenAI service: {str(e)}")
 
+        # One long-lived client so connections (and TLS sessions) are kept alive between requests
+        self._client = httpx.AsyncClient(
+            base_url="https://api.openai.com",
+            timeout=30.0,
+            http2=True,
+            # Content-Type is left per request: json= sets it, and the batch file
+            # upload needs multipart
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            limits=httpx.Limits(
+                max_connections=64,
+                max_keepalive_connections=32,
+                keepalive_expiry=60
+            )
+        )
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client"""
+        await self._client.aclose()
+
     def build_research_prompt(
         self,
         message: str,
-        files_content: List[Dict[str, Any]],
-        personalization: Optional[Dict[str, int]],
+        files_content: List[UploadedFile],
+        personalization: Optional[Personalization],
         paper_context: Optional[Dict[str, Any]] = None
-    ) -> str:
+    ) -> Tuple[str, str]:
         """
         Build a comprehensive research-focused prompt for OpenAI
 
         Args:
             message: User's question/request
-            files_content: List of uploaded files with content
-            personalization: User's AI personalization settings
+            files_content: List of uploaded files (see UploadedFile)
+            personalization: User's AI personalization settings (see parse_personalization)
             paper_context: Current paper being worked on
 
         Returns:
-            Formatted prompt string
+            Tuple of (static system prompt, user prompt carrying the dynamic context)
         """
         # Build personalization instructions
-        style_instructions = ""
-        if personalization:
-            lab_level = personalization.get('lab_level', 5)
-            personal_level = personalization.get('personal_level', 5)
-            global_level = personalization.get('global_level', 5)
-
-            style_instructions = f"""
-WRITING STYLE PREFERENCES:
-- Lab Research Influence: {lab_level}/10 (use terminology and style from lab papers)
-- Personal Writing Style: {personal_level}/10 (match user's personal academic writing)
-- Global Academic Standards: {global_level}/10 (follow international conventions)
-"""
+        style_instructions = render_style(personalization) if personalization else ""
 
         # Build paper context
         paper_info = ""
         if paper_context:
-            paper_info = f"""
-CURRENT PAPER CONTEXT:
-- Title: {paper_context.get('title', 'Untitled')}
-- Research Area: {paper_context.get('research_area', 'Not specified')}
-- Status: {paper_context.get('status', 'in-progress')}
-- Progress: {paper_context.get('progress', 0)}%
-- Current Words: {paper_context.get('current_word_count', 0)}/{paper_context.get('target_word_count', 8000)}
-"""
+            paper_info = _paper_block(
+                paper_context.get('title', 'Untitled'),
+                paper_context.get('research_area', 'Not specified'),
+                paper_context.get('status', 'in-progress'),
+                paper_context.get('progress', 0),
+                paper_context.get('current_word_count', 0),
+                paper_context.get('target_word_count', 8000)
+            )
 
         # Build files summary
         files_info = ""
         if files_content:
             files_info = "\n\nUPLOADED FILES:\n"
             for file_data in files_content:
+                if 'preview' not in file_data:
+                    file_data = make_uploaded_file(file_data['filename'], file_data['content'], file_data['size'])
                 files_info += f"\n**File: {file_data['filename']}** ({file_data['size']/1024:.1f} KB)\n"
-                files_info += f"Content Preview:\n{file_data['content'][:3000]}\n"
-                if len(file_data['content']) > 3000:
-                    files_info += f"... (truncated, total: {len(file_data['content'])} characters)\n"
+                files_info += f"Content Preview:\n{file_data['preview']}\n"
+                if file_data['length'] > len(file_data['preview']):
+                    files_info += f"... (truncated, total: {file_data['length']} characters)\n"
 
-        # Complete prompt
-        system_prompt = f"""You are an expert academic research assistant specialized in helping researchers write high-quality research papers.
+        # Dynamic context is appended after the static system prompt, most stable first
+        user_prompt = f"{style_instructions}{paper_info}{files_info}\n\n{message}".lstrip()
 
-{style_instructions}
-{paper_info}
+        return SYSTEM_PROMPT, user_prompt
 
-INSTRUCTIONS:
-1. Provide clear, academic-style responses
-2. Suggest relevant citations where applicable (use placeholder format: [Author, Year])
-3. Identify connections to existing literature
-4. Highlight research gaps and opportunities
-5. Offer specific suggestions for paper sections (Abstract, Introduction, Methodology, etc.)
-6. Use formal academic language appropriate for publication
-7. If comparing files, analyze content similarities and differences
-8. Suggest statistical/analytical methods when relevant
+    def fit_research_prompt(
+        self,
+        message: str,
+        files_content: List[UploadedFile],
+        personalization: Optional[Personalization],
+        paper_context: Optional[Dict[str, Any]],
+        model: str
+    ) -> Tuple[str, str, int]:
+        """
+        Build the research prompt, trimming file previews to fit the model's context
 
-Format your response with:
-- Clear section headings
-- Bullet points for suggestions
-- Academic tone and precision
-- Actionable recommendations"""
+        Previews are shortened proportionally to the overflow, a bounded number
+        of times, so an oversized upload set is cut here instead of failing (and
+        being retried) at the API.
 
-        return system_prompt, message + files_info
+        Returns:
+            Tuple of (system prompt, user prompt, prompt token count)
+        """
+        budget = prompt_budget(model)
+        files = [
+            f if 'preview' in f else make_uploaded_file(f['filename'], f['content'], f['size'])
+            for f in files_content
+        ]
+
+        for _ in range(MAX_TRIM_ROUNDS + 1):
+            system_prompt, user_prompt = self.build_research_prompt(message, files, personalization, paper_context)
+            n_tokens = count_tokens(system_prompt + user_prompt, model)
+            if n_tokens <= budget:
+                break
+
+            preview_tokens = count_tokens("".join(f['preview'] for f in files), model)
+            if not preview_tokens:
+                break
+            keep = max(0.0, 1 - (n_tokens - budget) / preview_tokens)
+            files = [{**f, 'preview': f['preview'][:int(len(f['preview']) * keep)]} for f in files]
+            logger.info(f"✂️ Prompt is {n_tokens} tokens (budget {budget} for {model}), trimming file previews to {keep:.0%}")
+        else:
+            logger.warning(f"⚠️ Prompt still {n_tokens} tokens after trimming (budget {budget} for {model})")
+
+        return system_prompt, user_prompt, n_tokens
 
     async def generate_response(
         self,
         message: str,
-        files_content: List[Dict[str, Any]] = None,
-        personalization: Optional[Dict[str, int]] = None,
+        files_content: List[UploadedFile] = None,
+        personalization: Optional[Personalization] = None,
         paper_context: Optional[Dict[str, Any]] = None,
         model: str = 'gpt-3.5-turbo'
     ) -> Dict[str, Any]:
@@ -123,7 +357,7 @@ Format your response with:
         Args:
             message: User's message
             files_content: Uploaded files data
-            personalization: User preferences
+            personalization: Validated user preferences
             paper_context: Paper being worked on
             model: OpenAI model to use ('gpt-3.5-turbo' or 'gpt-4')
 
@@ -134,47 +368,37 @@ Format your response with:
             raise Exception("OpenAI service is not enabled. Please configure OPENAI_API_KEY.")
 
         try:
-            # Build the prompts
-            system_prompt, user_prompt = self.build_research_prompt(
+            # Build the prompts, trimmed to the model's context window
+            system_prompt, user_prompt, prompt_tokens = self.fit_research_prompt(
                 message=message,
                 files_content=files_content or [],
                 personalization=personalization,
-                paper_context=paper_context
+                paper_context=paper_context,
+                model=model
             )
 
-            logger.info(f"🤖 Sending request to OpenAI {model} (prompt length: {len(user_prompt)} chars)")
+            logger.info(f"🤖 Sending request to OpenAI {model} (prompt: {len(user_prompt)} chars, {prompt_tokens} tokens)")
 
             # Prepare API request
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-
-            payload = {
-                "model": model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 2000
-            }
+            payload = self.build_chat_payload(system_prompt, user_prompt, model)
 
-            # Make API request
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.api_url,
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                data = response.json()
+            # Make API request, reserving the counted prompt plus the full completion
+            # allowance against the tokens-per-minute limit
+            estimated_tokens = prompt_tokens + payload['max_tokens']
+            data = await self._post_with_retries(payload, estimated_tokens)
 
             # Extract response text
             response_text = data['choices'][0]['message']['content']
 
             logger.info(f"✅ Received response from OpenAI {model} ({len(response_text)} chars)")
 
+            usage = data.get('usage', {})
+            cached_tokens = (usage.get('prompt_tokens_details') or {}).get('cached_tokens', 0)
+            logger.debug(
+                "OpenAI prompt cache: %s of %s prompt tokens cached",
+                cached_tokens, usage.get('prompt_tokens', 0)
+            )
+
             # Parse for citations (simple extraction)
             citations = self._extract_citations(response_text)
 
@@ -186,7 +410,7 @@ Format your response with:
                     'prompt_length': len(user_prompt),
                     'response_length': len(response_text),
                     'files_processed': len(files_content) if files_content else 0,
-                    'usage': data.get('usage', {})
+                    'usage': usage
                 }
             }
 
@@ -197,6 +421,168 @@ Format your response with:
             logger.error(f"❌ OpenAI API error: {str(e)}")
             raise Exception(f"Failed to generate response from OpenAI: {str(e)}")
 
+    def build_chat_payload(self, system_prompt: str, user_prompt: str, model: str) -> Dict[str, Any]:
+        """Build a chat completion request body"""
+        return {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": 0.7,
+            "max_tokens": MAX_COMPLETION_TOKENS
+        }
+
+    async def submit_batch(self, jobs: List[Dict[str, Any]], metadata: Optional[Dict[str, str]] = None) -> str:
+        """
+        Submit chat completions to the OpenAI Batch API
+
+        Batches are billed at half price and use a separate rate-limit pool, at
+        the cost of completing asynchronously (within 24h). Use for
+        non-interactive bulk generation only.
+
+        Args:
+            jobs: List of dicts with 'custom_id' and 'body' (a chat completion payload)
+            metadata: String key/values stored on the batch, for fetch_batch to check
+
+        Returns:
+            OpenAI batch ID
+        """
+        if not self.enabled:
+            raise Exception("OpenAI service is not enabled. Please configure OPENAI_API_KEY.")
+
+        batch_file = b"\n".join(
+            orjson.dumps({
+                "custom_id": job["custom_id"],
+                "method": "POST",
+                "url": self.api_url,
+                "body": job["body"]
+            })
+            for job in jobs
+        )
+
+        upload = await self._client.post(
+            "/v1/files",
+            data={"purpose": "batch"},
+            files={"file": ("batch.jsonl", batch_file, "application/jsonl")}
+        )
+        upload.raise_for_status()
+
+        response = await self._client.post(
+            "/v1/batches",
+            json={
+                "input_file_id": upload.json()["id"],
+                "endpoint": self.api_url,
+                "completion_window": "24h",
+                "metadata": metadata or {}
+            }
+        )
+        response.raise_for_status()
+        batch = response.json()
+
+        logger.info("📦 Submitted OpenAI batch %s with %s requests", batch["id"], len(jobs))
+        return batch["id"]
+
+    async def fetch_batch(self, batch_id: str, metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Get the status of an OpenAI batch and its results once completed
+
+        Args:
+            batch_id: OpenAI batch ID
+            metadata: Values the batch must have been submitted with (see submit_batch)
+
+        Returns:
+            Dict with status, request counts and results (custom_id -> content)
+
+        Raises:
+            NotFoundException: If the batch does not exist or its metadata doesn't match
+        """
+        if not self.enabled:
+            raise Exception("OpenAI service is not enabled. Please configure OPENAI_API_KEY.")
+
+        response = await self._client.get(f"/v1/batches/{batch_id}")
+        if response.status_code == 404:
+            raise NotFoundException("Batch")
+        response.raise_for_status()
+        batch = orjson.loads(response.content)
+
+        # A batch ID alone grants nothing: it must belong to the caller's paper and user
+        stored = batch.get("metadata") or {}
+        if metadata and any(stored.get(key) != value for key, value in metadata.items()):
+            raise NotFoundException("Batch")
+
+        results: Dict[str, Optional[str]] = {}
+        if batch["status"] == "completed" and batch.get("output_file_id"):
+            output = await self._client.get(f"/v1/files/{batch['output_file_id']}/content")
+            output.raise_for_status()
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                item = orjson.loads(line)
+                body = (item.get("response") or {}).get("body") or {}
+                choices = body.get("choices") or []
+                results[item["custom_id"]] = choices[0]["message"]["content"] if choices else None
+
+        return {
+            "id": batch["id"],
+            "status": batch["status"],
+            "request_counts": batch.get("request_counts", {}),
+            "results": results
+        }
+
+    async def generate_responses_batch(
+        self,
+        requests: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """
+        Generate several responses concurrently
+
+        Args:
+            requests: List of keyword-argument dicts for generate_response
+
+        Returns:
+            Results in request order; failed requests yield their exception
+        """
+        return await asyncio.gather(
+            *(self.generate_response(**request) for request in requests),
+            return_exceptions=True
+        )
+
+    async def _post_with_retries(
+        self,
+        payload: Dict[str, Any],
+        estimated_tokens: int
+    ) -> Dict[str, Any]:
+        """POST a chat completion, retrying rate-limit and server errors with backoff"""
+        body = orjson.dumps(payload)
+        for attempt in range(self.max_retries + 1):
+            await self._rate_limiter.acquire(estimated_tokens)
+            async with self._semaphore:
+                response = await self._client.post(self.api_url, content=body, headers=JSON_HEADERS)
+
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                delay = self._retry_delay(response, attempt)
+                logger.warning(
+                    "⚠️ OpenAI returned %s, retrying in %.1fs (attempt %s/%s)",
+                    response.status_code, delay, attempt + 1, self.max_retries
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            return orjson.loads(response.content)
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        """Honor Retry-After when present, otherwise exponential backoff with jitter"""
+        retry_after = response.headers.get('retry-after')
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return 2 ** attempt + random.random()
+
     def _extract_citations(self, text: str) -> List[str]:
         """
         Extract citation suggestions from response text
@@ -207,14 +593,8 @@ Format your response with:
         Returns:
             List of found citations
         """
-        import re
-
-        # Match patterns like [Author, Year] or (Author, Year)
-        citation_pattern = r'[\[\(]([A-Z][a-z]+(?:\set\sal\.)?),?\s*(\d{4})[\]\)]'
-        matches = re.findall(citation_pattern, text)
-
-        citations = [f"{author}, {year}" for author, year in matches]
-        return list(set(citations))  # Remove duplicates
+        # Set comprehension removes duplicates
+        return list({f"{author}, {year}" for author, year in _CITATION_RE.findall(text)})
 
 
 # Global instance
@@ -1,12 +1,22 @@
 """
 Paper Export Service - Generate exports in PDF, Word, and LaTeX formats
 """
+import asyncio
 import io
 import logging
-from typing import Optional
+import re
+import threading
+import time
+from collections import OrderedDict
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Dict, List, Optional, Tuple
 from datetime import datetime
 
+from xml.sax.saxutils import escape as xml_escape
+
 from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from reportlab.lib.pagesizes import letter, A4
@@ -20,9 +30,223 @@ from app.models.paper import Paper, PaperSection
 logger = logging.getLogger(__name__)
 
 
+def _last_modified(paper: Paper) -> datetime:
+    """Newest timestamp of the paper and its sections"""
+    # Section edits don't always touch paper.updated_at, so take the newest of both
+    return max(
+        [paper.updated_at] + [section.updated_at for section in paper.sections if section.updated_at]
+    )
+
+
+def _split_paragraphs(content: str) -> List[str]:
+    """Split section content into non-empty paragraphs"""
+    return [para for para in (p.strip() for p in content.split('\n\n')) if para]
+
+
+# PDF paragraph styles are read-only once built, so they are shared by every export.
+# Flowables (Spacer, Paragraph) are not: ReportLab keeps layout state on them,
+# so they are created per document
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    textColor='black',
+    spaceAfter=30,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+_AUTHOR_STYLE = ParagraphStyle(
+    'Author',
+    parent=_STYLES['Normal'],
+    fontSize=12,
+    alignment=TA_CENTER,
+    spaceAfter=12,
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=16,
+    textColor='black',
+    spaceAfter=12,
+    spaceBefore=12,
+    fontName='Helvetica-Bold'
+)
+
+_BODY_STYLE = ParagraphStyle(
+    'CustomBody',
+    parent=_STYLES['BodyText'],
+    fontSize=11,
+    alignment=TA_JUSTIFY,
+    spaceAfter=12,
+    leading=14,
+)
+
+
+# Tabs and line breaks become <w:tab/> / <w:br/>, as python-docx's run.text setter does
+_DOCX_BREAKS = re.compile(r'([\t\n\r])')
+_DOCX_EMPTY_PARAGRAPH = '<w:p/>'
+
+
+def _docx_paragraph_xml(text: str, style: Optional[str] = None, justify: bool = False) -> str:
+    """Build the WordprocessingML for one paragraph holding a single run of text"""
+    props = ''
+    if style or justify:
+        props = '<w:pPr>'
+        if style:
+            props += f'<w:pStyle w:val="{style}"/>'
+        if justify:
+            props += '<w:jc w:val="both"/>'
+        props += '</w:pPr>'
+
+    run = ''
+    if text:
+        pieces = []
+        for piece in _DOCX_BREAKS.split(text):
+            if piece == '\t':
+                pieces.append('<w:tab/>')
+            elif piece in ('\n', '\r'):
+                pieces.append('<w:br/>')
+            elif piece:
+                pieces.append(f'<w:t xml:space="preserve">{xml_escape(piece)}</w:t>')
+        run = f'<w:r>{"".join(pieces)}</w:r>'
+
+    return f'<w:p>{props}{run}</w:p>'
+
+
+# Fixed parts of the LaTeX export, pre-encoded once
+_LATEX_PREAMBLE = (
+    b"\\documentclass[11pt,a4paper]{article}\n"
+    b"\\usepackage[utf8]{inputenc}\n"
+    b"\\usepackage[T1]{fontenc}\n"
+    b"\\usepackage{amsmath}\n"
+    b"\\usepackage{graphicx}\n"
+    b"\\usepackage{hyperref}\n"
+    b"\\usepackage[margin=1in]{geometry}\n"
+    b"\n"
+)
+_LATEX_FRONT_MATTER = b"\\date{\\today}\n\n\\begin{document}\n\n\\maketitle\n\n"
+
+# LaTeX special characters and their escapes, applied in a single str.translate pass
+_LATEX_ESCAPES = str.maketrans({
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+    '\\': r'\textbackslash{}',
+})
+
+
+# Exports are rendered into a spooled file: up to this size they stay in
+# memory, larger ones spill to a temp file and are streamed from disk
+EXPORT_SPOOL_MAX_SIZE = 1 << 20
+
+# Generated exports kept in memory; an edit changes the key, so entries never go stale.
+# Only exports that stayed in the in-memory spool are cached
+EXPORT_CACHE_TTL_SECONDS = 3600
+EXPORT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
 class PaperExportService:
     """Service for exporting papers in various formats"""
 
+    def __init__(self):
+        self._cache: "OrderedDict[Tuple, Tuple[float, bytes]]" = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+        self._writers = {
+            "pdf": self.write_pdf,
+            "word": self.write_word,
+            "latex": self.write_latex,
+        }
+
+    async def export(self, paper: Paper, fmt: str) -> BinaryIO:
+        """
+        Export paper in the given format, as a readable binary stream at offset 0
+
+        Exports are a pure function of the paper's content and authors, so small
+        ones are cached under everything that is rendered into them. On a miss
+        the document is written to a spooled file in a worker thread, keeping
+        the event loop free; exports past EXPORT_SPOOL_MAX_SIZE are returned
+        from the spilled file and not cached.
+
+        Args:
+            paper: Paper model with sections, owner and collaborators loaded
+                (no lazy loads may happen inside the worker thread)
+            fmt: Export format (pdf, word, latex)
+
+        Returns:
+            BinaryIO: Exported document; the caller closes it
+        """
+        key = self._cache_key(paper, fmt)
+
+        data = self._cache_get(key)
+        if data is not None:
+            logger.info(f"📦 Export cache hit for paper '{paper.title}' ({fmt})")
+            return io.BytesIO(data)
+
+        return await asyncio.to_thread(self._write_spooled, key, paper, fmt)
+
+    def _write_spooled(self, key: Tuple, paper: Paper, fmt: str) -> BinaryIO:
+        """Render an export into a spooled file, caching it if it stayed in memory"""
+        spool = SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+        try:
+            self._writers[fmt](paper, spool)
+            size = spool.tell()
+            spool.seek(0)
+        except BaseException:
+            spool.close()
+            raise
+
+        if size > EXPORT_SPOOL_MAX_SIZE:
+            return spool
+
+        data = spool.read()
+        spool.close()
+        self._cache_put(key, data)
+        return io.BytesIO(data)
+
+    def _cache_key(self, paper: Paper, fmt: str) -> Tuple:
+        """Key an export on every paper field that ends up in the document"""
+        # The author line comes from the owner and accepted collaborators, whose
+        # names and acceptance don't touch the paper's timestamps
+        return (
+            str(paper.id),
+            _last_modified(paper).isoformat(),
+            len(paper.sections),
+            tuple(paper.co_authors),
+            fmt,
+        )
+
+    def _cache_get(self, key: Tuple) -> Optional[bytes]:
+        """Return cached export bytes, or None if missing or expired"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                return entry[1]
+        return None
+
+    def _cache_put(self, key: Tuple, data: bytes) -> None:
+        """Store export bytes, evicting the least recently used entries past the size limit"""
+        with self._cache_lock:
+            old = self._cache.pop(key, None)
+            if old:
+                self._cache_bytes -= len(old[1])
+            self._cache[key] = (time.monotonic() + EXPORT_CACHE_TTL_SECONDS, data)
+            self._cache_bytes += len(data)
+            while self._cache_bytes > EXPORT_CACHE_MAX_BYTES and self._cache:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+
     def export_to_word(self, paper: Paper) -> bytes:
         """
         Export paper to Microsoft Word (.docx) format
@@ -33,6 +257,18 @@ class PaperExportService:
         Returns:
             bytes: Word document as bytes
         """
+        buffer = io.BytesIO()
+        self.write_word(paper, buffer)
+        return buffer.getvalue()
+
+    def write_word(self, paper: Paper, out: BinaryIO) -> None:
+        """
+        Write paper as a Microsoft Word (.docx) document to a binary stream
+
+        Args:
+            paper: Paper model with sections loaded
+            out: Writable binary file-like object
+        """
         logger.info(f"📄 Exporting paper '{paper.title}' to Word format")
 
         # Create document
@@ -58,8 +294,8 @@ class PaperExportService:
             authors_run = authors.runs[0]
             authors_run.font.size = Pt(12)
 
-        # Add date
-        date_text = datetime.now().strftime("%B %d, %Y")
+        # Add date (the last edit, so an unchanged paper always exports the same bytes)
+        date_text = _last_modified(paper).strftime("%B %d, %Y")
         date_para = doc.add_paragraph(date_text)
         date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
         date_run = date_para.runs[0]
@@ -75,27 +311,29 @@ class PaperExportService:
             abstract.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
             doc.add_paragraph()  # Spacing
 
-        # Add sections in order
-        sorted_sections = sorted(paper.sections, key=lambda s: s.order)
-
-        for section in sorted_sections:
-            # Add section title
-            doc.add_heading(section.title, level=1)
-
-            # Add section content
+        # Sections arrive ordered by the Paper.sections relationship (order_by).
+        # Build their XML in one string and parse it once instead of growing the
+        # element tree a paragraph at a time through doc.add_heading/add_paragraph
+        section_xml = []
+        for section in paper.sections:
+            section_xml.append(_docx_paragraph_xml(section.title, style='Heading1'))
             if section.content and section.content.strip():
-                content_para = doc.add_paragraph(section.content)
-                content_para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+                section_xml.append(_docx_paragraph_xml(section.content, justify=True))
+            section_xml.append(_DOCX_EMPTY_PARAGRAPH)  # Spacing between sections
 
-            doc.add_paragraph()  # Spacing between sections
+        if section_xml:
+            fragment = parse_xml(f'<w:body {nsdecls("w")}>{"".join(section_xml)}</w:body>')
+            body = doc.element.body
+            sect_pr = body.sectPr
+            for paragraph in list(fragment):
+                if sect_pr is not None:
+                    sect_pr.addprevious(paragraph)
+                else:
+                    body.append(paragraph)
 
-        # Save to bytes
-        buffer = io.BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
+        doc.save(out)
 
         logger.info(f"✅ Word export completed for paper '{paper.title}'")
-        return buffer.getvalue()
 
     def export_to_pdf(self, paper: Paper) -> bytes:
         """
@@ -107,13 +345,23 @@ class PaperExportService:
         Returns:
             bytes: PDF document as bytes
         """
-        logger.info(f"📄 Exporting paper '{paper.title}' to PDF format")
-
         buffer = io.BytesIO()
+        self.write_pdf(paper, buffer)
+        return buffer.getvalue()
+
+    def write_pdf(self, paper: Paper, out: BinaryIO) -> None:
+        """
+        Write paper as a PDF document to a binary stream
+
+        Args:
+            paper: Paper model with sections loaded
+            out: Writable binary file-like object
+        """
+        logger.info(f"📄 Exporting paper '{paper.title}' to PDF format")
 
         # Create PDF document
         doc = SimpleDocTemplate(
-            buffer,
+            out,
             pagesize=A4,
             rightMargin=72,
             leftMargin=72,
@@ -124,93 +372,43 @@ class PaperExportService:
         # Container for the 'Flowable' objects
         elements = []
 
-        # Define styles
-        styles = getSampleStyleSheet()
-
-        # Title style
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor='black',
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-
-        # Author style
-        author_style = ParagraphStyle(
-            'Author',
-            parent=styles['Normal'],
-            fontSize=12,
-            alignment=TA_CENTER,
-            spaceAfter=12,
-        )
-
-        # Section heading style
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor='black',
-            spaceAfter=12,
-            spaceBefore=12,
-            fontName='Helvetica-Bold'
-        )
-
-        # Body text style
-        body_style = ParagraphStyle(
-            'CustomBody',
-            parent=styles['BodyText'],
-            fontSize=11,
-            alignment=TA_JUSTIFY,
-            spaceAfter=12,
-            leading=14,
-        )
-
         # Add title
-        elements.append(Paragraph(paper.title, title_style))
+        elements.append(Paragraph(paper.title, _TITLE_STYLE))
         elements.append(Spacer(1, 12))
 
         # Add authors if exists
         if paper.co_authors:
             authors_text = ", ".join(paper.co_authors)
-            elements.append(Paragraph(authors_text, author_style))
+            elements.append(Paragraph(authors_text, _AUTHOR_STYLE))
 
-        # Add date
-        date_text = datetime.now().strftime("%B %d, %Y")
-        elements.append(Paragraph(date_text, author_style))
+        # Add date (the last edit, so an unchanged paper always exports the same bytes)
+        date_text = _last_modified(paper).strftime("%B %d, %Y")
+        elements.append(Paragraph(date_text, _AUTHOR_STYLE))
         elements.append(Spacer(1, 24))
 
         # Add abstract if exists
         if paper.abstract and paper.abstract.strip():
-            elements.append(Paragraph("<b>Abstract</b>", heading_style))
-            elements.append(Paragraph(paper.abstract, body_style))
+            elements.append(Paragraph("<b>Abstract</b>", _HEADING_STYLE))
+            elements.append(Paragraph(paper.abstract, _BODY_STYLE))
             elements.append(Spacer(1, 12))
 
-        # Add sections in order
-        sorted_sections = sorted(paper.sections, key=lambda s: s.order)
-
-        for section in sorted_sections:
+        # Sections arrive ordered by the Paper.sections relationship (order_by)
+        for section in paper.sections:
             # Add section title
-            elements.append(Paragraph(section.title, heading_style))
+            elements.append(Paragraph(section.title, _HEADING_STYLE))
 
             # Add section content
             if section.content and section.content.strip():
-                # Split content into paragraphs
-                paragraphs = section.content.split('\n\n')
+                paragraphs = _split_paragraphs(section.content)
                 for para in paragraphs:
-                    if para.strip():
-                        elements.append(Paragraph(para.strip(), body_style))
+                    elements.append(Paragraph(para, _BODY_STYLE))
 
             elements.append(Spacer(1, 12))
 
         # Build PDF
         doc.build(elements)
 
-        buffer.seek(0)
         logger.info(f"✅ PDF export completed for paper '{paper.title}'")
-        return buffer.getvalue()
 
     def export_to_latex(self, paper: Paper) -> bytes:
         """
@@ -222,71 +420,70 @@ class PaperExportService:
         Returns:
             bytes: LaTeX document as bytes
         """
+        buffer = io.BytesIO()
+        self.write_latex(paper, buffer)
+        return buffer.getvalue()
+
+    def write_latex(self, paper: Paper, out: BinaryIO) -> None:
+        """
+        Write paper as a LaTeX (.tex) document to a binary stream
+
+        Args:
+            paper: Paper model with sections loaded
+            out: Writable binary file-like object
+        """
         logger.info(f"📄 Exporting paper '{paper.title}' to LaTeX format")
 
-        # Start LaTeX document
-        latex_lines = [
-            "\\documentclass[11pt,a4paper]{article}",
-            "\\usepackage[utf8]{inputenc}",
-            "\\usepackage[T1]{fontenc}",
-            "\\usepackage{amsmath}",
-            "\\usepackage{graphicx}",
-            "\\usepackage{hyperref}",
-            "\\usepackage[margin=1in]{geometry}",
-            "",
-            f"\\title{{{self._escape_latex(paper.title)}}}",
-        ]
+        escape = self._escape_latex
+        write = out.write
+
+        write(_LATEX_PREAMBLE)
+        write(f"\\title{{{escape(paper.title)}}}\n".encode('utf-8'))
 
         # Add authors if exists
         if paper.co_authors:
-            authors = " \\and ".join([self._escape_latex(author) for author in paper.co_authors])
-            latex_lines.append(f"\\author{{{authors}}}")
+            authors = " \\and ".join(map(escape, paper.co_authors))
+            write(f"\\author{{{authors}}}\n".encode('utf-8'))
         else:
-            latex_lines.append("\\author{}")
+            write(b"\\author{}\n")
 
-        latex_lines.extend([
-            f"\\date{{\\today}}",
-            "",
-            "\\begin{document}",
-            "",
-            "\\maketitle",
-            "",
-        ])
+        write(_LATEX_FRONT_MATTER)
 
         # Add abstract if exists
         if paper.abstract and paper.abstract.strip():
-            latex_lines.extend([
-                "\\begin{abstract}",
-                self._escape_latex(paper.abstract),
-                "\\end{abstract}",
-                "",
-            ])
+            write(f"\\begin{{abstract}}\n{escape(paper.abstract)}\n\\end{{abstract}}\n\n".encode('utf-8'))
 
-        # Add sections in order
-        sorted_sections = sorted(paper.sections, key=lambda s: s.order)
+        # Sections arrive ordered by the Paper.sections relationship (order_by)
+        for section in paper.sections:
+            write(f"\\section{{{escape(section.title)}}}\n\n".encode('utf-8'))
 
-        for section in sorted_sections:
-            # Add section title
-            latex_lines.append(f"\\section{{{self._escape_latex(section.title)}}}")
-            latex_lines.append("")
-
-            # Add section content
             if section.content and section.content.strip():
-                # Escape LaTeX special characters
-                escaped_content = self._escape_latex(section.content)
-                latex_lines.append(escaped_content)
-                latex_lines.append("")
+                write(f"{escape(section.content)}\n\n".encode('utf-8'))
 
-        # End document
-        latex_lines.extend([
-            "\\end{document}",
-        ])
-
-        # Join lines and convert to bytes
-        latex_content = "\n".join(latex_lines)
+        write(b"\\end{document}")
 
         logger.info(f"✅ LaTeX export completed for paper '{paper.title}'")
-        return latex_content.encode('utf-8')
+
+    async def export_all(self, paper: Paper) -> Dict[str, bytes]:
+        """
+        Export paper to Word, PDF and LaTeX concurrently
+
+        Each exporter runs in a worker thread, so the event loop stays free and
+        the C-backed parts of python-docx/reportlab can overlap.
+
+        Args:
+            paper: Paper model with sections loaded (no lazy loads may happen
+                inside the worker threads)
+
+        Returns:
+            Dict mapping file extension (docx, pdf, tex) to document bytes
+        """
+        word, pdf, latex = await asyncio.gather(
+            asyncio.to_thread(self.export_to_word, paper),
+            asyncio.to_thread(self.export_to_pdf, paper),
+            asyncio.to_thread(self.export_to_latex, paper),
+        )
+        return {"docx": word, "pdf": pdf, "tex": latex}
 
     def _escape_latex(self, text: str) -> str:
         """
@@ -298,25 +495,9 @@ class PaperExportService:
         Returns:
             str: Escaped text
         """
-        # LaTeX special characters that need escaping
-        replacements = {
-            '&': r'\&',
-            '%': r'\%',
-            '$': r'\$',
-            '#': r'\#',
-            '_': r'\_',
-            '{': r'\{',
-            '}': r'\}',
-            '~': r'\textasciitilde{}',
-            '^': r'\textasciicircum{}',
-            '\\': r'\textbackslash{}',
-        }
-
-        result = text
-        for char, replacement in replacements.items():
-            result = result.replace(char, replacement)
-
-        return result
+        # translate maps every character at once, so inserted backslashes and
+        # braces are never escaped a second time
+        return text.translate(_LATEX_ESCAPES)
 
 
 # Global instance
@@ -1,15 +1,19 @@
 """
 Paper management service for business logic operations
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc
+from sqlalchemy import select, insert, update, inspect, func, case, literal, and_, or_, desc, lambda_stmt, tuple_
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime
+import base64
 import uuid
 
 from app.models.paper import Paper, PaperSection, PaperStatus, SectionStatus, PaperCollaborator
 from app.models.user import User
+from app.models.analytics import UserPaperStats
 from app.schemas.paper import (
     PaperCreate, PaperUpdate, PaperSectionCreate, PaperSectionUpdate
 )
@@ -18,6 +22,79 @@ from app.core.exceptions import (
 )
 
 
+# Relationships get_paper_by_id(include_sections=True) eager-loads
+_EAGER_RELATIONSHIPS = {'sections', 'collaborators'}
+
+# Sections every new paper starts with, in order
+DEFAULT_SECTION_TITLES = (
+    "Introduction",
+    "Literature Review",
+    "Methodology",
+    "Results",
+    "Discussion",
+    "Conclusion",
+)
+
+# Paper lists load what PaperListResponse reads up front: one extra query for
+# the collaborators of the whole page (collaborator_count), not a lookup per paper
+_LIST_LOAD_OPTIONS = (selectinload(Paper.collaborators),)
+
+
+# Hot lookups are built as lambda statements: SQLAlchemy caches the construct
+# by the lambda's code location, so only the bound ids change between calls
+def _paper_stmt(paper_id: str, include_sections: bool):
+    """Select a paper by id, optionally eager-loading sections and collaborators"""
+    stmt = lambda_stmt(lambda: select(Paper).where(Paper.id == paper_id))
+    if include_sections:
+        stmt += lambda s: s.options(
+            selectinload(Paper.sections),
+            selectinload(Paper.collaborators)
+        )
+    return stmt
+
+
+def _section_stmt(section_id: str):
+    """Select a paper section by id"""
+    return lambda_stmt(lambda: select(PaperSection).where(PaperSection.id == section_id))
+
+
+def _collaboration_stmt(paper_id: str, user_id: str):
+    """Select a user's collaboration on a paper"""
+    return lambda_stmt(lambda: select(PaperCollaborator).where(
+        and_(
+            PaperCollaborator.paper_id == paper_id,
+            PaperCollaborator.user_id == user_id
+        )
+    ))
+
+
+def encode_paper_cursor(paper: Any) -> str:
+    """Opaque keyset cursor for the page that follows this paper (updated_at, id)
+
+    Accepts a Paper or anything carrying its updated_at and id, such as a
+    PaperListResponse.
+    """
+    raw = f"{paper.updated_at.isoformat()}|{paper.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_paper_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Parse a cursor from encode_paper_cursor"""
+    try:
+        updated_at, paper_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(updated_at), uuid.UUID(paper_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationException("Invalid pagination cursor")
+
+
+def _paginate(query, cursor: Optional[str], skip: int, limit: int):
+    """Order newest first; seek past the cursor when given, else fall back to OFFSET"""
+    query = query.order_by(desc(Paper.updated_at), desc(Paper.id)).limit(limit)
+    if cursor:
+        return query.where(tuple_(Paper.updated_at, Paper.id) < _decode_paper_cursor(cursor))
+    return query.offset(skip)
+
+
 class PaperService:
     """Service for paper management operations"""
 
@@ -46,27 +123,24 @@ class PaperService:
 
         # Create default sections if not provided
         sections_data = paper_data.sections or [
-            PaperSectionCreate(title="Introduction", order=1),
-            PaperSectionCreate(title="Literature Review", order=2),
-            PaperSectionCreate(title="Methodology", order=3),
-            PaperSectionCreate(title="Results", order=4),
-            PaperSectionCreate(title="Discussion", order=5),
-            PaperSectionCreate(title="Conclusion", order=6),
+            PaperSectionCreate(title=title, order=order)
+            for order, title in enumerate(DEFAULT_SECTION_TITLES, 1)
         ]
 
-        # Create sections
-        for section_data in sections_data:
-            section = PaperSection(
+        # Create sections in one bulk INSERT, getting the rows back in the same round-trip
+        sections = await db.scalars(insert(PaperSection).returning(PaperSection, sort_by_parameter_order=True), [
+            dict(
                 title=section_data.title,
                 content=section_data.content,
                 status=section_data.status,
                 order=section_data.order,
                 paper_id=paper.id
             )
-            db.add(section)
+            for section_data in sections_data
+        ])
+        set_committed_value(paper, 'sections', list(sections))
 
         await db.commit()
-        await db.refresh(paper, ['sections'])
 
         return paper
 
@@ -76,17 +150,26 @@ class PaperService:
             paper_id: str,
             include_sections: bool = True
     ) -> Optional[Paper]:
-        """Get paper by ID with optional sections"""
-
-        query = select(Paper).where(Paper.id == paper_id)
-
-        if include_sections:
-            query = query.options(
-                selectinload(Paper.sections),
-                selectinload(Paper.collaborators)
-            )
-
-        result = await db.execute(query)
+        """
+        Get paper by ID with optional sections
+
+        A paper already loaded in this session (e.g. by the endpoint's permission
+        check) is returned from the identity map without another SELECT, as long
+        as the requested relationships are loaded too.
+        """
+        try:
+            key = db.identity_key(Paper, uuid.UUID(str(paper_id)))
+        except ValueError:
+            return None
+
+        paper = db.identity_map.get(key)
+        if paper is not None:
+            state = inspect(paper)
+            needed = _EAGER_RELATIONSHIPS if include_sections else set()
+            if not state.expired_attributes and not needed & state.unloaded:
+                return paper
+
+        result = await db.execute(_paper_stmt(paper_id, include_sections))
         return result.scalar_one_or_none()
 
     async def get_user_papers(
@@ -98,30 +181,32 @@ class PaperService:
             search: Optional[str] = None,
             skip: int = 0,
             limit: int = 50,
-            include_collaborations: bool = True
+            include_collaborations: bool = True,
+            cursor: Optional[str] = None
     ) -> List[Paper]:
-        """Get user's papers with filtering options"""
-
-        # Base query for owned papers
-        owned_query = select(Paper).where(Paper.owner_id == user_id)
+        """
+        Get user's papers with filtering options
 
-        queries = [owned_query]
+        Pass the encode_paper_cursor() of the last paper of a page as cursor to
+        fetch the next one; deep pages then cost the same as the first (skip
+        is ignored when a cursor is given).
+        """
 
-        # Add collaboration query if requested
+        # Owned papers, plus accepted collaborations, in a single query
+        access = Paper.owner_id == user_id
         if include_collaborations:
-            collab_query = select(Paper).join(PaperCollaborator).where(
-                and_(
-                    PaperCollaborator.user_id == user_id,
-                    PaperCollaborator.status == "accepted"
-                )
+            access = or_(
+                access,
+                select(PaperCollaborator.id).where(
+                    and_(
+                        PaperCollaborator.paper_id == Paper.id,
+                        PaperCollaborator.user_id == user_id,
+                        PaperCollaborator.status == "accepted"
+                    )
+                ).exists()
             )
-            queries.append(collab_query)
 
-        # Combine queries
-        if len(queries) > 1:
-            query = queries[0].union(*queries[1:])
-        else:
-            query = queries[0]
+        query = select(Paper).where(access).options(*_LIST_LOAD_OPTIONS)
 
         # Apply filters
         conditions = []
@@ -149,7 +234,7 @@ class PaperService:
             query = query.where(and_(*conditions))
 
         # Add pagination and ordering
-        query = query.order_by(desc(Paper.updated_at)).offset(skip).limit(limit)
+        query = _paginate(query, cursor, skip, limit)
 
         result = await db.execute(query)
         return result.scalars().all()
@@ -162,31 +247,41 @@ class PaperService:
     ) -> Paper:
         """Update paper with provided data"""
 
-        paper = await self.get_paper_by_id(db, paper_id)
-        if not paper:
-            raise NotFoundException("Paper")
-
         # Update fields
         update_data = updates.dict(exclude_unset=True)
 
+        values = {}
         for field, value in update_data.items():
-            if hasattr(paper, field):
+            if field in Paper.__table__.columns:
                 # Convert timezone-aware datetime to timezone-naive for PostgreSQL
                 if isinstance(value, datetime) and value.tzinfo is not None:
                     value = value.replace(tzinfo=None)
-                setattr(paper, field, value)
+                values[field] = value
 
-        paper.updated_at = datetime.utcnow()
+        values['updated_at'] = datetime.utcnow()
+
+        # Single UPDATE ... RETURNING instead of loading the paper graph first
+        result = await db.execute(
+            update(Paper).where(Paper.id == paper_id).values(**values).returning(Paper)
+        )
+        paper = result.scalar_one_or_none()
+        if not paper:
+            raise NotFoundException("Paper")
 
         await db.commit()
-        await db.refresh(paper, ['sections'])
+
+        # Sections are only fetched when the caller hasn't loaded them already
+        if 'sections' in inspect(paper).unloaded:
+            await db.refresh(paper, ['sections'])
 
         return paper
 
     async def delete_paper(self, db: AsyncSession, paper_id: str) -> bool:
         """Delete paper and all related data"""
 
-        paper = await self.get_paper_by_id(db, paper_id, include_sections=False)
+        # Identity-map lookup: no SELECT when the caller already loaded the paper.
+        # Child rows have no ON DELETE CASCADE, so the ORM cascade does the delete
+        paper = await db.get(Paper, uuid.UUID(str(paper_id)))
         if not paper:
             raise NotFoundException("Paper")
 
@@ -204,7 +299,7 @@ class PaperService:
     ) -> Paper:
         """Create a duplicate of an existing paper"""
 
-        original = await self.get_paper_by_id(db, original_paper_id)
+        original = await self.get_paper_by_id(db, original_paper_id, include_sections=False)
         if not original:
             raise NotFoundException("Paper")
 
@@ -223,19 +318,27 @@ class PaperService:
         db.add(new_paper)
         await db.flush()
 
-        # Duplicate sections
-        for original_section in original.sections:
-            new_section = PaperSection(
-                title=original_section.title,
-                content=original_section.content,
-                status=SectionStatus.NOT_STARTED,  # Reset status
-                order=original_section.order,
-                paper_id=new_paper.id
-            )
-            db.add(new_section)
+        # Copy sections server-side with INSERT ... SELECT, so section content
+        # never travels to the app; column defaults are Python-side, so ids and
+        # timestamps are supplied in the SELECT
+        now = datetime.utcnow()
+        copy_sections = insert(PaperSection).from_select(
+            ['id', 'created_at', 'updated_at', 'title', 'content', 'status', 'order', 'paper_id'],
+            select(
+                func.gen_random_uuid(),
+                literal(now, PaperSection.created_at.type),
+                literal(now, PaperSection.updated_at.type),
+                PaperSection.title,
+                PaperSection.content,
+                literal(SectionStatus.NOT_STARTED, PaperSection.status.type),  # Reset status
+                PaperSection.order,
+                literal(new_paper.id, PaperSection.paper_id.type)
+            ).where(PaperSection.paper_id == original.id)
+        ).returning(PaperSection)
+        sections = await db.scalars(copy_sections)
+        set_committed_value(new_paper, 'sections', sorted(sections, key=lambda section: section.order))
 
         await db.commit()
-        await db.refresh(new_paper, ['sections'])
 
         return new_paper
 
@@ -263,7 +366,6 @@ class PaperService:
 
         db.add(section)
         await db.commit()
-        await db.refresh(section)
 
         return section
 
@@ -276,9 +378,7 @@ class PaperService:
         """Update a paper section"""
 
         # Get section
-        result = await db.execute(
-            select(PaperSection).where(PaperSection.id == section_id)
-        )
+        result = await db.execute(_section_stmt(section_id))
         section = result.scalar_one_or_none()
 
         if not section:
@@ -291,17 +391,12 @@ class PaperService:
             if hasattr(section, field):
                 setattr(section, field, value)
 
-        # Update word count if content changed
-        if 'content' in update_data:
-            section.update_word_count()
-
         section.updated_at = datetime.utcnow()
 
         # Update parent paper's progress and word count
         await self._update_paper_metrics(db, section.paper_id)
 
         await db.commit()
-        await db.refresh(section)
 
         return section
 
@@ -309,9 +404,7 @@ class PaperService:
         """Delete a paper section"""
 
         # Get section
-        result = await db.execute(
-            select(PaperSection).where(PaperSection.id == section_id)
-        )
+        result = await db.execute(_section_stmt(section_id))
         section = result.scalar_one_or_none()
 
         if not section:
@@ -335,53 +428,56 @@ class PaperService:
     ) -> Dict[str, Any]:
         """Get comprehensive paper statistics for a user"""
 
-        # Count papers by status
-        status_query = select(
+        # Point lookup of the trigger-maintained summary row
+        stats = await db.get(UserPaperStats, uuid.UUID(str(user_id)))
+        if stats is not None:
+            status_counts = {PaperStatus[name].value: count for name, count in stats.by_status.items()}
+            avg_progress = stats.progress_sum / stats.active_count if stats.active_count else 0
+            return self._statistics_response(
+                status_counts, dict(stats.by_research_area), stats.total_words, avg_progress
+            )
+
+        # No summary row yet (e.g. before the migration ran): aggregate on demand,
+        # in one grouped round-trip; totals are assembled from the groups below
+        active = Paper.status != PaperStatus.ARCHIVED
+        stats_query = select(
             Paper.status,
-            func.count(Paper.id).label('count')
+            Paper.research_area,
+            func.count(Paper.id).label('count'),
+            func.sum(Paper.current_word_count).label('total_words'),
+            func.sum(case((active, Paper.progress), else_=0)).label('progress_sum'),
+            func.count(case((active, Paper.id))).label('active_count')
         ).where(
             Paper.owner_id == user_id
-        ).group_by(Paper.status)
-
-        status_result = await db.execute(status_query)
-        status_counts = {row.status.value: row.count for row in status_result}
+        ).group_by(Paper.status, Paper.research_area)
 
-        # Total word count
-        word_count_query = select(
-            func.sum(Paper.current_word_count).label('total_words')
-        ).where(Paper.owner_id == user_id)
+        stats_result = await db.execute(stats_query)
 
-        word_result = await db.execute(word_count_query)
-        total_words = word_result.scalar() or 0
+        status_counts: Dict[str, int] = {}
+        research_areas: Dict[str, int] = {}
+        total_words = 0
+        progress_sum = 0
+        active_count = 0
+        for row in stats_result:
+            status_counts[row.status.value] = status_counts.get(row.status.value, 0) + row.count
+            if row.research_area:
+                research_areas[row.research_area] = research_areas.get(row.research_area, 0) + row.count
+            total_words += row.total_words or 0
+            progress_sum += row.progress_sum or 0
+            active_count += row.active_count
 
-        # Average progress
-        progress_query = select(
-            func.avg(Paper.progress).label('avg_progress')
-        ).where(
-            and_(
-                Paper.owner_id == user_id,
-                Paper.status != PaperStatus.ARCHIVED
-            )
-        )
-
-        progress_result = await db.execute(progress_query)
-        avg_progress = progress_result.scalar() or 0
-
-        # Research areas
-        areas_query = select(
-            Paper.research_area,
-            func.count(Paper.id).label('count')
-        ).where(
-            and_(
-                Paper.owner_id == user_id,
-                Paper.research_area.isnot(None),
-                Paper.research_area != ""
-            )
-        ).group_by(Paper.research_area)
+        avg_progress = progress_sum / active_count if active_count else 0
 
-        areas_result = await db.execute(areas_query)
-        research_areas = {row.research_area: row.count for row in areas_result}
+        return self._statistics_response(status_counts, research_areas, total_words, avg_progress)
 
+    def _statistics_response(
+            self,
+            status_counts: Dict[str, int],
+            research_areas: Dict[str, int],
+            total_words: int,
+            avg_progress: float
+    ) -> Dict[str, Any]:
+        """Shape paper statistics for the API"""
         return {
             "total_papers": sum(status_counts.values()),
             "status_breakdown": status_counts,
@@ -400,16 +496,26 @@ class PaperService:
     async def _update_paper_metrics(self, db: AsyncSession, paper_id: str):
         """Update paper progress and word count based on sections"""
 
-        paper = await self.get_paper_by_id(db, paper_id)
-        if not paper:
-            return
-
-        # Calculate progress and word count
-        paper.calculate_progress()
-        paper.calculate_word_count()
+        # Aggregated in the database with one UPDATE, so the paper and its
+        # sections are never loaded; pending section changes are autoflushed first
+        in_paper = PaperSection.paper_id == paper_id
+        word_count = select(
+            func.coalesce(func.sum(PaperSection.word_count), 0)
+        ).where(in_paper).scalar_subquery()
+        progress = select(
+            func.coalesce(
+                func.count(case((PaperSection.status == SectionStatus.COMPLETED, 1))) * 100
+                // func.nullif(func.count(PaperSection.id), 0),
+                0
+            )
+        ).where(in_paper).scalar_subquery()
 
-        # Save changes
-        await db.commit()
+        await db.execute(
+            update(Paper)
+            .where(Paper.id == paper_id)
+            .values(current_word_count=word_count, progress=progress, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session="fetch")
+        )
 
     async def search_papers(
             self,
@@ -417,9 +523,10 @@ class PaperService:
             user_id: str,
             query: str,
             filters: Optional[Dict[str, Any]] = None,
-            limit: int = 20
+            limit: int = 20,
+            cursor: Optional[str] = None
     ) -> List[Paper]:
-        """Advanced paper search with full-text capabilities"""
+        """Advanced paper search with full-text capabilities (keyset paginated by cursor)"""
 
         base_query = select(Paper).where(
             or_(
@@ -429,7 +536,7 @@ class PaperService:
                     Paper.status == PaperStatus.PUBLISHED
                 )
             )
-        )
+        ).options(*_LIST_LOAD_OPTIONS)
 
         # Search conditions
         search_conditions = []
@@ -464,7 +571,7 @@ class PaperService:
             base_query = base_query.where(and_(*search_conditions))
 
         # Order by relevance (updated_at for now, could implement ranking)
-        base_query = base_query.order_by(desc(Paper.updated_at)).limit(limit)
+        base_query = _paginate(base_query, cursor, 0, limit)
 
         result = await db.execute(base_query)
         return result.scalars().all()
@@ -478,32 +585,29 @@ class PaperService:
     ) -> PaperCollaborator:
         """Add a collaborator to a paper"""
 
-        # Check if collaboration already exists
-        existing = await db.execute(
-            select(PaperCollaborator).where(
-                and_(
-                    PaperCollaborator.paper_id == paper_id,
-                    PaperCollaborator.user_id == user_id
-                )
+        # Insert unless the collaboration already exists, atomically and in one
+        # round-trip (relies on uq_paper_collaborators_paper_user).
+        # Direct add without invitation, so it is accepted straight away
+        result = await db.execute(
+            pg_insert(PaperCollaborator)
+            .values(
+                paper_id=paper_id,
+                user_id=user_id,
+                role=role,
+                status="accepted",
+                accepted_at=datetime.utcnow(),
+                can_edit=role in ["editor", "co-author"],
+                can_invite_others=role == "co-author"
             )
+            .on_conflict_do_nothing(index_elements=['paper_id', 'user_id'])
+            .returning(PaperCollaborator)
         )
+        collaboration = result.scalar_one_or_none()
 
-        if existing.scalar_one_or_none():
+        if not collaboration:
             raise ValidationException("User is already a collaborator")
 
-        # Create collaboration
-        collaboration = PaperCollaborator(
-            paper_id=paper_id,
-            user_id=user_id,
-            role=role,
-            status="accepted"  # Direct add without invitation
-        )
-
-        collaboration.accept_invitation()
-
-        db.add(collaboration)
         await db.commit()
-        await db.refresh(collaboration)
 
         return collaboration
 
@@ -515,14 +619,7 @@ class PaperService:
     ) -> bool:
         """Remove a collaborator from a paper"""
 
-        collaboration = await db.execute(
-            select(PaperCollaborator).where(
-                and_(
-                    PaperCollaborator.paper_id == paper_id,
-                    PaperCollaborator.user_id == user_id
-                )
-            )
-        )
+        collaboration = await db.execute(_collaboration_stmt(paper_id, user_id))
 
         collab = collaboration.scalar_one_or_none()
         if not collab:
@@ -2,13 +2,57 @@
 PDF Analysis Service for Reference Papers
 Extracts text and analyzes writing style from academic papers
 """
+import asyncio
+import hashlib
+import io
 import logging
 import re
-from typing import Dict, List, Any, Optional
+import threading
+from collections import Counter, OrderedDict
+from itertools import islice
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE = re.compile(r'\s+')
+
+# Style features found in the cleaned text. Each is its own scan: the matches
+# overlap (a citation ends a sentence, a capitalized phrase can hold a passive),
+# and every feature counts all of its own matches
+_SENTENCE_END = re.compile(r'[.!?]+')
+_PASSIVE_PATTERNS = (
+    re.compile(r'\b(?:is|are|was|were|been|be)\s+\w+ed\b', re.IGNORECASE),
+    re.compile(r'\b(?:is|are|was|were|been|be)\s+being\s+\w+ed\b', re.IGNORECASE),
+)
+_CITATION = re.compile(r'\([A-Z][a-z]+(?:\set\sal\.)?,?\s*\d{4}\)|\[\d+\]')  # (Author, Year) or [1]
+_CAPITALIZED_PHRASE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b')
+_COMPLEX_WORD = re.compile(r'\b\w{10,}(?:tion|ment|ness|ity|ology|graphy)\b', re.IGNORECASE)
+
+# Heading lines in the raw (uncleaned) text: ALL CAPS, numbered, or Title Case
+_SECTION_HEADING = re.compile(
+    r'\n\s*([A-Z][A-Z\s]{2,})(?=\n)'
+    r'|\n\s*(\d+\.?\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)(?=\n)'
+    r'|\n\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)(?=\n\s*[A-Z])'
+)
+
+# PDFium is not thread-safe, even across separate documents, and extraction
+# runs in worker threads (aextract_and_analyze); all pdfium calls hold this lock
+_PDFIUM_LOCK = threading.Lock()
+
+# Analyses remembered by text digest (re-uploads and re-analyze requests)
+STYLE_CACHE_MAX = 256
+
+_COMMON_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with'})
+
+
+def _non_blank(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end] has non-space content, without slicing
+
+    Only valid on cleaned text, where whitespace runs are a single space.
+    """
+    return end - start > 1 or (end - start == 1 and text[start] != ' ')
+
 
 class PDFAnalyzer:
     """Service for analyzing PDF papers and extracting writing style features"""
@@ -16,14 +60,29 @@ class PDFAnalyzer:
     def __init__(self):
         """Initialize PDF analyzer"""
         self.initialized = False
+        self.backend = None
+        self._style_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._style_cache_lock = threading.Lock()
         try:
-            # Try to import PyPDF2
+            # Prefer pypdfium2 (PDFium C++ engine, much faster than PyPDF2)
+            import pypdfium2
+            self.pdf_lib = pypdfium2
+            self.backend = "pdfium"
+            self.initialized = True
+            logger.info("✅ PDF Analyzer initialized with pypdfium2")
+            return
+        except ImportError:
+            pass
+
+        try:
+            # Fall back to PyPDF2 (pure Python, much slower)
             import PyPDF2
             self.pdf_lib = PyPDF2
+            self.backend = "pypdf2"
             self.initialized = True
             logger.info("✅ PDF Analyzer initialized with PyPDF2")
         except ImportError:
-            logger.warning("⚠️ PyPDF2 not installed - PDF extraction disabled")
+            logger.warning("⚠️ Neither pypdfium2 nor PyPDF2 installed - PDF extraction disabled")
 
     def extract_text_from_pdf(self, file_path: str) -> Optional[str]:
         """
@@ -40,21 +99,16 @@ class PDFAnalyzer:
             return None
 
         try:
-            text_content = []
+            # Pages are appended to one growing buffer instead of a list of
+            # page strings that is then joined into a second full copy
+            buf = io.StringIO()
 
-            with open(file_path, 'rb') as file:
-                pdf_reader = self.pdf_lib.PdfReader(file)
-                num_pages = len(pdf_reader.pages)
+            if self.backend == "pdfium":
+                self._extract_pdfium(file_path, buf)
+            else:
+                self._extract_pypdf2(file_path, buf)
 
-                logger.info(f"📄 Extracting text from {num_pages} pages...")
-
-                for page_num in range(num_pages):
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
-                    if text:
-                        text_content.append(text)
-
-            full_text = "\n".join(text_content)
+            full_text = buf.getvalue()
             logger.info(f"✅ Extracted {len(full_text)} characters from PDF")
 
             return full_text
@@ -63,6 +117,72 @@ class PDFAnalyzer:
             logger.error(f"❌ Failed to extract PDF text: {str(e)}")
             return None
 
+    def _extract_pdfium(self, file_path: str, buf: io.StringIO) -> None:
+        """Write the text of every page to buf using pypdfium2 (one document at a time)"""
+        with _PDFIUM_LOCK:
+            self._extract_pdfium_locked(file_path, buf)
+
+    def _extract_pdfium_locked(self, file_path: str, buf: io.StringIO) -> None:
+        """_extract_pdfium body; the caller holds _PDFIUM_LOCK"""
+        doc = self.pdf_lib.PdfDocument(file_path)
+        try:
+            logger.info(f"📄 Extracting text from {len(doc)} pages...")
+
+            for page in doc:
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+                if text:
+                    if buf.tell():
+                        buf.write("\n")
+                    # PDFium ends lines with \r\n; the heading patterns (and
+                    # PyPDF2's output) use \n
+                    buf.write(text.replace('\r\n', '\n').replace('\r', '\n'))
+        finally:
+            doc.close()
+
+    def _extract_pypdf2(self, file_path: str, buf: io.StringIO) -> None:
+        """Write the text of every page to buf using PyPDF2"""
+        with open(file_path, 'rb') as file:
+            pdf_reader = self.pdf_lib.PdfReader(file)
+            num_pages = len(pdf_reader.pages)
+
+            logger.info(f"📄 Extracting text from {num_pages} pages...")
+
+            for page in pdf_reader.pages:
+                text = page.extract_text()
+                if text:
+                    if buf.tell():
+                        buf.write("\n")
+                    buf.write(text)
+
+    async def aextract_and_analyze(self, file_path: str) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Extract text from a PDF and analyze its writing style off the event loop
+
+        PyPDF2 parsing and the style scan are synchronous and CPU bound, so they
+        run in a worker thread to keep other requests moving.
+
+        Args:
+            file_path: Path to PDF file
+
+        Returns:
+            Tuple of (extracted text or None, writing style features)
+        """
+        return await asyncio.to_thread(self._extract_and_analyze_sync, file_path)
+
+    async def aanalyze_writing_style(self, text: str) -> Dict[str, Any]:
+        """Analyze writing style in a worker thread (see analyze_writing_style)"""
+        return await asyncio.to_thread(self.analyze_writing_style, text)
+
+    def _extract_and_analyze_sync(self, file_path: str) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Extract text and analyze it in one blocking call"""
+        text = self.extract_text_from_pdf(file_path)
+        return text, self.analyze_writing_style(text) if text else {}
+
     def analyze_writing_style(self, text: str) -> Dict[str, Any]:
         """
         Analyze writing style from extracted text
@@ -76,21 +196,75 @@ class PDFAnalyzer:
         if not text:
             return {}
 
+        # The analysis is a pure function of the text, so it is cached by digest
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+        with self._style_cache_lock:
+            cached = self._style_cache.get(digest)
+            if cached is not None:
+                self._style_cache.move_to_end(digest)
+                logger.info(f"✅ Writing style cache hit ({cached['word_count']} words)")
+                return dict(cached)
+
+        features = self._analyze_writing_style(text)
+
+        if features:
+            with self._style_cache_lock:
+                self._style_cache[digest] = features
+                if len(self._style_cache) > STYLE_CACHE_MAX:
+                    self._style_cache.popitem(last=False)
+
+        return dict(features)
+
+    def _analyze_writing_style(self, text: str) -> Dict[str, Any]:
+        """Compute writing style features (uncached, see analyze_writing_style)"""
         try:
+            # Headings are line based, so they are read before whitespace is collapsed
+            section_structure = self._extract_section_structure(text)
+
             # Clean text
             text = self._clean_text(text)
 
+            # Word-level features share one tokenization, lowercased per word
+            # rather than copying the whole text; a Counter gives both the word
+            # count and the unique words
+            words = list(map(str.lower, text.split()))
+            word_counts = Counter(words)
+            word_count = word_counts.total()
+            unique_words = len(word_counts)
+
+            # Sentences are the non-blank gaps between boundaries, found from the
+            # match indices without slicing. Their words are counted with the
+            # boundaries as separators, so "3.5" counts as two words here
+            sentences = 0
+            boundaries = 0
+            last_end = 0
+            for m in _SENTENCE_END.finditer(text):
+                boundaries += 1
+                if _non_blank(text, last_end, m.start()):
+                    sentences += 1
+                last_end = m.end()
+            if _non_blank(text, last_end, len(text)):
+                sentences += 1
+            sentence_words = len(_SENTENCE_END.sub(' ', text).split())
+
+            passive_count = sum(len(pattern.findall(text)) for pattern in _PASSIVE_PATTERNS)
+            citations = len(_CITATION.findall(text))
+
+            # Capitalized phrases rank ahead of complex words with the same count
+            term_counts = Counter(map(str.lower, _CAPITALIZED_PHRASE.findall(text)))
+            term_counts.update(map(str.lower, _COMPLEX_WORD.findall(text)))
+
             # Calculate various style metrics
             features = {
-                "avg_sentence_length": self._calculate_avg_sentence_length(text),
-                "vocabulary_complexity": self._calculate_vocabulary_complexity(text),
-                "passive_voice_ratio": self._estimate_passive_voice_ratio(text),
-                "common_phrases": self._extract_common_phrases(text),
-                "technical_terms": self._extract_technical_terms(text),
-                "citation_density": self._estimate_citation_density(text),
-                "section_structure": self._extract_section_structure(text),
-                "word_count": len(text.split()),
-                "unique_words": len(set(text.lower().split())),
+                "avg_sentence_length": sentence_words / sentences if sentences else 0.0,
+                "vocabulary_complexity": unique_words / word_count if word_count else 0.0,
+                "passive_voice_ratio": min(passive_count / (boundaries + 1), 1.0),
+                "common_phrases": self._extract_common_phrases(words),
+                "technical_terms": [term for term, count in term_counts.most_common(15)],
+                "citation_density": citations / word_count * 1000 if word_count else 0.0,
+                "section_structure": section_structure,
+                "word_count": word_count,
+                "unique_words": unique_words,
             }
 
             logger.info(f"✅ Analyzed writing style: {features['word_count']} words, "
@@ -103,162 +277,52 @@ class PDFAnalyzer:
             return {}
 
     def _clean_text(self, text: str) -> str:
-        """Clean and normalize text"""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove page numbers and headers/footers patterns
-        text = re.sub(r'\n\d+\n', '\n', text)
-        return text.strip()
+        """Clean and normalize text (collapse all whitespace)"""
+        return _WHITESPACE.sub(' ', text).strip()
 
-    def _calculate_avg_sentence_length(self, text: str) -> float:
-        """Calculate average sentence length in words"""
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-
-        if not sentences:
-            return 0.0
-
-        total_words = sum(len(s.split()) for s in sentences)
-        return total_words / len(sentences)
-
-    def _calculate_vocabulary_complexity(self, text: str) -> float:
+    def _extract_common_phrases(self, words: List[str], top_n: int = 10) -> List[str]:
         """
-        Calculate vocabulary complexity (unique words / total words)
-        Range: 0.0 to 1.0 (higher = more diverse vocabulary)
-        """
-        words = text.lower().split()
-        if not words:
-            return 0.0
-
-        unique_words = set(words)
-        return len(unique_words) / len(words)
-
-    def _estimate_passive_voice_ratio(self, text: str) -> float:
-        """
-        Estimate passive voice usage ratio
-        Looks for common passive voice patterns
-        """
-        # Common passive voice indicators
-        passive_patterns = [
-            r'\b(is|are|was|were|been|be)\s+\w+ed\b',
-            r'\b(is|are|was|were|been|be)\s+being\s+\w+ed\b',
-        ]
-
-        passive_count = 0
-        for pattern in passive_patterns:
-            passive_count += len(re.findall(pattern, text, re.IGNORECASE))
+        Extract common phrases (bigrams)
 
-        sentences = len(re.split(r'[.!?]+', text))
-        if sentences == 0:
-            return 0.0
-
-        return min(passive_count / sentences, 1.0)
-
-    def _extract_common_phrases(self, text: str, top_n: int = 10) -> List[str]:
-        """
-        Extract common phrases (bigrams and trigrams)
+        Args:
+            words: Lowercased words of the text
 
         Returns:
             List of common phrases
         """
-        # Convert to lowercase
-        text_lower = text.lower()
+        # Count frequency on word pairs, skipping phrases made only of common
+        # words; only the top N are joined into strings
+        phrase_counts = Counter(
+            pair for pair in zip(words, islice(words, 1, None))
+            if self._is_meaningful_phrase(pair)
+        )
 
-        # Extract bigrams (2-word phrases)
-        words = text_lower.split()
-        bigrams = [f"{words[i]} {words[i+1]}" for i in range(len(words)-1)]
+        return [f"{first} {second}" for (first, second), count in phrase_counts.most_common(top_n)]
 
-        # Count frequency
-        phrase_counts = {}
-        for phrase in bigrams:
-            # Filter out phrases with too many common words
-            if self._is_meaningful_phrase(phrase):
-                phrase_counts[phrase] = phrase_counts.get(phrase, 0) + 1
-
-        # Sort by frequency and return top N
-        sorted_phrases = sorted(phrase_counts.items(), key=lambda x: x[1], reverse=True)
-        return [phrase for phrase, count in sorted_phrases[:top_n]]
-
-    def _is_meaningful_phrase(self, phrase: str) -> bool:
+    def _is_meaningful_phrase(self, phrase: Tuple[str, ...]) -> bool:
         """Check if phrase is meaningful (not just common words)"""
-        common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with'}
-        words = phrase.split()
-        return not all(word in common_words for word in words)
-
-    def _extract_technical_terms(self, text: str, top_n: int = 15) -> List[str]:
-        """
-        Extract likely technical terms (capitalized multi-word phrases or complex words)
-
-        Returns:
-            List of technical terms
-        """
-        # Find capitalized phrases (likely technical terms)
-        capitalized_phrases = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b', text)
-
-        # Find complex words (long words with specific suffixes)
-        complex_words = re.findall(r'\b\w{10,}(?:tion|ment|ness|ity|ology|graphy)\b', text, re.IGNORECASE)
-
-        # Combine and count
-        all_terms = capitalized_phrases + complex_words
-        term_counts = {}
-        for term in all_terms:
-            term_lower = term.lower()
-            term_counts[term_lower] = term_counts.get(term_lower, 0) + 1
-
-        # Sort by frequency
-        sorted_terms = sorted(term_counts.items(), key=lambda x: x[1], reverse=True)
-        return [term for term, count in sorted_terms[:top_n]]
-
-    def _estimate_citation_density(self, text: str) -> float:
-        """
-        Estimate citation density (citations per 1000 words)
-
-        Looks for patterns like (Author, Year) or [1]
-        """
-        # Pattern for (Author, Year) citations
-        author_year_pattern = r'\([A-Z][a-z]+(?:\set\sal\.)?,?\s*\d{4}\)'
-        # Pattern for [1] style citations
-        numbered_pattern = r'\[\d+\]'
-
-        author_year_citations = len(re.findall(author_year_pattern, text))
-        numbered_citations = len(re.findall(numbered_pattern, text))
-
-        total_citations = author_year_citations + numbered_citations
-        word_count = len(text.split())
-
-        if word_count == 0:
-            return 0.0
-
-        # Return citations per 1000 words
-        return (total_citations / word_count) * 1000
+        return not _COMMON_WORDS.issuperset(phrase)
 
     def _extract_section_structure(self, text: str) -> List[str]:
         """
         Extract section headings from paper
 
+        Args:
+            text: Raw extracted text (line breaks preserved)
+
         Returns:
             List of section names
         """
-        # Common academic paper section patterns
-        section_patterns = [
-            r'\n\s*([A-Z][A-Z\s]{2,})\n',  # ALL CAPS sections
-            r'\n\s*(\d+\.?\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\n',  # Numbered sections
-            r'\n\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\n(?=\s*[A-Z])',  # Title Case sections
-        ]
-
-        sections = []
-        for pattern in section_patterns:
-            matches = re.findall(pattern, text)
-            sections.extend(matches)
-
-        # Clean and deduplicate
-        sections = [s.strip() for s in sections]
-        sections = list(dict.fromkeys(sections))  # Remove duplicates while preserving order
-
-        # Filter out very long sections (likely not headings)
-        sections = [s for s in sections if len(s.split()) <= 6]
-
-        return sections[:15]  # Return max 15 sections
+        # Clean and deduplicate, preserving order; very long lines are not headings
+        sections = {}
+        for m in _SECTION_HEADING.finditer(text):
+            heading = m.group(m.lastindex).strip()
+            if len(heading.split()) <= 6:
+                sections[heading] = None
+                if len(sections) == 15:  # Return max 15 sections
+                    break
+
+        return list(sections)
 
 
 # Global instance
@@ -3,14 +3,91 @@ Presence tracking service for real-time online status
 Efficient implementation with caching to avoid performance impact
 """
 import logging
+import time
+from collections import OrderedDict
+from itertools import takewhile
 from typing import Dict, Set, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, text
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
+# Seconds since the last heartbeat a user still counts as online / away
+ONLINE_SECONDS = 300
+AWAY_SECONDS = 1800
+
+# Above this many pending users, rows are COPYed into a temp table instead
+COPY_THRESHOLD = 500
+
+# Rows fetched per batch when warming the presence cache on startup
+LOAD_BATCH_SIZE = 1000
+
+# Most users kept in presence_cache; the least recently active are evicted
+PRESENCE_CACHE_MAX = 50_000
+
+# Sets last_active_at for many users in one round-trip from parallel arrays.
+# Rows locked by another transaction (a concurrent flush from another worker,
+# a profile update) are skipped instead of waited on; rows are locked in id
+# order so overlapping flushes cannot deadlock. RETURNING names the rows written
+_BULK_LAST_ACTIVE_SQL = text(
+    "WITH data AS ("
+    "SELECT unnest(CAST(:ids AS uuid[])) AS id, unnest(CAST(:ts AS timestamp[])) AS ts"
+    "), locked AS ("
+    "SELECT users.id FROM users WHERE users.id IN (SELECT id FROM data) "
+    "ORDER BY users.id FOR UPDATE SKIP LOCKED"
+    ") "
+    "UPDATE users SET last_active_at = data.ts FROM data "
+    "WHERE users.id = data.id AND users.id IN (SELECT id FROM locked) "
+    "RETURNING users.id"
+)
+
+# The same for rows COPYed into the presence_tmp temp table
+_COPY_LAST_ACTIVE_SQL = text(
+    "WITH locked AS ("
+    "SELECT users.id FROM users WHERE users.id IN (SELECT id FROM presence_tmp) "
+    "ORDER BY users.id FOR UPDATE SKIP LOCKED"
+    ") "
+    "UPDATE users SET last_active_at = t.last_active_at FROM presence_tmp t "
+    "WHERE users.id = t.id AND users.id IN (SELECT id FROM locked) "
+    "RETURNING users.id"
+)
+
+
+def _status_for(delta: float) -> str:
+    """Presence status for seconds since last activity"""
+    if delta < ONLINE_SECONDS:
+        return 'online'
+    if delta < AWAY_SECONDS:
+        return 'away'
+    return 'offline'
+
+
+def _to_datetime(ts: Optional[float]) -> Optional[datetime]:
+    """Epoch seconds to naive UTC datetime (the DB and API representation)"""
+    return datetime.utcfromtimestamp(ts) if ts is not None else None
+
+
+def to_iso(ts: Optional[float]) -> Optional[str]:
+    """Epoch seconds to the API's ISO 8601 (naive UTC) string, formatted on demand"""
+    return datetime.utcfromtimestamp(ts).isoformat() if ts is not None else None
+
+
+def _to_timestamp(value: datetime) -> float:
+    """Naive UTC datetime (as stored in the DB) to epoch seconds"""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class PresenceEntry:
+    """Cached presence of one user, updated in place on every heartbeat"""
+    __slots__ = ('status', 'last_seen')
+
+    def __init__(self, status: str, last_seen: Optional[float]):
+        self.status = status
+        self.last_seen = last_seen
+
 
 class PresenceService:
     """
@@ -24,17 +101,21 @@ class PresenceService:
     """
 
     def __init__(self):
-        # Track active users: {user_id: last_activity_timestamp}
-        self.active_users: Dict[str, datetime] = {}
+        # Track active users: {user_id: last_activity_epoch_seconds}, ordered from
+        # least to most recently active, so sweeps for online/away users walk back
+        # from the newest and stop at the first one past the cutoff.
+        # Timestamps are kept as floats; datetimes are only built for the DB and API
+        self.active_users: "OrderedDict[str, float]" = OrderedDict()
 
-        # Cache user presence data: {user_id: {'status': 'online', 'last_seen': datetime}}
-        self.presence_cache: Dict[str, dict] = {}
+        # Cache user presence data: {user_id: PresenceEntry('online', epoch_seconds)},
+        # ordered from least to most recently active and capped at PRESENCE_CACHE_MAX
+        self.presence_cache: "OrderedDict[str, PresenceEntry]" = OrderedDict()
 
         # Track users needing DB update
         self.pending_updates: Set[str] = set()
 
-        # Last batch update timestamp
-        self.last_batch_update = datetime.utcnow()
+        # Last batch update timestamp (epoch seconds)
+        self.last_batch_update = time.time()
 
         logger.info("✅ PresenceService initialized")
 
@@ -45,23 +126,34 @@ class PresenceService:
         This is called frequently but doesn't hit the database immediately
         Updates are batched for performance
         """
-        now = datetime.utcnow()
+        now = time.time()
         self.active_users[user_id] = now
+        self.active_users.move_to_end(user_id)
         self.pending_updates.add(user_id)
 
-        # Update cache
-        self.presence_cache[user_id] = {
-            'status': 'online',
-            'last_seen': now
-        }
+        # Update cache (in place for known users, no per-heartbeat allocation)
+        entry = self.presence_cache.get(user_id)
+        if entry is None:
+            self._cache_entry(user_id, PresenceEntry('online', now))
+        else:
+            entry.status = 'online'
+            entry.last_seen = now
+            self.presence_cache.move_to_end(user_id)
+
+    def _cache_entry(self, user_id: str, entry: PresenceEntry) -> None:
+        """Add a presence cache entry, evicting the least recently active if full"""
+        self.presence_cache[user_id] = entry
+        if len(self.presence_cache) > PRESENCE_CACHE_MAX:
+            self.presence_cache.popitem(last=False)
 
     def mark_inactive(self, user_id: str) -> None:
         """Remove user from active tracking (on disconnect)"""
         self.active_users.pop(user_id, None)
 
         # Update cache to away/offline based on last seen
-        if user_id in self.presence_cache:
-            self.presence_cache[user_id]['status'] = 'offline'
+        entry = self.presence_cache.get(user_id)
+        if entry is not None:
+            entry.status = 'offline'
 
     async def batch_update_database(self, db: AsyncSession) -> None:
         """
@@ -76,17 +168,37 @@ class PresenceService:
             user_ids_to_update = list(self.pending_updates)
             self.pending_updates.clear()
 
-            # Batch update in database
-            for user_id in user_ids_to_update:
-                if user_id in self.active_users:
-                    await db.execute(
-                        update(User)
-                        .where(User.id == user_id)
-                        .values(last_active_at=self.active_users[user_id])
-                    )
+            # Batch update in database, one statement for the whole set
+            params = [
+                {"id": user_id, "last_active_at": _to_datetime(self.active_users[user_id])}
+                for user_id in user_ids_to_update
+                if user_id in self.active_users
+            ]
+            skipped: Set[str] = set()
+            if params:
+                if db.bind.dialect.name == "postgresql":
+                    if len(params) > COPY_THRESHOLD:
+                        written = await self._copy_update_last_active(db, params)
+                    else:
+                        result = await db.execute(
+                            _BULK_LAST_ACTIVE_SQL,
+                            {
+                                "ids": [p["id"] for p in params],
+                                "ts": [p["last_active_at"] for p in params]
+                            }
+                        )
+                        written = {str(user_id) for user_id in result.scalars()}
+                    skipped = {p["id"] for p in params} - written
+                else:
+                    # ORM bulk UPDATE by primary key (executemany)
+                    await db.execute(update(User), params)
 
             await db.commit()
-            self.last_batch_update = datetime.utcnow()
+            self.last_batch_update = time.time()
+
+            # Rows that were locked elsewhere are retried on the next flush
+            if skipped:
+                self.pending_updates.update(skipped)
 
             logger.debug(f"✅ Batch updated {len(user_ids_to_update)} user presence records")
 
@@ -94,43 +206,75 @@ class PresenceService:
             logger.error(f"❌ Failed to batch update presence: {e}")
             await db.rollback()
 
+    async def _copy_update_last_active(self, db: AsyncSession, params: List[dict]) -> Set[str]:
+        """
+        Apply a large presence flush via COPY into a temp table plus one UPDATE
+
+        COPY skips per-row statement parsing and planning, so it stays cheap for
+        thousands of rows. The temp table is dropped when the transaction commits.
+
+        Returns:
+            IDs of the users whose row was written (locked rows are skipped)
+        """
+        conn = await db.connection()
+        await conn.execute(text(
+            "CREATE TEMP TABLE presence_tmp (id uuid, last_active_at timestamp) ON COMMIT DROP"
+        ))
+
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            'presence_tmp',
+            records=[(UUID(p["id"]), p["last_active_at"]) for p in params],
+            columns=['id', 'last_active_at']
+        )
+
+        result = await conn.execute(_COPY_LAST_ACTIVE_SQL)
+        return {str(user_id) for user_id in result.scalars()}
+
     def get_user_status(self, user_id: str) -> dict:
         """
         Get user status from cache (fast, no DB query)
 
         Returns:
-            {'status': 'online'|'away'|'offline', 'last_seen': datetime}
+            {'status': 'online'|'away'|'offline', 'last_seen': epoch seconds or None}
+            (format last_seen with to_iso)
         """
-        if user_id in self.presence_cache:
-            cached = self.presence_cache[user_id]
-
-            # Determine which timestamp to use for status calculation
-            if user_id in self.active_users:
-                # User is actively sending heartbeats - use real-time timestamp
-                last_active = self.active_users[user_id]
-            else:
-                # User not currently active - use cached last_seen from DB
-                last_active = cached.get('last_seen')
-
-            # Update status based on last_active timestamp
-            if last_active:
-                delta = (datetime.utcnow() - last_active).total_seconds()
-                if delta < 300:  # 5 minutes - online
-                    cached['status'] = 'online'
-                elif delta < 1800:  # 30 minutes - away
-                    cached['status'] = 'away'
-                else:  # > 30 minutes - offline
-                    cached['status'] = 'offline'
-            else:
-                # No timestamp available, mark as offline
-                cached['status'] = 'offline'
-
-            return cached
-
-        # Not in cache, return offline
+        now = time.time()
+        return self._user_status(user_id, now - ONLINE_SECONDS, now - AWAY_SECONDS)
+
+    def _user_status(self, user_id: str, online_after: float, away_after: float) -> dict:
+        """
+        get_user_status against caller-supplied cutoffs
+
+        Args:
+            online_after: Activity after this epoch time counts as online
+            away_after: Activity after this epoch time (and not online) counts as away
+        """
+        cached = self.presence_cache.get(user_id)
+        if cached is None:
+            # Not in cache, return offline
+            return {
+                'status': 'offline',
+                'last_seen': None
+            }
+
+        # Users sending heartbeats use the real-time timestamp, others the
+        # cached last_seen from the DB
+        last_active = self.active_users.get(user_id, cached.last_seen)
+
+        # Update status based on last_active timestamp (no timestamp: offline)
+        if not last_active:
+            cached.status = 'offline'
+        elif last_active > online_after:
+            cached.status = 'online'
+        elif last_active > away_after:
+            cached.status = 'away'
+        else:
+            cached.status = 'offline'
+
         return {
-            'status': 'offline',
-            'last_seen': None
+            'status': cached.status,
+            'last_seen': cached.last_seen
         }
 
     async def get_online_users(self, db: AsyncSession, user_ids: List[str] = None) -> Dict[str, dict]:
@@ -141,34 +285,30 @@ class PresenceService:
             user_ids: List of user IDs to check (if None, returns all online users)
 
         Returns:
-            {user_id: {'status': 'online'|'away'|'offline', 'last_seen': datetime}}
+            {user_id: {'status': 'online'|'away'|'offline', 'last_seen': epoch seconds or None}}
         """
-        result = {}
+        # Timestamps are compared against two cutoffs computed once per call,
+        # rather than taking and classifying a difference for every user
+        now = time.time()
+        online_after = now - ONLINE_SECONDS
+        away_after = now - AWAY_SECONDS
 
         # If specific users requested, check cache first
         if user_ids:
-            for user_id in user_ids:
-                result[user_id] = self.get_user_status(user_id)
-            return result
-
-        # Otherwise return all online/away users
-        now = datetime.utcnow()
-        for user_id, last_active in self.active_users.items():
-            delta = (now - last_active).total_seconds()
-
-            if delta < 300:  # 5 minutes
-                status = 'online'
-            elif delta < 1800:  # 30 minutes
-                status = 'away'
-            else:
-                continue  # Skip offline users
-
-            result[user_id] = {
-                'status': status,
+            user_status = self._user_status
+            return {user_id: user_status(user_id, online_after, away_after) for user_id in user_ids}
+
+        # Otherwise return all online/away users, newest first; offline users
+        # are older than every away user, so the sweep ends at the first one
+        return {
+            user_id: {
+                'status': 'online' if last_active > online_after else 'away',
                 'last_seen': last_active
             }
-
-        return result
+            for user_id, last_active in takewhile(
+                lambda item: item[1] > away_after, reversed(self.active_users.items())
+            )
+        }
 
     async def load_recent_activity(self, db: AsyncSession, minutes: int = 30) -> None:
         """
@@ -179,47 +319,38 @@ class PresenceService:
         active_users should only contain users who are currently sending heartbeats
         """
         try:
-            threshold = datetime.utcnow() - timedelta(minutes=minutes)
+            threshold = _to_datetime(time.time() - minutes * 60)
 
-            result = await db.execute(
+            # Streamed with a server-side cursor in batches, so the rows are
+            # never all held in memory at once
+            result = await db.stream(
                 select(User.id, User.last_active_at)
                 .where(User.last_active_at >= threshold)
+                .execution_options(yield_per=LOAD_BATCH_SIZE)
             )
 
-            users = result.all()
-            now = datetime.utcnow()
+            now = time.time()
+            loaded = 0
 
-            for user_id, last_active_at in users:
-                if last_active_at:
-                    # Calculate status based on last_active_at
-                    delta = (now - last_active_at).total_seconds()
+            async for user_id, last_active_at in result:
+                # Calculate status based on last_active_at
+                last_seen = _to_timestamp(last_active_at)
 
-                    if delta < 300:  # 5 minutes - consider online
-                        status = 'online'
-                    elif delta < 1800:  # 30 minutes - consider away
-                        status = 'away'
-                    else:
-                        status = 'offline'
+                # ONLY populate cache, NOT active_users
+                # active_users is populated only when user actually sends heartbeat
+                self._cache_entry(str(user_id), PresenceEntry(_status_for(now - last_seen), last_seen))
+                loaded += 1
 
-                    # ONLY populate cache, NOT active_users
-                    # active_users is populated only when user actually sends heartbeat
-                    self.presence_cache[str(user_id)] = {
-                        'status': status,
-                        'last_seen': last_active_at
-                    }
-
-            logger.info(f"✅ Loaded {len(users)} recently active users into presence cache")
+            logger.info(f"✅ Loaded {loaded} recently active users into presence cache")
 
         except Exception as e:
             logger.error(f"❌ Failed to load recent activity: {e}")
 
     def get_online_count(self) -> int:
-        """Get count of currently online users (fast)"""
-        now = datetime.utcnow()
-        return sum(
-            1 for last_active in self.active_users.values()
-            if (now - last_active).total_seconds() < 300
-        )
+        """Get count of currently online users (fast: visits only the online users)"""
+        online_after = time.time() - ONLINE_SECONDS
+        return sum(1 for _ in takewhile(lambda last_active: last_active > online_after,
+                                         reversed(self.active_users.values())))
 
 
 # Global instance
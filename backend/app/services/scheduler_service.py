@@ -2,18 +2,90 @@
 Scheduler service for periodic tasks
 backend/app/services/scheduler_service.py
 """
+import asyncio
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime, timedelta
-from typing import List
-from sqlalchemy import select
+from typing import Any, List
+from sqlalchemy import select, update, or_, cast
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.database.session import async_session_maker
 from app.models.user import User
-from app.models.paper import Paper
+from app.models.paper import Paper, PaperStatus
 from app.services.email_service import email_service
 
+# Emails in flight at once; overlaps provider round trips without flooding it
+EMAIL_CONCURRENCY = 20
+
+# Users served within a job's interval are not selected again (e.g. on a
+# retry). The slack keeps a send that finished just after the cron time from
+# making the user miss the next scheduled run
+WEEKLY_REPORT_INTERVAL = timedelta(days=7)
+AI_SUGGESTION_INTERVAL = timedelta(days=1)
+SEND_SLACK = timedelta(hours=1)
+
+# Users whose send cursor is advanced per UPDATE + commit
+CURSOR_BATCH_SIZE = 100
+
+
+async def _send_all(sends: list) -> List[Any]:
+    """
+    Await email coroutines concurrently, at most EMAIL_CONCURRENCY at a time
+
+    Returns:
+        One result per coroutine, in order; exceptions are returned, not raised
+    """
+    semaphore = asyncio.Semaphore(EMAIL_CONCURRENCY)
+
+    async def bounded(send):
+        async with semaphore:
+            return await send
+
+    return await asyncio.gather(*(bounded(send) for send in sends), return_exceptions=True)
+
+
+def _succeeded(outcome: Any) -> bool:
+    """Whether an email_service result (or raised exception) is a successful send"""
+    return not isinstance(outcome, Exception) and bool(outcome.get('success'))
+
+
+def _due(sent_at_column, interval: timedelta):
+    """SQL filter for users not sent this email within interval (indexed column)"""
+    return or_(
+        sent_at_column.is_(None),
+        sent_at_column < datetime.utcnow() - interval + SEND_SLACK
+    )
+
+
+async def _advance_cursor(db: AsyncSession, sent_at_column, user_ids: list, sent_at: datetime) -> None:
+    """Record a successful send for user_ids, CURSOR_BATCH_SIZE users per commit"""
+    for start in range(0, len(user_ids), CURSOR_BATCH_SIZE):
+        await db.execute(
+            update(User)
+            .where(User.id.in_(user_ids[start:start + CURSOR_BATCH_SIZE]))
+            .values({sent_at_column: sent_at})
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+def _notification_enabled(key: str, default: bool):
+    """
+    SQL filter matching User.get_notification_preferences()[key]
+
+    Users without a notifications block get the model defaults; otherwise
+    the flag must be explicitly true. The flag test is a JSONB containment
+    so it can use the ix_users_preferences_gin expression index.
+    """
+    flag = cast(User.preferences, JSONB).contains({'notifications': {key: True}})
+    if not default:
+        return flag
+    return or_(User.preferences['notifications'].is_(None), flag)
+
 
 class SchedulerService:
     """Service for scheduled tasks (reminders, reports, etc.)"""
@@ -80,25 +152,23 @@ class SchedulerService:
 
         async with async_session_maker() as db:
             try:
-                # Get all users who have weekly reports enabled
-                result = await db.execute(select(User))
+                # Users with weekly reports enabled and due one, with their
+                # papers, in two queries total instead of one papers query per user
+                result = await db.execute(
+                    select(User)
+                    .where(_notification_enabled('weeklyReports', default=True))
+                    .where(_due(User.last_weekly_report_at, WEEKLY_REPORT_INTERVAL))
+                    .options(selectinload(User.papers))
+                )
                 users = result.scalars().all()
 
+                sends = []
                 for user in users:
-                    # Check if user has weekly reports enabled
-                    prefs = user.get_notification_preferences()
-                    if not prefs.get('weeklyReports', False):
-                        continue
-
-                    # Get user's papers
-                    papers_result = await db.execute(
-                        select(Paper).where(Paper.owner_id == user.id)
-                    )
-                    papers = papers_result.scalars().all()
+                    papers = user.papers
 
                     # Calculate stats
                     papers_worked_on = len(papers)
-                    total_words = sum(paper.word_count or 0 for paper in papers)
+                    total_words = sum(paper.current_word_count or 0 for paper in papers)
 
                     # Prepare paper progress
                     paper_progress = [
@@ -109,8 +179,7 @@ class SchedulerService:
                         for paper in papers[:5]  # Top 5 papers
                     ]
 
-                    # Send email
-                    await email_service.send_weekly_report(
+                    sends.append(email_service.send_weekly_report(
                         to_email=user.email,
                         to_name=user.name,
                         papers_worked_on=papers_worked_on,
@@ -118,9 +187,21 @@ class SchedulerService:
                         comments_received=0,  # TODO: Count comments
                         upcoming_deadlines=[],  # TODO: Get deadlines
                         paper_progress=paper_progress
-                    )
+                    ))
 
-                    print(f"✅ Weekly report sent to {user.email}")
+                # Send emails concurrently
+                results = await _send_all(sends)
+                sent_at = datetime.utcnow()
+                sent_ids = []
+                for user, outcome in zip(users, results):
+                    if _succeeded(outcome):
+                        sent_ids.append(user.id)
+                        print(f"✅ Weekly report sent to {user.email}")
+                    else:
+                        error = outcome if isinstance(outcome, Exception) else outcome.get('error')
+                        print(f"❌ Weekly report to {user.email} failed: {str(error)}")
+
+                await _advance_cursor(db, User.last_weekly_report_at, sent_ids, sent_at)
 
             except Exception as e:
                 print(f"❌ Error sending weekly reports: {str(e)}")
@@ -131,25 +212,22 @@ class SchedulerService:
 
         async with async_session_maker() as db:
             try:
-                # Get all users who have AI suggestions enabled
-                result = await db.execute(select(User))
+                # Users with AI suggestions enabled and due, each with only
+                # their active papers loaded (two queries total)
+                result = await db.execute(
+                    select(User)
+                    .where(_notification_enabled('aiSuggestions', default=False))
+                    .where(_due(User.last_ai_suggestion_at, AI_SUGGESTION_INTERVAL))
+                    .options(selectinload(
+                        User.papers.and_(Paper.status != PaperStatus.COMPLETED)
+                    ))
+                )
                 users = result.scalars().all()
 
+                sends = []
+                targets = []
                 for user in users:
-                    # Check if user has AI suggestions enabled
-                    prefs = user.get_notification_preferences()
-                    if not prefs.get('aiSuggestions', False):
-                        continue
-
-                    # Get user's active papers
-                    papers_result = await db.execute(
-                        select(Paper)
-                        .where(Paper.owner_id == user.id)
-                        .where(Paper.status != 'completed')
-                    )
-                    papers = papers_result.scalars().all()
-
-                    for paper in papers[:2]:  # Limit to 2 papers per day
+                    for paper in user.papers[:2]:  # Limit to 2 papers per day
                         # Generate suggestions (placeholder)
                         suggestions = [
                             "Consider adding more recent references from 2024",
@@ -157,16 +235,29 @@ class SchedulerService:
                             "Add statistical analysis to support your conclusions"
                         ]
 
-                        # Send email
-                        await email_service.send_ai_suggestion(
+                        sends.append(email_service.send_ai_suggestion(
                             to_email=user.email,
                             to_name=user.name,
                             paper_title=paper.title,
                             suggestions=suggestions,
                             paper_url=f"http://localhost:3000/papers/{paper.id}"
-                        )
+                        ))
+                        targets.append((user, paper.title))
+
+                # Send emails concurrently; a user is done once any of their
+                # suggestions went out
+                results = await _send_all(sends)
+                sent_at = datetime.utcnow()
+                sent_ids = {}
+                for (user, title), outcome in zip(targets, results):
+                    if _succeeded(outcome):
+                        sent_ids[user.id] = None
+                        print(f"✅ AI suggestions sent to {user.email} for '{title}'")
+                    else:
+                        error = outcome if isinstance(outcome, Exception) else outcome.get('error')
+                        print(f"❌ AI suggestions to {user.email} for '{title}' failed: {str(error)}")
 
-                        print(f"✅ AI suggestions sent to {user.email} for '{paper.title}'")
+                await _advance_cursor(db, User.last_ai_suggestion_at, list(sent_ids), sent_at)
 
             except Exception as e:
                 print(f"❌ Error generating AI suggestions: {str(e)}")
@@ -4,16 +4,16 @@ backend/app/services/section_content_service.py
 
 Service for managing paper section content operations
 """
-from sqlalchemy import select
+from sqlalchemy import select, func, case
 from sqlalchemy.orm import selectinload
 from uuid import UUID
-from typing import Optional, Dict, List
+from typing import ClassVar, Optional, Dict, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
 import logging
 
-from app.models.paper import Paper, PaperSection
+from app.models.paper import Paper, PaperSection, SectionStatus
 from app.core.exceptions import NotFoundException, AuthorizationException, ValidationException
 
 logger = logging.getLogger(__name__)
@@ -34,6 +34,11 @@ class SectionContentService:
         "references": "References"
     }
 
+    # Reverse mapping (title to section type)
+    _TITLE_TO_TYPE: ClassVar[Dict[str, str]] = {
+        title: stype for stype, title in SECTION_TITLES.items()
+    }
+
     async def add_chat_content_to_section(
             self,
             db: AsyncSession,
@@ -49,11 +54,14 @@ class SectionContentService:
         # ✅ ADD THIS AT THE START:
         logger.info(f"Adding content to {section_type} for paper {paper_id}")
 
-        # FIX: Eager load paper WITH sections
+        # Only the collaborators are loaded (for the permission check), not
+        # the sections. The paper row lock serializes concurrent writers, so
+        # two requests cannot both create the same section
         result = await db.execute(
             select(Paper)
-            .options(selectinload(Paper.sections))  # ✅ KEY FIX!
+            .options(selectinload(Paper.collaborators))
             .where(Paper.id == UUID(paper_id))
+            .with_for_update()
         )
         paper = result.scalar_one_or_none()
 
@@ -62,7 +70,7 @@ class SectionContentService:
 
         if not paper.is_viewable_by(user_id):
             raise AuthorizationException("No permission")
-        # ✅ END OF FIX
+
         # Find or create section
         section = await self._get_or_create_section(
             db, paper, section_type
@@ -78,11 +86,11 @@ class SectionContentService:
             # Replace
             new_content = content.strip()
 
+        # word_count is generated from content by the database
         section.content = new_content
-        section.word_count = len(new_content.split())
 
         # Update section status based on content
-        if section.word_count > 0:
+        if new_content:
             if section.status == "not-started":
                 section.status = "in-progress"
 
@@ -90,7 +98,6 @@ class SectionContentService:
         await self._update_paper_metrics(db, paper)
 
         await db.commit()
-        await db.refresh(section)
 
         logger.info(
             f"Successfully added {section.word_count} words to {section_type} "
@@ -113,9 +120,9 @@ class SectionContentService:
             paper_id: str,
             section_type: str,
             user_id: str
-    ) -> Optional[str]:
+    ) -> Optional[PaperSection]:
         """
-        Get content of a specific section.
+        Get a specific section, with its content, word count and status.
 
         Args:
             db: Database session
@@ -124,13 +131,15 @@ class SectionContentService:
             user_id: User ID requesting content
 
         Returns:
-            Section content or None if not found
+            The section, or None if not found
 
         Raises:
             AuthorizationException: If user doesn't have view permission
         """
 
-        paper = await db.get(Paper, UUID(paper_id))
+        # Collaborators are loaded for the permission check; the section is
+        # looked up on its own rather than through paper.sections
+        paper = await db.get(Paper, UUID(paper_id), options=[selectinload(Paper.collaborators)])
 
         if not paper:
             return None
@@ -145,11 +154,7 @@ class SectionContentService:
         if not section_title:
             return None
 
-        for section in paper.sections:
-            if section.title == section_title:
-                return section.content
-
-        return None
+        return await self._find_section(db, paper.id, section_title)
 
     async def get_all_section_contents(
             self,
@@ -173,7 +178,11 @@ class SectionContentService:
             AuthorizationException: If user doesn't have view permission
         """
 
-        paper = await db.get(Paper, UUID(paper_id))
+        paper = await db.get(
+            Paper,
+            UUID(paper_id),
+            options=[selectinload(Paper.sections), selectinload(Paper.collaborators)]
+        )
 
         if not paper:
             raise NotFoundException(f"Paper with ID {paper_id} not found")
@@ -185,17 +194,11 @@ class SectionContentService:
 
         sections_data = []
 
-        for section in sorted(paper.sections, key=lambda s: s.order):
-            # Find section type from title
-            section_type = None
-            for stype, title in self.SECTION_TITLES.items():
-                if section.title == title:
-                    section_type = stype
-                    break
-
+        # Paper.sections is ordered by "order" in SQL (ix_paper_sections_paper_order)
+        for section in paper.sections:
             sections_data.append({
                 "sectionId": str(section.id),
-                "sectionType": section_type or "unknown",
+                "sectionType": self._TITLE_TO_TYPE.get(section.title, "unknown"),
                 "title": section.title,
                 "content": section.content or "",
                 "wordCount": section.word_count,
@@ -205,6 +208,38 @@ class SectionContentService:
 
         return sections_data
 
+    async def _find_section(
+            self,
+            db: AsyncSession,
+            paper_id: UUID,
+            section_title: str,
+            for_update: bool = False
+    ) -> Optional[PaperSection]:
+        """
+        Find a paper's section by title (ix_paper_sections_paper_title).
+
+        Args:
+            db: Database session
+            paper_id: Paper ID
+            section_title: Section title
+            for_update: Lock the section row
+
+        Returns:
+            First section with that title by order, or None
+        """
+
+        query = (
+            select(PaperSection)
+            .where(PaperSection.paper_id == paper_id, PaperSection.title == section_title)
+            .order_by(PaperSection.order)
+            .limit(1)
+        )
+        if for_update:
+            query = query.with_for_update()
+
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
     async def _get_or_create_section(
             self,
             db: AsyncSession,
@@ -226,9 +261,9 @@ class SectionContentService:
         section_title = self.SECTION_TITLES[section_type]
 
         # Try to find existing section
-        for section in paper.sections:
-            if section.title == section_title:
-                return section
+        section = await self._find_section(db, paper.id, section_title, for_update=True)
+        if section is not None:
+            return section
 
         # Create new section
         # Determine order based on section type
@@ -248,12 +283,11 @@ class SectionContentService:
             title=section_title,
             content="",
             order=section_order_map.get(section_type, 99),
-            status="not-started",
-            word_count=0
+            status="not-started"
         )
 
         db.add(new_section)
-        paper.sections.append(new_section)
+        await db.flush()
 
         logger.info(f"Created new section {section_title} for paper {paper.id}")
 
@@ -272,10 +306,15 @@ class SectionContentService:
             paper: Paper object
         """
 
-        # Calculate total word count
-        total_words = sum(
-            section.word_count for section in paper.sections
-        )
+        # Aggregated in the database rather than loading every section;
+        # pending section changes are autoflushed first
+        total_words, total_sections, completed = (await db.execute(
+            select(
+                func.coalesce(func.sum(PaperSection.word_count), 0),
+                func.count(PaperSection.id),
+                func.count(case((PaperSection.status == SectionStatus.COMPLETED, 1)))
+            ).where(PaperSection.paper_id == paper.id)
+        )).one()
 
         paper.current_word_count = total_words
 
@@ -288,12 +327,7 @@ class SectionContentService:
             paper.progress = progress
         else:
             # If no target, base on sections completed
-            total_sections = len(paper.sections)
             if total_sections > 0:
-                completed = sum(
-                    1 for s in paper.sections
-                    if s.status == "completed"
-                )
                 paper.progress = int((completed / total_sections) * 100)
 
         logger.debug(
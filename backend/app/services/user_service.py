@@ -3,11 +3,16 @@ User service - COMPLETE WITH PREFERENCES SAVING
 backend/app/services/user_service.py
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, cast, case, func, literal, JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm.attributes import flag_modified
 from typing import Optional, Dict, Any
 from app.models.user import User
 from app.schemas.user import UserUpdate, UserPreferencesUpdate
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class UserService:
@@ -91,11 +96,45 @@ class UserService:
                     }
                 }
         """
-        print(f"\n{'=' * 80}")
-        print(f"💾 [UserService.update_preferences] Updating preferences for user {user_id}")
-        print(f"{'=' * 80}")
-        print(f"📥 Incoming preferences: {preferences}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("update_preferences user=%s keys=%s", user_id, list(preferences))
+
+        # Top-level keys are replaced, so the merge is JSONB || on the server
+        delta = {key: value for key, value in preferences.items() if value is not None}
+
+        if db.bind.dialect.name != "postgresql":
+            return await self._merge_preferences(db, user_id, delta)
+
+        # preferences is a JSON column: merge as JSONB, treating NULL (or a
+        # non-object) as empty, and store the result back as JSON
+        current = cast(User.preferences, JSONB)
+        merged = case(
+            (func.jsonb_typeof(current) == 'object', current),
+            else_=cast(literal({}, JSON), JSONB),
+        ).op('||')(cast(literal(delta, JSON), JSONB))
+
+        result = await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(preferences=cast(merged, JSON), updated_at=datetime.utcnow())
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        user = result.scalar_one_or_none()
+        if not user:
+            raise ValueError("User not found")
+
+        await db.commit()
+
+        return user
 
+    async def _merge_preferences(
+            self,
+            db: AsyncSession,
+            user_id: str,
+            delta: Dict[str, Any]
+    ) -> User:
+        """Merge preferences in Python (backends without JSONB)"""
         user = await self.get_user_by_id(db, user_id)
         if not user:
             raise ValueError("User not found")
@@ -103,35 +142,16 @@ class UserService:
         # Initialize preferences if None
         if user.preferences is None:
             user.preferences = {}
-            print("📋 Initialized empty preferences")
-
-        # Deep merge all preferences
-        print(f"\n🔧 BEFORE update:")
-        print(f"   Current preferences: {user.preferences}")
 
-        # Update each field
-        for key, value in preferences.items():
-            if value is not None:
-                user.preferences[key] = value
-                print(f"   ✅ Set {key} = {value}")
+        user.preferences.update(delta)
 
         # ✅ CRITICAL: Tell SQLAlchemy the JSON column changed!
-        from sqlalchemy.orm.attributes import flag_modified
         flag_modified(user, "preferences")
-        print(f"🚩 Called flag_modified on preferences")
 
         user.updated_at = datetime.utcnow()
 
-        print(f"\n🔧 AFTER update:")
-        print(f"   New preferences: {user.preferences}")
-
         await db.commit()
-        print("💾 Committed to database")
-
         await db.refresh(user)
-        print(f"🔄 Refreshed user")
-        print(f"   Final preferences: {user.preferences}")
-        print(f"{'=' * 80}\n")
 
         return user
 
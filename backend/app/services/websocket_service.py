@@ -1,68 +1,109 @@
 """
 WebSocket service for real-time notifications and presence tracking
 """
+import asyncio
 import logging
-import json
-from typing import Dict, Set, List
+import orjson
+from typing import Dict, List, Union
 from fastapi import WebSocket
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Recipients sent to concurrently per slice of a broadcast; the event loop is
+# yielded between slices so large fan-outs don't stall other work
+BROADCAST_BATCH_SIZE = 50
+
 
 class ConnectionManager:
     """Manages WebSocket connections for real-time notifications"""
 
     def __init__(self):
-        # Store active connections: {user_id: Set[WebSocket]}
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
+        # Store active connections: {user_id: WebSocket | List[WebSocket]}
+        # Most users have a single connection, stored as is; a list is only
+        # made for a second one. Lists are replaced, never mutated in place,
+        # so a list read before an await stays valid
+        self.active_connections: Dict[str, Union[WebSocket, List[WebSocket]]] = {}
         logger.info("✅ ConnectionManager initialized")
 
+    def _connections_of(self, user_id: str) -> List[WebSocket]:
+        """A user's connections as a list (empty if not connected)"""
+        connections = self.active_connections.get(user_id)
+        if connections is None:
+            return []
+        if isinstance(connections, list):
+            return connections
+        return [connections]
+
     async def connect(self, websocket: WebSocket, user_id: str):
         """Accept and register a new WebSocket connection"""
         await websocket.accept()
 
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = set()
+        connections = self._connections_of(user_id)
+        if not connections:
+            self.active_connections[user_id] = websocket
+        elif websocket not in connections:
+            self.active_connections[user_id] = connections + [websocket]
 
-        self.active_connections[user_id].add(websocket)
-        logger.info(f"🔗 User {user_id} connected via WebSocket. Total connections: {len(self.active_connections[user_id])}")
+        logger.info(f"🔗 User {user_id} connected via WebSocket. Total connections: {self.get_user_connection_count(user_id)}")
 
     def disconnect(self, websocket: WebSocket, user_id: str):
         """Remove a WebSocket connection"""
         if user_id in self.active_connections:
-            self.active_connections[user_id].discard(websocket)
+            remaining = [connection for connection in self._connections_of(user_id) if connection is not websocket]
 
             # Remove user entry if no more connections
-            if not self.active_connections[user_id]:
+            if not remaining:
                 del self.active_connections[user_id]
+            else:
+                self.active_connections[user_id] = remaining[0] if len(remaining) == 1 else remaining
+
+            logger.info(f"❌ User {user_id} disconnected. Remaining connections: {len(remaining)}")
 
-            logger.info(f"❌ User {user_id} disconnected. Remaining connections: {len(self.active_connections.get(user_id, set()))}")
+    @staticmethod
+    async def send_json(websocket: WebSocket, message: dict):
+        """Send a message on one socket, encoded with orjson instead of WebSocket.send_json's json.dumps"""
+        await websocket.send_text(orjson.dumps(message).decode())
 
     async def send_personal_message(self, message: dict, user_id: str):
         """Send message to a specific user's all connections"""
+        await self._send_raw(orjson.dumps(message).decode(), user_id)
+
+    async def _send_raw(self, raw: str, user_id: str):
+        """Send an already serialized JSON message (as a text frame) to all of a user's connections"""
         if user_id not in self.active_connections:
             logger.warning(f"⚠️ User {user_id} has no active connections")
             return
 
-        disconnected = set()
-
-        for connection in self.active_connections[user_id]:
-            try:
-                await connection.send_json(message)
-                logger.debug(f"📤 Sent message to user {user_id}")
-            except Exception as e:
-                logger.error(f"❌ Failed to send message to user {user_id}: {str(e)}")
-                disconnected.add(connection)
+        # Write to all of the user's connections concurrently
+        connections = self._connections_of(user_id)
+        results = await asyncio.gather(
+            *(connection.send_text(raw) for connection in connections),
+            return_exceptions=True
+        )
 
         # Clean up disconnected websockets
-        for connection in disconnected:
-            self.disconnect(connection, user_id)
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Failed to send message to user {user_id}: {str(result)}")
+                self.disconnect(connection, user_id)
+            else:
+                logger.debug(f"📤 Sent message to user {user_id}")
 
     async def broadcast_to_users(self, message: dict, user_ids: list):
-        """Broadcast message to multiple users"""
-        for user_id in user_ids:
-            await self.send_personal_message(message, user_id)
+        """Broadcast message to multiple users (concurrently, BROADCAST_BATCH_SIZE at a time)"""
+        # Serialized once for every recipient and connection
+        raw = orjson.dumps(message).decode()
+
+        for start in range(0, len(user_ids), BROADCAST_BATCH_SIZE):
+            await asyncio.gather(
+                *(
+                    self._send_raw(raw, user_id)
+                    for user_id in user_ids[start:start + BROADCAST_BATCH_SIZE]
+                ),
+                return_exceptions=True
+            )
+            await asyncio.sleep(0)
 
     async def send_notification(self, user_id: str, notification_type: str, title: str, message: str, data: dict = None):
         """Send a formatted notification to a user"""
@@ -103,15 +144,18 @@ class ConnectionManager:
 
     def get_user_connection_count(self, user_id: str) -> int:
         """Get number of active connections for a user"""
-        return len(self.active_connections.get(user_id, set()))
+        return len(self._connections_of(user_id))
 
     def get_total_connections(self) -> int:
         """Get total number of active connections"""
-        return sum(len(connections) for connections in self.active_connections.values())
+        return sum(
+            len(connections) if isinstance(connections, list) else 1
+            for connections in self.active_connections.values()
+        )
 
     def is_user_connected(self, user_id: str) -> bool:
         """Check if user has any active WebSocket connections"""
-        return user_id in self.active_connections and len(self.active_connections[user_id]) > 0
+        return user_id in self.active_connections
 
     async def broadcast_presence_update(self, user_id: str, status: str, user_ids: List[str]):
         """
@@ -2,8 +2,14 @@
 Zotero integration service
 backend/app/services/zotero_service.py
 """
+import asyncio
 import aiohttp
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+# Zotero returns at most 100 items per request
+ZOTERO_PAGE_SIZE = 100
+# Pages requested at once when importing a whole library
+ZOTERO_PAGE_CONCURRENCY = 5
 
 
 class ZoteroService:
@@ -11,6 +17,22 @@ class ZoteroService:
 
     def __init__(self):
         self.base_url = "https://api.zotero.org"
+        # Shared session, so calls reuse warm keep-alive connections
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session (created on first use, inside the event loop)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     async def verify_api_key(self, api_key: str, user_id: Optional[str] = None) -> Dict:
         """Verify Zotero API key"""
@@ -21,25 +43,25 @@ class ZoteroService:
             }
 
             # Test API key by getting user info
-            async with aiohttp.ClientSession() as session:
-                if user_id:
-                    url = f"{self.base_url}/users/{user_id}/items?limit=1"
+            session = self._get_session()
+            if user_id:
+                url = f"{self.base_url}/users/{user_id}/items?limit=1"
+            else:
+                # Try to get key info
+                url = f"{self.base_url}/keys/current"
+
+            async with session.get(url, headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return {
+                        'valid': True,
+                        'user_id': data.get('userID') if not user_id else user_id
+                    }
                 else:
-                    # Try to get key info
-                    url = f"{self.base_url}/keys/current"
-
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            'valid': True,
-                            'user_id': data.get('userID') if not user_id else user_id
-                        }
-                    else:
-                        return {
-                            'valid': False,
-                            'error': 'Invalid API key'
-                        }
+                    return {
+                        'valid': False,
+                        'error': 'Invalid API key'
+                    }
 
         except Exception as e:
             print(f"❌ Failed to verify Zotero API key: {str(e)}")
@@ -53,9 +75,10 @@ class ZoteroService:
         api_key: str,
         user_id: str,
         item_type: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        collection_id: Optional[str] = None
     ) -> List[Dict]:
-        """Get user's Zotero items (papers, articles, etc.)"""
+        """Get user's Zotero items (papers, articles, etc.), optionally of one collection"""
         try:
             headers = {
                 'Zotero-API-Key': api_key,
@@ -67,16 +90,16 @@ class ZoteroService:
             if item_type:
                 params['itemType'] = item_type
 
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/users/{user_id}/items"
+            session = self._get_session()
+            url = self._items_url(user_id, collection_id)
 
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        items = await response.json()
-                        return [self._format_item(item) for item in items]
-                    else:
-                        print(f"❌ Zotero API error: {response.status}")
-                        return []
+            async with session.get(url, headers=headers, params=params) as response:
+                if response.status == 200:
+                    items = await response.json()
+                    return [self._format_item(item) for item in items]
+                else:
+                    print(f"❌ Zotero API error: {response.status}")
+                    return []
 
         except Exception as e:
             print(f"❌ Failed to get Zotero items: {str(e)}")
@@ -94,23 +117,23 @@ class ZoteroService:
                 'Zotero-API-Version': '3'
             }
 
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/users/{user_id}/collections"
-
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        collections = await response.json()
-                        return [
-                            {
-                                'id': c.get('key'),
-                                'name': c.get('data', {}).get('name'),
-                                'parent': c.get('data', {}).get('parentCollection'),
-                                'item_count': c.get('meta', {}).get('numItems', 0)
-                            }
-                            for c in collections
-                        ]
-                    else:
-                        return []
+            session = self._get_session()
+            url = f"{self.base_url}/users/{user_id}/collections"
+
+            async with session.get(url, headers=headers) as response:
+                if response.status == 200:
+                    collections = await response.json()
+                    return [
+                        {
+                            'id': c.get('key'),
+                            'name': c.get('data', {}).get('name'),
+                            'parent': c.get('data', {}).get('parentCollection'),
+                            'item_count': c.get('meta', {}).get('numItems', 0)
+                        }
+                        for c in collections
+                    ]
+                else:
+                    return []
 
         except Exception as e:
             print(f"❌ Failed to get Zotero collections: {str(e)}")
@@ -124,15 +147,8 @@ class ZoteroService:
     ) -> Dict:
         """Import references from Zotero"""
         try:
-            # Get items
-            items = await self.get_user_items(api_key, user_id)
-
-            # Filter by collection if specified
-            if collection_id:
-                items = [
-                    item for item in items
-                    if collection_id in item.get('collections', [])
-                ]
+            # Get every item (of the collection, if specified; Zotero filters it)
+            items = await self._get_all_items(api_key, user_id, collection_id)
 
             # Convert to our reference format
             references = []
@@ -163,6 +179,62 @@ class ZoteroService:
                 'error': str(e)
             }
 
+    async def _get_all_items(
+        self,
+        api_key: str,
+        user_id: str,
+        collection_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Get all of a user's (or one collection's) items, across pages
+
+        The first page reports the total in its Total-Results header; the
+        remaining pages are then fetched concurrently.
+        """
+        headers = {
+            'Zotero-API-Key': api_key,
+            'Zotero-API-Version': '3'
+        }
+        url = self._items_url(user_id, collection_id)
+
+        session = self._get_session()
+        items, total = await self._fetch_page(session, url, headers, 0)
+
+        semaphore = asyncio.Semaphore(ZOTERO_PAGE_CONCURRENCY)
+
+        async def fetch(start: int) -> List[Dict]:
+            async with semaphore:
+                page, _ = await self._fetch_page(session, url, headers, start)
+                return page
+
+        pages = await asyncio.gather(
+            *(fetch(start) for start in range(ZOTERO_PAGE_SIZE, total, ZOTERO_PAGE_SIZE))
+        )
+        for page in pages:
+            items.extend(page)
+
+        return [self._format_item(item) for item in items]
+
+    def _items_url(self, user_id: str, collection_id: Optional[str] = None) -> str:
+        """Items endpoint of a user's library, or of one collection (filtered by Zotero)"""
+        if collection_id:
+            return f"{self.base_url}/users/{user_id}/collections/{collection_id}/items"
+        return f"{self.base_url}/users/{user_id}/items"
+
+    async def _fetch_page(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Dict,
+        start: int
+    ) -> Tuple[List[Dict], int]:
+        """Fetch one page of items; returns (items, Total-Results)"""
+        params = {'limit': ZOTERO_PAGE_SIZE, 'start': start}
+        async with session.get(url, headers=headers, params=params) as response:
+            if response.status != 200:
+                raise RuntimeError(f"Zotero API error: {response.status}")
+            return await response.json(), int(response.headers.get('Total-Results', 0))
+
     async def export_to_zotero(
         self,
         api_key: str,
@@ -201,22 +273,22 @@ class ZoteroService:
                 zotero_items.append(item)
 
             # Post to Zotero
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/users/{user_id}/items"
-
-                async with session.post(url, headers=headers, json=zotero_items) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return {
-                            'success': True,
-                            'count': len(result.get('successful', [])),
-                            'failed': len(result.get('failed', []))
-                        }
-                    else:
-                        return {
-                            'success': False,
-                            'error': f'Zotero API error: {response.status}'
-                        }
+            session = self._get_session()
+            url = f"{self.base_url}/users/{user_id}/items"
+
+            async with session.post(url, headers=headers, json=zotero_items) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return {
+                        'success': True,
+                        'count': len(result.get('successful', [])),
+                        'failed': len(result.get('failed', []))
+                    }
+                else:
+                    return {
+                        'success': False,
+                        'error': f'Zotero API error: {response.status}'
+                    }
 
         except Exception as e:
             print(f"❌ Failed to export to Zotero: {str(e)}")
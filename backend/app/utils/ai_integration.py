@@ -2,6 +2,7 @@
 AI Integration Utils (app/utils/ai_integration.py)
 """
 import openai
+import re
 from typing import Dict, Any, List, Optional
 import logging
 from datetime import datetime
@@ -11,6 +12,21 @@ from app.core.exceptions import AIServiceException
 
 logger = logging.getLogger(__name__)
 
+# Basic content filtering: every forbidden phrase in one case-insensitive
+# pattern, so a prompt is scanned once (and never lowercased into a copy)
+_FORBIDDEN_PATTERNS = [
+    "hack", "exploit", "bypass", "jailbreak",
+    "ignore previous", "forget instructions"
+]
+_FORBIDDEN_RE = re.compile('|'.join(map(re.escape, _FORBIDDEN_PATTERNS)), re.IGNORECASE)
+
+# Simple citation patterns, compiled once
+_CITATION_PATTERNS = [
+    re.compile(r'\(([A-Z][a-z]+(?:\s+et\s+al\.?)?,?\s+\d{4})\)'),  # (Author, 2023)
+    re.compile(r'\[(\d+)\]'),  # [1]
+    re.compile(r'doi:\s*(10\.\d+/[^\s]+)'),  # DOI
+]
+
 
 class AIIntegrationHelper:
     """Helper utilities for AI service integration"""
@@ -29,13 +45,7 @@ class AIIntegrationHelper:
             return False
 
         # Basic content filtering
-        forbidden_patterns = [
-            "hack", "exploit", "bypass", "jailbreak",
-            "ignore previous", "forget instructions"
-        ]
-
-        prompt_lower = prompt.lower()
-        if any(pattern in prompt_lower for pattern in forbidden_patterns):
+        if _FORBIDDEN_RE.search(prompt) is not None:
             return False
 
         return True
@@ -54,35 +64,27 @@ class AIIntegrationHelper:
 
     def extract_citations(self, text: str) -> List[str]:
         """Extract potential citations from text"""
-        import re
-
-        # Simple citation pattern matching
-        patterns = [
-            r'\(([A-Z][a-z]+(?:\s+et\s+al\.?)?,?\s+\d{4})\)',  # (Author, 2023)
-            r'\[(\d+)\]',  # [1]
-            r'doi:\s*(10\.\d+/[^\s]+)',  # DOI
-        ]
+        # Collected straight into a set to remove duplicates
+        citations = {match for pattern in _CITATION_PATTERNS for match in pattern.findall(text)}
 
-        citations = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            citations.extend(matches)
-
-        return list(set(citations))  # Remove duplicates
+        return list(citations)
 
     def calculate_readability(self, text: str) -> Dict[str, float]:
         """Calculate basic readability metrics"""
         if not text:
             return {"readability_score": 0, "complexity": 0}
 
-        words = text.split()
+        # Terminators are counted (C-level scans) before the text is split, so
+        # text without sentences is never tokenized
         sentences = text.count('.') + text.count('!') + text.count('?')
 
         if sentences == 0:
             return {"readability_score": 0, "complexity": 0}
 
+        words = text.split()
         avg_words_per_sentence = len(words) / sentences
-        long_words = sum(1 for word in words if len(word) > 6)
+        # Words longer than 6 characters, counted without a Python-level loop
+        long_words = sum(map((6).__lt__, map(len, words)))
         complexity = long_words / len(words) if words else 0
 
         # Simplified readability score
@@ -2,12 +2,14 @@
 """
 Email Utils (app/utils/email.py) - Enhanced version
 """
-import smtplib
+import aiosmtplib
+import re
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-from typing import List, Optional, Dict, Any
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Mapping
 import logging
 from pathlib import Path
 import asyncio
@@ -16,6 +18,53 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Email address format, compiled once
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Predefined email templates, built once at import
+_EMAIL_TEMPLATES: Dict[str, str] = {
+    "welcome": """
+Welcome to Research Platform, {user_name}!
+
+We're excited to help you with your research journey.
+
+Get started by:
+- Creating your first research paper
+- Exploring AI-powered research assistance
+- Setting up your research preferences
+
+Best regards,
+The Research Platform Team
+    """,
+
+    "paper_shared": """
+Hi {recipient_name},
+
+{sender_name} has shared a research paper with you: "{paper_title}"
+
+Research Area: {research_area}
+Status: {status}
+
+You can view it here: {paper_url}
+
+Best regards,
+Research Platform
+    """,
+
+    "collaboration_invite": """
+Hi {recipient_name},
+
+You've been invited to collaborate on "{paper_title}" by {inviter_name}.
+
+Role: {role}
+Message: {message}
+
+Accept invitation: {accept_url}
+
+This invitation expires on {expiry_date}.
+    """
+}
+
 
 class EmailHelper:
     """Email utility functions"""
@@ -31,9 +80,7 @@ class EmailHelper:
 
     def validate_email(self, email: str) -> bool:
         """Validate email format"""
-        import re
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return _EMAIL_RE.match(email) is not None
 
     def format_email_template(self, template: str, **kwargs) -> str:
         """Format email template with variables"""
@@ -58,113 +105,74 @@ class EmailHelper:
             return False
 
         try:
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                None,
-                self._send_sync_email,
-                to_emails, subject, body, html_body, attachments
+            # Reading attachment files is blocking, so only then is the
+            # message built in a worker thread
+            if attachments:
+                msg = await asyncio.to_thread(
+                    self._build_message, to_emails, subject, body, html_body, attachments
+                )
+            else:
+                msg = self._build_message(to_emails, subject, body, html_body)
+
+            # Native asyncio SMTP client: no executor thread per send
+            use_login = bool(self.smtp_user and self.smtp_password)
+            await aiosmtplib.send(
+                msg,
+                hostname=self.smtp_host,
+                port=self.smtp_port,
+                username=self.smtp_user if use_login else None,
+                password=self.smtp_password if use_login else None,
+                start_tls=use_login
             )
+
+            logger.info(f"Email sent successfully to {len(to_emails)} recipients")
+            return True
+
         except Exception as e:
-            logger.error(f"Failed to send async email: {e}")
+            logger.error(f"Failed to send email: {e}")
             return False
 
-    def _send_sync_email(
+    def _build_message(
             self,
             to_emails: List[str],
             subject: str,
             body: str,
             html_body: Optional[str] = None,
             attachments: Optional[List[str]] = None
-    ) -> bool:
-        """Send email synchronously"""
-
-        try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = ', '.join(to_emails)
-
-            # Add text part
-            text_part = MIMEText(body, 'plain')
-            msg.attach(text_part)
-
-            # Add HTML part
-            if html_body:
-                html_part = MIMEText(html_body, 'html')
-                msg.attach(html_part)
-
-            # Add attachments
-            if attachments:
-                for file_path in attachments:
-                    if Path(file_path).exists():
-                        with open(file_path, "rb") as attachment:
-                            part = MIMEBase('application', 'octet-stream')
-                            part.set_payload(attachment.read())
-
-                        encoders.encode_base64(part)
-                        part.add_header(
-                            'Content-Disposition',
-                            f'attachment; filename= {Path(file_path).name}',
-                        )
-                        msg.attach(part)
-
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                if self.smtp_user and self.smtp_password:
-                    server.starttls()
-                    server.login(self.smtp_user, self.smtp_password)
-
-                server.send_message(msg)
-
-            logger.info(f"Email sent successfully to {len(to_emails)} recipients")
-            return True
-
-        except Exception as e:
-            logger.error(f"Failed to send email: {e}")
-            return False
-
-    def get_email_templates(self) -> Dict[str, str]:
-        """Get predefined email templates"""
-        return {
-            "welcome": """
-Welcome to Research Platform, {user_name}!
-
-We're excited to help you with your research journey.
-
-Get started by:
-- Creating your first research paper
-- Exploring AI-powered research assistance
-- Setting up your research preferences
-
-Best regards,
-The Research Platform Team
-            """,
-
-            "paper_shared": """
-Hi {recipient_name},
-
-{sender_name} has shared a research paper with you: "{paper_title}"
-
-Research Area: {research_area}
-Status: {status}
-
-You can view it here: {paper_url}
-
-Best regards,
-Research Platform
-            """,
-
-            "collaboration_invite": """
-Hi {recipient_name},
-
-You've been invited to collaborate on "{paper_title}" by {inviter_name}.
-
-Role: {role}
-Message: {message}
-
-Accept invitation: {accept_url}
-
-This invitation expires on {expiry_date}.
-            """
-        }
-
+    ) -> MIMEMultipart:
+        """Build the MIME message (reads attachment files)"""
+
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = ', '.join(to_emails)
+
+        # Add text part
+        text_part = MIMEText(body, 'plain')
+        msg.attach(text_part)
+
+        # Add HTML part
+        if html_body:
+            html_part = MIMEText(html_body, 'html')
+            msg.attach(html_part)
+
+        # Add attachments
+        if attachments:
+            for file_path in attachments:
+                if Path(file_path).exists():
+                    with open(file_path, "rb") as attachment:
+                        part = MIMEBase('application', 'octet-stream')
+                        part.set_payload(attachment.read())
+
+                    encoders.encode_base64(part)
+                    part.add_header(
+                        'Content-Disposition',
+                        f'attachment; filename= {Path(file_path).name}',
+                    )
+                    msg.attach(part)
+
+        return msg
+
+    def get_email_templates(self) -> Mapping[str, str]:
+        """Get predefined email templates (read-only view of the shared module dict)"""
+        return MappingProxyType(_EMAIL_TEMPLATES)
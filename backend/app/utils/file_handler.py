@@ -2,6 +2,7 @@
 """
 File Handler Utils (app/utils/file_handler.py) - Enhanced version
 """
+import asyncio
 import os
 import uuid
 import shutil
@@ -15,6 +16,9 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Bytes read and written per step when saving an upload
+COPY_CHUNK_SIZE = 1 << 20
+
 
 class FileHandler:
     """Enhanced file handling utilities"""
@@ -27,6 +31,9 @@ class FileHandler:
         # Create upload directory
         self.upload_dir.mkdir(parents=True, exist_ok=True)
 
+        # Resolved once; delete_file compares every target against it
+        self._upload_root = str(self.upload_dir.resolve()) + os.sep
+
     def validate_file_extension(self, filename: str) -> bool:
         """Validate file extension"""
         ext = Path(filename).suffix.lower()
@@ -44,18 +51,22 @@ class FileHandler:
 
     def calculate_file_hash(self, file_path: Path) -> str:
         """Calculate SHA256 hash of file"""
-        hash_sha256 = hashlib.sha256()
+        # file_digest (Python 3.11+) reads and hashes in C, without the GIL
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
+            return hashlib.file_digest(f, "sha256").hexdigest()
 
-    def get_file_info(self, file_path: Path) -> Dict[str, Any]:
-        """Get comprehensive file information"""
-        if not file_path.exists():
+    def get_file_info(self, file_path: Path, include_hash: bool = False) -> Dict[str, Any]:
+        """
+        Get comprehensive file information
+
+        Hashing reads the whole file, so it is only done with include_hash;
+        otherwise "hash" is None.
+        """
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
             return {}
 
-        stat = file_path.stat()
         mime_type, _ = mimetypes.guess_type(str(file_path))
 
         return {
@@ -66,7 +77,7 @@ class FileHandler:
             "extension": file_path.suffix.lower(),
             "created": stat.st_ctime,
             "modified": stat.st_mtime,
-            "hash": self.calculate_file_hash(file_path)
+            "hash": self.calculate_file_hash(file_path) if include_hash else None
         }
 
     def format_file_size(self, size_bytes: int) -> str:
@@ -82,21 +93,50 @@ class FileHandler:
 
         return f"{size_bytes:.1f} {size_names[i]}"
 
+    async def asave_uploaded_file(
+            self,
+            src: BinaryIO,
+            original_filename: str,
+            user_id: str,
+            subfolder: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Save uploaded file off the event loop (see save_uploaded_file)
+
+        The directory creation, write, hash and stat are blocking, so they run
+        in a worker thread; concurrent uploads then overlap instead of
+        stalling every other request.
+        """
+        return await asyncio.to_thread(
+            self.save_uploaded_file, src, original_filename, user_id, subfolder
+        )
+
     def save_uploaded_file(
             self,
-            file_content: bytes,
+            src: BinaryIO,
             original_filename: str,
             user_id: str,
             subfolder: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Save uploaded file with metadata"""
+        """
+        Save uploaded file with metadata
+
+        Args:
+            src: Seekable binary file object with the upload (e.g. UploadFile.file),
+                copied in COPY_CHUNK_SIZE chunks so the upload is never held in memory
+            original_filename: Client-side file name
+            user_id: Owner of the file
+            subfolder: Optional folder below the user's upload directory
+        """
 
         # Validate
         if not self.validate_file_extension(original_filename):
             raise ValueError(f"File type not allowed: {Path(original_filename).suffix}")
 
-        if not self.validate_file_size(len(file_content)):
-            raise ValueError(f"File too large: {len(file_content)} bytes")
+        size = src.seek(0, os.SEEK_END)
+        src.seek(0)
+        if not self.validate_file_size(size):
+            raise ValueError(f"File too large: {size} bytes")
 
         # Generate paths
         unique_filename = self.generate_unique_filename(original_filename)
@@ -108,13 +148,18 @@ class FileHandler:
         user_dir.mkdir(parents=True, exist_ok=True)
         file_path = user_dir / unique_filename
 
-        # Save file
-        with open(file_path, 'wb') as f:
-            f.write(file_content)
+        # Save file, hashing each chunk as it is written (one pass over the
+        # bytes, and the file is never read back)
+        file_hash = hashlib.sha256()
+        with open(file_path, 'wb') as dst:
+            while chunk := src.read(COPY_CHUNK_SIZE):
+                file_hash.update(chunk)
+                dst.write(chunk)
 
         # Return file info
         file_info = self.get_file_info(file_path)
         file_info.update({
+            "hash": file_hash.hexdigest(),
             "original_name": original_filename,
             "unique_name": unique_filename,
             "relative_path": str(file_path.relative_to(self.upload_dir)),
@@ -129,7 +174,7 @@ class FileHandler:
             full_path = self.upload_dir / file_path
 
             # Security check - ensure path is within upload directory
-            if not str(full_path.resolve()).startswith(str(self.upload_dir.resolve())):
+            if not str(full_path.resolve()).startswith(self._upload_root):
                 logger.warning(f"Attempted to delete file outside upload directory: {file_path}")
                 return False
 
@@ -145,15 +190,39 @@ class FileHandler:
 
     def cleanup_empty_directories(self, path: Path) -> None:
         """Remove empty directories recursively"""
-        try:
-            for item in path.iterdir():
-                if item.is_dir():
-                    self.cleanup_empty_directories(item)
-
-            # Remove if empty
-            if not any(path.iterdir()):
-                path.rmdir()
-
-        except Exception as e:
-            logger.error(f"Failed to cleanup directory {path}: {e}")
+        # Each directory is listed once, depth first without recursion; the
+        # entry count kept per directory tells whether it is empty once its
+        # own empty subdirectories are gone. Symlinks are never followed
+        order: List[str] = []
+        parents: Dict[str, Optional[str]] = {str(path): None}
+        remaining: Dict[str, int] = {}
+        stack = [str(path)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError as e:
+                logger.error(f"Failed to cleanup directory {current}: {e}")
+                continue
+            order.append(current)
+            remaining[current] = len(entries)
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    parents[entry.path] = current
+                    stack.append(entry.path)
+
+        # Children come after their parent in the walk, so reversing it
+        # removes every subdirectory before its parent is checked
+        for current in reversed(order):
+            if remaining[current]:
+                continue
+            try:
+                os.rmdir(current)
+            except OSError as e:
+                logger.error(f"Failed to cleanup directory {current}: {e}")
+                continue
+            parent = parents[current]
+            if parent is not None:
+                remaining[parent] -= 1
 
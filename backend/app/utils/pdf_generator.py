@@ -3,12 +3,17 @@
 PDF Generator Utils (app/utils/pdf_generator.py)
 """
 from typing import Dict, Any, Optional, BinaryIO
+from operator import itemgetter
+import heapq
 import io
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Research areas listed in the analytics report, most papers first
+REPORT_RESEARCH_AREA_LIMIT = 50
+
 try:
     from reportlab.pdfgen import canvas
     from reportlab.lib.pagesizes import letter, A4
@@ -21,6 +26,19 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
     logger.warning("ReportLab not available. PDF generation will be limited.")
 
+if REPORTLAB_AVAILABLE:
+    try:
+        # ReportLab 4 ships its C accelerator (text measurement, stream
+        # encoding) separately; without it the pure Python versions are used
+        import _rl_accel  # noqa: F401
+
+        RL_ACCEL_AVAILABLE = True
+    except ImportError:
+        RL_ACCEL_AVAILABLE = False
+        logger.warning("rl_accel not installed. ReportLab will use its slower pure Python fallback.")
+else:
+    RL_ACCEL_AVAILABLE = False
+
 
 class PDFGenerator:
     """PDF generation utilities"""
@@ -28,36 +46,46 @@ class PDFGenerator:
     def __init__(self):
         self.available = REPORTLAB_AVAILABLE
 
+        # Styles are only read while building, so one set serves every export
+        if self.available:
+            self._styles = getSampleStyleSheet()
+            self._title_style = ParagraphStyle(
+                'CustomTitle',
+                parent=self._styles['Heading1'],
+                fontSize=18,
+                spaceAfter=30,
+                alignment=1  # Center
+            )
+
     def generate_paper_pdf(
             self,
             paper_data: Dict[str, Any],
             include_sections: bool = True,
-            include_metadata: bool = True
-    ) -> bytes:
-        """Generate PDF from paper data"""
+            include_metadata: bool = True,
+            output: Optional[BinaryIO] = None
+    ) -> Optional[bytes]:
+        """Generate PDF from paper data
+
+        The PDF is written straight to output when one is given (and None is
+        returned); otherwise it is built in memory and returned as bytes.
+        """
 
         if not self.available:
             raise Exception("PDF generation not available. Install reportlab: pip install reportlab")
 
-        buffer = io.BytesIO()
+        buffer = output if output is not None else io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4)
-        styles = getSampleStyleSheet()
+        styles = self._styles
         story = []
 
         # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        story.append(Paragraph(paper_data.get('title', 'Untitled Paper'), title_style))
+        story.append(Paragraph(paper_data.get('title', 'Untitled Paper'), self._title_style))
         story.append(Spacer(1, 12))
 
         # Authors
-        if paper_data.get('co_authors'):
-            authors = ', '.join(paper_data['co_authors'])
+        co_authors = paper_data.get('co_authors')
+        if co_authors:
+            authors = ', '.join(co_authors)
             story.append(Paragraph(f"<b>Authors:</b> {authors}", styles['Normal']))
             story.append(Spacer(1, 12))
 
@@ -71,8 +99,8 @@ class PDFGenerator:
                 f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M')}"
             ]
 
-            for item in metadata_items:
-                story.append(Paragraph(item, styles['Normal']))
+            # One paragraph of lines: a single markup parse instead of one per item
+            story.append(Paragraph('<br/>'.join(metadata_items), styles['Normal']))
 
             story.append(Spacer(1, 20))
 
@@ -96,18 +124,23 @@ class PDFGenerator:
 
         # Build PDF
         doc.build(story)
-        buffer.seek(0)
+        if output is not None:
+            return None
         return buffer.getvalue()
 
-    def generate_analytics_report_pdf(self, analytics_data: Dict[str, Any]) -> bytes:
-        """Generate analytics report as PDF"""
+    def generate_analytics_report_pdf(
+            self,
+            analytics_data: Dict[str, Any],
+            output: Optional[BinaryIO] = None
+    ) -> Optional[bytes]:
+        """Generate analytics report as PDF (written to output if given, as for generate_paper_pdf)"""
 
         if not self.available:
             raise Exception("PDF generation not available. Install reportlab: pip install reportlab")
 
-        buffer = io.BytesIO()
+        buffer = output if output is not None else io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4)
-        styles = getSampleStyleSheet()
+        styles = self._styles
         story = []
 
         # Title
@@ -123,18 +156,21 @@ class PDFGenerator:
             f"Average Progress: {analytics_data.get('avg_progress', 0):.1f}%"
         ]
 
-        for item in summary_items:
-            story.append(Paragraph(item, styles['Normal']))
+        story.append(Paragraph('<br/>'.join(summary_items), styles['Normal']))
 
         story.append(Spacer(1, 20))
 
-        # Research Areas
-        if analytics_data.get('research_areas'):
+        # Research Areas (the counts arrive aggregated; only the largest are listed)
+        research_areas = analytics_data.get('research_areas')
+        if research_areas:
+            top_areas = heapq.nlargest(REPORT_RESEARCH_AREA_LIMIT, research_areas.items(), key=itemgetter(1))
             story.append(Paragraph("Research Areas", styles['Heading1']))
-            for area, count in analytics_data['research_areas'].items():
-                story.append(Paragraph(f"• {area}: {count} papers", styles['Normal']))
+            story.append(Paragraph('<br/>'.join(
+                f"• {area}: {count} papers" for area, count in top_areas
+            ), styles['Normal']))
 
         doc.build(story)
-        buffer.seek(0)
+        if output is not None:
+            return None
         return buffer.getvalue()
 
@@ -3,20 +3,37 @@
 Frontend-Compatible Response Transformers (app/utils/response_transformers.py)
 """
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 from app.models.paper import Paper
 from app.models.user import User
 
+# Timestamps already formatted; the same rows are transformed again on every
+# poll of a list, so most lookups hit. Bounded so long-running workers don't grow
+ISO_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=ISO_CACHE_SIZE)
+def _iso(value: datetime) -> str:
+    """ISO 8601 string for a timestamp (memoized)"""
+    return value.isoformat()
+
+
+def _enum_value(value: Any) -> Any:
+    """The value of an enum member, or value itself if it is not one"""
+    return getattr(value, 'value', value)
+
 
 def transform_paper_for_frontend(paper: Paper) -> Dict[str, Any]:
     """Transform Paper model to frontend-compatible format"""
+    owner = paper.owner
     return {
         "id": str(paper.id),
         "title": paper.title,
         "abstract": paper.abstract,
-        "status": paper.status.value if hasattr(paper.status, 'value') else paper.status,
-        "createdAt": paper.created_at.isoformat(),
-        "lastModified": paper.updated_at.isoformat(),
+        "status": _enum_value(paper.status),
+        "createdAt": _iso(paper.created_at),
+        "lastModified": _iso(paper.updated_at),
         "progress": paper.progress,
         "targetWordCount": paper.target_word_count,
         "currentWordCount": paper.current_word_count,
@@ -27,20 +44,20 @@ def transform_paper_for_frontend(paper: Paper) -> Dict[str, Any]:
                 "id": str(section.id),
                 "title": section.title,
                 "content": section.content,
-                "status": section.status.value if hasattr(section.status, 'value') else section.status,
-                "lastModified": section.updated_at.isoformat(),
+                "status": _enum_value(section.status),
+                "lastModified": _iso(section.updated_at),
                 "wordCount": section.word_count,
                 "order": section.order
             }
-            for section in sorted(paper.sections, key=lambda x: x.order)
+            for section in paper.sections
         ],
         "tags": paper.tags or [],
         "isPublic": paper.is_public,
         "owner": {
             "id": str(paper.owner_id),
-            "name": paper.owner.name if paper.owner else "Unknown",
-            "email": paper.owner.email if paper.owner else "",
-        } if hasattr(paper, 'owner') and paper.owner else None
+            "name": owner.name,
+            "email": owner.email,
+        } if owner else None
     }
 
 
@@ -51,8 +68,8 @@ def transform_user_for_frontend(user: User) -> Dict[str, Any]:
         "email": user.email,
         "name": user.name,
         "avatar": user.avatar_url,
-        "createdAt": user.created_at.isoformat(),
-        "lastLoginAt": user.last_login_at.isoformat() if user.last_login_at else None,
+        "createdAt": _iso(user.created_at),
+        "lastLoginAt": _iso(user.last_login_at) if user.last_login_at else None,
         "isActive": user.is_active,
         "personalInfo": {
             "name": user.name,
@@ -1,10 +1,18 @@
 """
-Reset database - Drop and recreate public schema
+Reset database - Drop and recreate public schema, or (--soft) empty every table
 """
+import argparse
 import asyncio
 from sqlalchemy import text
 from app.database.connection import engine
 
+# Every table in the public schema except Alembic's, as one quoted list
+_TRUNCATE_TARGETS_SQL = text("""
+    SELECT string_agg(format('%I.%I', schemaname, tablename), ', ')
+    FROM pg_tables
+    WHERE schemaname = 'public' AND tablename <> 'alembic_version'
+""")
+
 
 async def reset_database():
     """Reset the database schema"""
@@ -33,11 +41,47 @@ async def reset_database():
     return True
 
 
+async def truncate_database():
+    """Empty every table, keeping the schema, indexes and migration state"""
+    try:
+        async with engine.begin() as conn:
+            tables = await conn.scalar(_TRUNCATE_TARGETS_SQL)
+            if not tables:
+                print("ℹ️  No tables to empty")
+                return True
+
+            # One statement for all tables, so foreign keys between them
+            # don't matter and sequences restart together
+            print("🧹 Emptying all tables...")
+            await conn.execute(text(f"TRUNCATE TABLE {tables} RESTART IDENTITY CASCADE"))
+
+            print("✨ Database emptied!")
+            print("\nNext steps:")
+            print("1. python scripts/create_admin.py")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return False
+
+    return True
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reset the development database")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--hard", action="store_true",
+                      help="Drop and recreate the public schema (default; migrations must be re-run)")
+    mode.add_argument("--soft", action="store_true",
+                      help="Delete all rows but keep tables, indexes and migration state")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("⚠️  DATABASE RESET WARNING")
     print("=" * 60)
-    print("This will DELETE ALL TABLES and DATA in the database!")
+    if args.soft:
+        print("This will DELETE ALL DATA in the database (tables are kept)!")
+    else:
+        print("This will DELETE ALL TABLES and DATA in the database!")
     print("Database: research_platform")
     print("=" * 60)
 
@@ -45,6 +89,6 @@ if __name__ == "__main__":
 
     if response.lower() == 'yes':
         print("\n🔄 Starting database reset...\n")
-        asyncio.run(reset_database())
+        asyncio.run(truncate_database() if args.soft else reset_database())
     else:
-        print("\n❌ Operation cancelled. Database unchanged.")
\ No newline at end of file
+        print("\n❌ Operation cancelled. Database unchanged.")
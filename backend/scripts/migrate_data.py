@@ -4,17 +4,20 @@
 Data migration utilities
 """
 import asyncio
-import json
 import sys
+from datetime import datetime
 from pathlib import Path
 
+import orjson
+from sqlalchemy import select
+
 sys.path.append('.')
 
 from app.database.session import async_session_maker
 from app.models.user import User
 from app.models.paper import Paper
 from app.services.auth_service import auth_service
-from app.services.paper_service import paper_service
+from app.services.paper_service import DEFAULT_SECTION_TITLES
 
 
 async def migrate_mock_data():
@@ -59,66 +62,92 @@ async def migrate_mock_data():
 
     async with async_session_maker() as db:
         try:
-            # Create users
-            created_users = []
-            for user_data in sample_users:
-                try:
-                    user = await auth_service.create_user(db=db, **user_data)
-                    created_users.append(user)
-                    print(f"✅ Created user: {user.email}")
-                except Exception as e:
-                    print(f"⚠️ User {user_data['email']} might already exist: {e}")
-
-            # Create papers for first user
+            from sqlalchemy import insert
+            from app.models.paper import PaperSection
+
+            # Skip users that already exist, found with one query
+            existing = set(await db.scalars(
+                select(User.email).where(User.email.in_([u["email"] for u in sample_users]))
+            ))
+            for email in existing:
+                print(f"⚠️ User {email} already exists")
+            new_users = [u for u in sample_users if u["email"] not in existing]
+
+            # Bcrypt hashes are slow, independent and release the GIL, so
+            # they run side by side in worker threads
+            hashes = await asyncio.gather(*(
+                auth_service.aget_password_hash(u["password"]) for u in new_users
+            ))
+            created_users = [
+                User(
+                    hashed_password=hashed_password,
+                    **{key: value for key, value in user_data.items() if key != "password"}
+                )
+                for user_data, hashed_password in zip(new_users, hashes)
+            ]
+            db.add_all(created_users)
+            await db.flush()
+            for user in created_users:
+                print(f"✅ Created user: {user.email}")
+
+            # Create papers for first user, with their default sections in one INSERT
             if created_users:
-                from app.schemas.paper import PaperCreate
-
-                for paper_data in sample_papers:
-                    try:
-                        paper_create = PaperCreate(**paper_data)
-                        paper = await paper_service.create_paper(
-                            db=db,
-                            user_id=created_users[0].id,
-                            paper_data=paper_create
-                        )
-                        print(f"✅ Created paper: {paper.title}")
-                    except Exception as e:
-                        print(f"❌ Failed to create paper: {e}")
-
+                papers = [Paper(owner_id=created_users[0].id, **paper_data) for paper_data in sample_papers]
+                db.add_all(papers)
+                await db.flush()
+
+                await db.execute(insert(PaperSection), [
+                    dict(title=title, order=order, paper_id=paper.id)
+                    for paper in papers
+                    for order, title in enumerate(DEFAULT_SECTION_TITLES, 1)
+                ])
+                for paper in papers:
+                    print(f"✅ Created paper: {paper.title}")
+
+            await db.commit()
             print("🎉 Mock data migration completed!")
 
         except Exception as e:
+            await db.rollback()
             print(f"❌ Migration failed: {e}")
 
 
+# Rows fetched per round-trip while exporting
+EXPORT_BATCH_SIZE = 500
+
+
+async def _write_rows(db, f, model) -> int:
+    """Write every row of model to f as JSON array items, one per line; returns the row count"""
+    count = 0
+    rows = await db.stream_scalars(select(model).execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for row in rows:
+        f.write(b",\n" if count else b"\n")
+        f.write(orjson.dumps(row.to_dict(), default=str))
+        count += 1
+    return count
+
+
 async def export_data(output_file="data_export.json"):
     """Export all data to JSON file"""
     print(f"📤 Exporting data to {output_file}...")
 
     async with async_session_maker() as db:
         try:
-            from sqlalchemy import select
-
-            # Export users (without passwords)
-            users_result = await db.execute(select(User))
-            users = users_result.scalars().all()
-
-            # Export papers
-            papers_result = await db.execute(select(Paper))
-            papers = papers_result.scalars().all()
-
-            export_data = {
-                "users": [user.to_dict() for user in users],
-                "papers": [paper.to_dict() for paper in papers],
-                "export_date": datetime.utcnow().isoformat()
-            }
-
-            with open(output_file, 'w') as f:
-                json.dump(export_data, f, indent=2, default=str)
+            # Rows are streamed from the database straight into the file, so
+            # memory use does not grow with the size of the export. Users
+            # are exported without passwords
+            with open(output_file, 'wb') as f:
+                f.write(b'{"users": [')
+                user_count = await _write_rows(db, f, User)
+                f.write(b'\n], "papers": [')
+                paper_count = await _write_rows(db, f, Paper)
+                f.write(b'\n], "export_date": ')
+                f.write(orjson.dumps(datetime.utcnow().isoformat()))
+                f.write(b'}\n')
 
             print(f"✅ Data exported to {output_file}")
-            print(f"   Users: {len(users)}")
-            print(f"   Papers: {len(papers)}")
+            print(f"   Users: {user_count}")
+            print(f"   Papers: {paper_count}")
 
         except Exception as e:
             print(f"❌ Export failed: {e}")
@@ -126,7 +155,6 @@ async def export_data(output_file="data_export.json"):
 
 if __name__ == "__main__":
     import argparse
-    from datetime import datetime
 
     parser = argparse.ArgumentParser(description="Data migration utilities")
     parser.add_argument("--migrate", action="store_true", help="Migrate mock data")
@@ -9,15 +9,20 @@ import sys
 from pathlib import Path
 
 
-def run_command(command, description="Running command"):
-    """Run shell command with error handling"""
+def run_command(command, description="Running command", capture=False):
+    """Run shell command with error handling
+
+    Output goes straight to the terminal (so pip shows its progress) unless
+    capture is set, in which case it is collected and returned. Uncaptured
+    commands return "" on success; failures return None either way.
+    """
     print(f"\n{description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(command, shell=True, check=True, capture_output=capture, text=True)
         print(f"✓ {description} completed successfully")
-        return result.stdout
+        return result.stdout if capture else ""
     except subprocess.CalledProcessError as e:
-        print(f"✗ {description} failed: {e.stderr}")
+        print(f"✗ {description} failed: {e.stderr if capture else f'exit code {e.returncode}'}")
         return None
 
 
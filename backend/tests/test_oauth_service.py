@@ -0,0 +1,68 @@
+"""
+OAuth token refresh tests (database stubbed)
+"""
+import asyncio
+from datetime import timedelta
+
+from app.models.oauth_token import OAuthToken
+from app.services.oauth_service import OAuthService, _utcnow
+
+
+class _Session:
+    """Stands in for AsyncSession: refresh leaves the in-memory token as it is"""
+
+    async def refresh(self, instance):
+        await asyncio.sleep(0)
+
+
+def _expired_token(refresh_token="refresh"):
+    return OAuthToken(
+        service="google_drive",
+        access_token="access",
+        refresh_token=refresh_token,
+        expires_at=_utcnow() - timedelta(minutes=5),
+    )
+
+
+def test_concurrent_refreshes_share_one_provider_call(monkeypatch):
+    """Callers racing on the same expired token refresh it once"""
+    service = OAuthService()
+    token = _expired_token()
+    calls = []
+
+    async def get_token(db, user_id, name):
+        return token
+
+    async def refresh_google_token(db, refreshed):
+        calls.append(refreshed)
+        await asyncio.sleep(0)
+        refreshed.expires_at = _utcnow() + timedelta(hours=1)
+
+    monkeypatch.setattr(service, "get_token", get_token)
+    monkeypatch.setattr(service, "_refresh_google_token", refresh_google_token)
+
+    async def race():
+        return await asyncio.gather(*(
+            service.refresh_token_if_needed(_Session(), "u1", "google_drive") for _ in range(5)
+        ))
+
+    assert asyncio.run(race()) == [token] * 5
+    assert calls == [token]
+
+
+def test_refresh_locks_are_released_once_unused(monkeypatch):
+    """No lock is left behind for a (user, service) pair after its refresh finishes"""
+    service = OAuthService()
+
+    async def get_token(db, user_id, name):
+        return _expired_token(refresh_token=None)
+
+    monkeypatch.setattr(service, "get_token", get_token)
+
+    async def refresh_many():
+        for i in range(100):
+            await service.refresh_token_if_needed(_Session(), f"u{i}", "google_drive")
+
+    asyncio.run(refresh_many())
+
+    assert len(service._refresh_locks) == 0
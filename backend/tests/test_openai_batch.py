@@ -0,0 +1,84 @@
+"""
+OpenAI batch submission and lookup tests
+"""
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from app.core.exceptions import NotFoundException
+from app.services.openai_service import OpenAIService
+
+METADATA = {"purpose": "generate-all", "paper_id": "p1", "user_id": "u1"}
+
+
+def _service(handler) -> OpenAIService:
+    service = OpenAIService()
+    service.enabled = True
+    service._client = httpx.AsyncClient(base_url="https://api.openai.com", transport=httpx.MockTransport(handler))
+    return service
+
+
+def _batch_handler(stored_metadata):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/batches/batch_1":
+            return httpx.Response(200, json={
+                "id": "batch_1",
+                "status": "completed",
+                "output_file_id": "file_out",
+                "metadata": stored_metadata,
+            })
+        if request.url.path == "/v1/files/file_out/content":
+            line = {"custom_id": "s1", "response": {"body": {"choices": [{"message": {"content": "Draft"}}]}}}
+            return httpx.Response(200, content=orjson.dumps(line))
+        return httpx.Response(404)
+    return handler
+
+
+def test_fetch_batch_returns_results_when_metadata_matches():
+    """The owner of the batch gets its drafts back"""
+    service = _service(_batch_handler(METADATA))
+
+    batch = asyncio.run(service.fetch_batch("batch_1", metadata=METADATA))
+
+    assert batch["results"] == {"s1": "Draft"}
+
+
+@pytest.mark.parametrize("metadata", [
+    {**METADATA, "paper_id": "p2"},
+    {**METADATA, "user_id": "u2"},
+])
+def test_fetch_batch_hides_batches_of_other_papers_and_users(metadata):
+    """A known batch ID doesn't expose drafts through another paper or user"""
+    service = _service(_batch_handler(METADATA))
+
+    with pytest.raises(NotFoundException):
+        asyncio.run(service.fetch_batch("batch_1", metadata=metadata))
+
+
+def test_fetch_batch_requires_enabled_service():
+    """fetch_batch refuses to call OpenAI without a configured key, like submit_batch"""
+    service = _service(_batch_handler(METADATA))
+    service.enabled = False
+
+    with pytest.raises(Exception, match="not enabled"):
+        asyncio.run(service.fetch_batch("batch_1", metadata=METADATA))
+
+
+def test_submit_batch_tags_batch_with_metadata():
+    """The metadata passed to submit_batch is stored on the created batch"""
+    requests = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests[request.url.path] = request
+        if request.url.path == "/v1/files":
+            return httpx.Response(200, json={"id": "file_in"})
+        return httpx.Response(200, json={"id": "batch_1"})
+
+    service = _service(handler)
+    jobs = [{"custom_id": "s1", "body": {"model": "gpt-3.5-turbo"}}]
+
+    assert asyncio.run(service.submit_batch(jobs, metadata=METADATA)) == "batch_1"
+    assert orjson.loads(requests["/v1/batches"].content)["metadata"] == METADATA
+    assert b'"custom_id":"s1"' in requests["/v1/files"].content
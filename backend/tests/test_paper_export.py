@@ -0,0 +1,92 @@
+"""
+Paper export service tests
+"""
+import asyncio
+import io
+from datetime import datetime
+from types import SimpleNamespace
+
+from docx import Document
+
+from app.services import paper_export_service as export_module
+from app.services.paper_export_service import PaperExportService
+
+
+def _paper(co_authors):
+    section = SimpleNamespace(title="Introduction", content="Hello", updated_at=datetime(2026, 1, 2))
+    return SimpleNamespace(
+        id="p1",
+        title="A Paper",
+        abstract="",
+        co_authors=co_authors,
+        sections=[section],
+        updated_at=datetime(2026, 1, 1),
+    )
+
+
+def _export(service, paper, fmt):
+    stream = asyncio.run(service.export(paper, fmt))
+    try:
+        return stream.read()
+    finally:
+        stream.close()
+
+
+def _count_writes(service, fmt):
+    calls = []
+    write = service._writers[fmt]
+
+    def counting_write(paper, out):
+        calls.append(paper)
+        write(paper, out)
+
+    service._writers[fmt] = counting_write
+    return calls
+
+
+def test_unchanged_paper_is_served_from_cache():
+    """A second export of the same paper state is not rendered again"""
+    service = PaperExportService()
+    calls = _count_writes(service, "latex")
+    paper = _paper(["Owner"])
+
+    first = _export(service, paper, "latex")
+    second = _export(service, paper, "latex")
+
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_author_change_invalidates_cached_export():
+    """Accepting a collaborator changes the author line, so the export is rebuilt"""
+    service = PaperExportService()
+
+    before = _export(service, _paper(["Owner"]), "latex")
+    after = _export(service, _paper(["Owner", "Collaborator"]), "latex")
+
+    assert b"Collaborator" not in before
+    assert b"Collaborator" in after
+
+
+def test_exports_past_the_spool_size_are_streamed_and_not_cached(monkeypatch):
+    """Large exports come back from the spilled spool file and stay out of the cache"""
+    monkeypatch.setattr(export_module, "EXPORT_SPOOL_MAX_SIZE", 64)
+    service = PaperExportService()
+    calls = _count_writes(service, "latex")
+
+    first = _export(service, _paper(["Owner"]), "latex")
+    second = _export(service, _paper(["Owner"]), "latex")
+
+    assert first == second and first.endswith(b"\\end{document}")
+    assert len(calls) == 2
+    assert not service._cache
+
+
+def test_word_export_is_dated_by_last_edit():
+    """The rendered date is the paper's last edit, not the time of export"""
+    service = PaperExportService()
+
+    data = _export(service, _paper(["Owner"]), "word")
+
+    texts = [paragraph.text for paragraph in Document(io.BytesIO(data)).paragraphs]
+    assert "January 02, 2026" in texts
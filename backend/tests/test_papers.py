@@ -0,0 +1,59 @@
+"""
+Paper list endpoint tests (service stubbed)
+"""
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi import Response
+
+from app.api.v1.endpoints import papers as papers_endpoint
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.models.paper import PaperStatus
+from app.services.paper_service import _decode_paper_cursor
+
+
+def _paper(day):
+    return SimpleNamespace(
+        id=uuid.uuid4(), title=f"Paper {day}", status=PaperStatus.DRAFT, progress=0,
+        created_at=datetime(2026, 1, 1), updated_at=datetime(2026, 1, day),
+        current_word_count=0, target_word_count=8000, research_area=None, tags=[],
+        is_public=False, deadline=None, collaborators=[],
+    )
+
+
+def _get_papers(monkeypatch, stored, **params):
+    calls = []
+
+    async def get_user_papers(**kwargs):
+        calls.append(kwargs)
+        return stored[:kwargs["limit"]]
+
+    monkeypatch.setattr(papers_endpoint.paper_service, "get_user_papers", get_user_papers)
+    response = Response()
+    query = dict(status_filter=None, research_area=None, search=None, skip=0, limit=50, cursor=None)
+    query.update(params)
+    body = asyncio.run(papers_endpoint.get_papers(
+        response=response, current_user=SimpleNamespace(id="u1"), db=None, **query
+    ))
+    return body, response, calls
+
+
+def test_get_papers_returns_a_list_with_next_cursor_header(monkeypatch):
+    """The body stays a bare list; the cursor for the following page is a header"""
+    stored = [_paper(day) for day in (5, 4, 3)]
+
+    body, response, calls = _get_papers(monkeypatch, stored, skip=10, limit=2)
+
+    assert isinstance(body, list) and [p.title for p in body] == ["Paper 5", "Paper 4"]
+    assert calls[0]["skip"] == 10 and calls[0]["limit"] == 3
+    assert _decode_paper_cursor(response.headers[NEXT_CURSOR_HEADER]) == (stored[1].updated_at, stored[1].id)
+
+
+def test_get_papers_last_page_has_no_cursor_header(monkeypatch):
+    """No header once every remaining paper fits in the page"""
+    body, response, _ = _get_papers(monkeypatch, [_paper(1)], limit=2)
+
+    assert len(body) == 1
+    assert NEXT_CURSOR_HEADER not in response.headers
@@ -0,0 +1,50 @@
+"""
+PDF analyzer tests
+"""
+import pytest
+from reportlab.pdfgen import canvas
+
+from app.services.pdf_analyzer import PDFAnalyzer
+
+LINES = ["Preamble text here.", "1. Introduction", "Some body text.", "Related Work", "More text here.", "METHODS", "Body."]
+
+
+def test_pdfium_crlf_line_breaks_keep_section_headings(tmp_path):
+    """PDFium's \\r\\n line ends are normalized, so every heading style is still detected"""
+    pytest.importorskip("pypdfium2")
+    path = tmp_path / "paper.pdf"
+    pdf = canvas.Canvas(str(path))
+    for i, line in enumerate(LINES):
+        pdf.drawString(72, 800 - 20 * i, line)
+    pdf.save()
+
+    analyzer = PDFAnalyzer()
+    assert analyzer.backend == "pdfium"
+    text = analyzer.extract_text_from_pdf(str(path))
+
+    assert "\r" not in text
+    assert analyzer._extract_section_structure(text) == ["1. Introduction", "Related Work", "METHODS"]
+
+
+# Citations that end sentences, a passive inside a capitalized phrase, "3.5"
+# and technical terms tied on count: the cases where combined scans drift
+STYLE_TEXT = (
+    "Data Is Collected from the Survey Panel (Smith, 2020). The results were analyzed "
+    "in detail [3]. Each sample was being processed twice; accuracy rose by 3.5 points! "
+    "Was the representation of the transformation stable? The Survey Panel was expanded "
+    "and the representation improved. Reproducibility was tested (Jones et al., 2019)."
+)
+
+
+def test_writing_style_metrics_match_the_per_feature_scans():
+    """Each metric counts all of its own matches, as the original separate scans did"""
+    features = PDFAnalyzer().analyze_writing_style(STYLE_TEXT)
+
+    assert features["avg_sentence_length"] == 6.5  # 52 words over 8 sentences
+    assert features["passive_voice_ratio"] == pytest.approx(5 / 9)
+    assert features["citation_density"] == 60.0
+    assert features["technical_terms"] == [
+        "representation", "data is collected", "survey panel", "the survey panel",
+        "transformation", "reproducibility",
+    ]
+    assert (features["word_count"], features["unique_words"]) == (50, 39)
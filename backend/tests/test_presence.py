@@ -0,0 +1,54 @@
+"""
+Presence service tests
+"""
+import asyncio
+import time
+
+from app.services.presence_service import PresenceService, ONLINE_SECONDS, AWAY_SECONDS
+
+
+def test_heartbeats_keep_tracking_state_bounded():
+    """Repeated heartbeats from one user leave a single tracked entry"""
+    presence = PresenceService()
+
+    for _ in range(10_000):
+        presence.mark_active("u1")
+
+    assert presence.get_online_count() == 1
+
+    # No per-heartbeat state accumulates in any of the service's containers
+    for name, value in vars(presence).items():
+        if isinstance(value, (list, dict, set)):
+            assert len(value) <= 1, name
+
+
+def _mark_active_at(monkeypatch, presence, user_id, at):
+    monkeypatch.setattr(time, "time", lambda: at)
+    presence.mark_active(user_id)
+
+
+def test_online_count_excludes_expired_and_inactive_users(monkeypatch):
+    """Users past the online window or marked inactive are not counted"""
+    now = time.time()
+    presence = PresenceService()
+    _mark_active_at(monkeypatch, presence, "u2", now - ONLINE_SECONDS - 1)
+    _mark_active_at(monkeypatch, presence, "u1", now)
+    _mark_active_at(monkeypatch, presence, "u3", now)
+    presence.mark_inactive("u3")
+
+    assert presence.get_online_count() == 1
+
+
+def test_repeat_heartbeat_moves_user_back_into_the_online_window(monkeypatch):
+    """A user seen long ago and then again now counts as online, wherever they were first seen"""
+    now = time.time()
+    presence = PresenceService()
+    _mark_active_at(monkeypatch, presence, "u1", now - AWAY_SECONDS - 1)
+    _mark_active_at(monkeypatch, presence, "u2", now - ONLINE_SECONDS - 1)
+    _mark_active_at(monkeypatch, presence, "u1", now)
+
+    assert presence.get_online_count() == 1
+    online_users = asyncio.run(presence.get_online_users(db=None))
+    assert {user_id: info['status'] for user_id, info in online_users.items()} == {
+        "u1": "online", "u2": "away"
+    }
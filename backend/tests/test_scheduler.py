@@ -0,0 +1,87 @@
+"""
+Scheduler job tests (database session and email provider stubbed)
+"""
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy.sql.dml import Update
+
+from app.services import scheduler_service as scheduler_module
+from app.services.email_service import email_service
+
+
+class _Result:
+    def __init__(self, users):
+        self._users = users
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._users
+
+
+class _Session:
+    """AsyncSession stand-in: the first execute is the users SELECT, the rest are cursor UPDATEs"""
+
+    def __init__(self, users):
+        self.users = users
+        self.updates = []
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        if isinstance(statement, Update):
+            self.updates.append(statement)
+            return None
+        return _Result(self.users)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _user():
+    paper = SimpleNamespace(id=uuid.uuid4(), title="A Paper", progress=40, current_word_count=1200)
+    return SimpleNamespace(id=uuid.uuid4(), email="user@example.com", name="User", papers=[paper])
+
+
+def _run_job(monkeypatch, job_name):
+    session = _Session([_user()])
+    sent = []
+
+    async def send_email(to_email, subject, html_content, text_content=None):
+        sent.append((to_email, subject, html_content))
+        return {'success': True, 'to': to_email, 'subject': subject, 'id': 'email_1'}
+
+    monkeypatch.setattr(scheduler_module, "async_session_maker", lambda: session)
+    monkeypatch.setattr(email_service, "send_email", send_email)
+
+    asyncio.run(getattr(scheduler_module.SchedulerService(), job_name)())
+    return session, sent
+
+
+def test_weekly_report_is_sent_and_advances_cursor(monkeypatch):
+    """A due user gets the weekly report and their last_weekly_report_at moves forward"""
+    session, sent = _run_job(monkeypatch, "send_weekly_reports")
+
+    assert len(sent) == 1
+    assert "1200" in sent[0][2] and "A Paper" in sent[0][2]
+    assert len(session.updates) == 1
+    assert "last_weekly_report_at" in session.updates[0].compile().params
+    assert session.commits == 1
+
+
+def test_ai_suggestions_are_sent_and_advance_cursor(monkeypatch):
+    """A due user gets AI suggestions for their paper and their last_ai_suggestion_at moves forward"""
+    session, sent = _run_job(monkeypatch, "generate_ai_suggestions")
+
+    assert len(sent) == 1
+    assert sent[0][1] == "AI Suggestions: A Paper"
+    assert len(session.updates) == 1
+    assert "last_ai_suggestion_at" in session.updates[0].compile().params
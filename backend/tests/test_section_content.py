@@ -0,0 +1,28 @@
+"""
+Section content endpoint tests (service stubbed)
+"""
+import asyncio
+from types import SimpleNamespace
+
+from app.api.v1.endpoints import chat
+from app.models.paper import SectionStatus
+
+
+def test_section_content_comes_from_the_single_section_lookup(monkeypatch):
+    """Word count and status come from the section the service found, with no second paper load"""
+    section = SimpleNamespace(content="Intro text", word_count=2, status=SectionStatus.IN_PROGRESS)
+
+    async def get_section_content(db, paper_id, section_type, user_id):
+        return section
+
+    monkeypatch.setattr(chat.section_content_service, "get_section_content", get_section_content)
+
+    # db=None: any further query through the session would fail the test
+    response = asyncio.run(chat.get_section_content(
+        paper_id="p1",
+        section_type="introduction",
+        current_user=SimpleNamespace(id="u1"),
+        db=None
+    ))
+
+    assert (response.content, response.wordCount, response.status) == ("Intro text", 2, "in-progress")
@@ -0,0 +1,188 @@
+"""
+user_paper_stats trigger tests
+
+The concurrency test needs a PostgreSQL database migrated to head; the rest
+replay the trigger's deltas in Python and run without one.
+"""
+import asyncio
+import os
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.models.analytics import UserPaperStats
+from app.models.paper import Paper, PaperStatus
+from app.models.user import User
+from app.services.paper_service import paper_service
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+requires_database = pytest.mark.skipif(
+    not TEST_DATABASE_URL,
+    reason="set TEST_DATABASE_URL to a PostgreSQL database migrated with 'alembic upgrade head'",
+)
+
+PAPERS = 8
+
+
+async def _update_paper(engine, paper_id, index):
+    """Change one paper's aggregated fields and hold the transaction open"""
+    async with engine.begin() as conn:
+        await conn.execute(
+            update(Paper).where(Paper.id == paper_id).values(
+                current_word_count=100 * (index + 1),
+                progress=10 * index,
+                status=PaperStatus.ARCHIVED if index % 2 else PaperStatus.IN_PROGRESS,
+                research_area=f"area-{index % 3}",
+            )
+        )
+        # Overlap with the other writers before committing
+        await asyncio.sleep(0.05)
+
+
+async def _run_concurrent_updates():
+    engine = create_async_engine(TEST_DATABASE_URL, pool_size=PAPERS)
+    user_id = uuid.uuid4()
+    paper_ids = [uuid.uuid4() for _ in range(PAPERS)]
+
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(User.__table__.insert().values(
+                id=user_id, email=f"{user_id}@example.com", name="Stats Test", hashed_password="x",
+            ))
+            await conn.execute(Paper.__table__.insert(), [
+                {"id": paper_id, "title": f"Paper {i}", "owner_id": user_id}
+                for i, paper_id in enumerate(paper_ids)
+            ])
+
+        await asyncio.gather(*(
+            _update_paper(engine, paper_id, i) for i, paper_id in enumerate(paper_ids)
+        ))
+
+        async with engine.connect() as conn:
+            stats = (await conn.execute(
+                select(UserPaperStats.__table__).where(UserPaperStats.user_id == user_id)
+            )).one()
+            active = Paper.status != PaperStatus.ARCHIVED
+            expected = (await conn.execute(
+                select(
+                    func.count(),
+                    func.sum(Paper.current_word_count),
+                    func.coalesce(func.sum(Paper.progress).filter(active), 0),
+                    func.count().filter(active),
+                ).where(Paper.owner_id == user_id)
+            )).one()
+            by_status = dict((await conn.execute(
+                select(Paper.status, func.count()).where(Paper.owner_id == user_id).group_by(Paper.status)
+            )).all())
+            by_area = dict((await conn.execute(
+                select(Paper.research_area, func.count()).where(Paper.owner_id == user_id)
+                .group_by(Paper.research_area)
+            )).all())
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(delete(Paper).where(Paper.owner_id == user_id))
+            await conn.execute(delete(User).where(User.id == user_id))
+        await engine.dispose()
+
+    assert (stats.total_papers, stats.total_words, stats.progress_sum, stats.active_count) == tuple(expected)
+    assert stats.by_status == {status.name: count for status, count in by_status.items()}
+    assert stats.by_research_area == by_area
+
+
+@requires_database
+def test_concurrent_updates_to_one_owners_papers_keep_stats_exact():
+    """Overlapping transactions on different papers of one owner all land in the stats row"""
+    asyncio.run(_run_concurrent_updates())
+
+
+def _jsonb_add_count(counts, key, delta):
+    """Python mirror of the migration's jsonb_add_count"""
+    if key is None:
+        return counts
+    total = counts.get(key, 0) + delta
+    if total <= 0:
+        return {k: v for k, v in counts.items() if k != key}
+    return {**counts, key: total}
+
+
+def _add_paper(stats, sign, status, area, words, progress):
+    """Python mirror of add_user_paper_stats: one paper's contribution, added or removed"""
+    active = 1 if status.name != "ARCHIVED" else 0
+    stats.total_papers += sign
+    stats.total_words += sign * words
+    stats.progress_sum += sign * active * progress
+    stats.active_count += sign * active
+    # status::text on the papers enum is the member name
+    stats.by_status = _jsonb_add_count(stats.by_status, status.name, sign)
+    stats.by_research_area = _jsonb_add_count(stats.by_research_area, area or None, sign)
+
+
+class _StatsSession:
+    """Serves the summary row to db.get, or the grouped fallback rows to db.execute"""
+
+    def __init__(self, stats=None, rows=()):
+        self.stats = stats
+        self.rows = rows
+
+    async def get(self, model, key):
+        return self.stats
+
+    async def execute(self, statement):
+        return self.rows
+
+
+def _grouped_rows(papers):
+    groups = {}
+    for status, area, words, progress in papers:
+        group = groups.setdefault((status, area), SimpleNamespace(
+            status=status, research_area=area, count=0, total_words=0, progress_sum=0, active_count=0
+        ))
+        active = status != PaperStatus.ARCHIVED
+        group.count += 1
+        group.total_words += words
+        group.progress_sum += progress if active else 0
+        group.active_count += active
+    return list(groups.values())
+
+
+def test_status_column_stores_the_member_names_the_trigger_keys_on():
+    """by_status keys and the trigger's 'ARCHIVED' check are enum names, as PaperStatus[name] expects"""
+    assert Paper.__table__.c.status.type.enums == [status.name for status in PaperStatus]
+
+
+def test_summary_row_matches_the_on_demand_aggregate():
+    """Statistics from the trigger-maintained row equal those grouped from the papers"""
+    papers = [
+        (PaperStatus.IN_PROGRESS, "nlp", 100, 20),
+        (PaperStatus.IN_PROGRESS, "nlp", 200, 40),
+        (PaperStatus.DRAFT, "vision", 50, 0),
+        (PaperStatus.PUBLISHED, "", 300, 100),
+    ]
+    stats = UserPaperStats(
+        total_papers=0, total_words=0, progress_sum=0, active_count=0, by_status={}, by_research_area={}
+    )
+    for paper in papers:
+        _add_paper(stats, 1, *paper)
+
+    # An update subtracts the old row and adds the new one; the draft's
+    # status and area counts drop to zero and their keys are removed
+    archived = (PaperStatus.ARCHIVED, "nlp", 60, 0)
+    _add_paper(stats, -1, *papers[2])
+    _add_paper(stats, 1, *archived)
+    papers[2] = archived
+
+    user_id = str(uuid.uuid4())
+    from_summary = asyncio.run(paper_service.get_paper_statistics(_StatsSession(stats=stats), user_id))
+    aggregated = asyncio.run(paper_service.get_paper_statistics(
+        _StatsSession(rows=_grouped_rows(papers)), user_id
+    ))
+
+    assert stats.by_status == {"IN_PROGRESS": 2, "PUBLISHED": 1, "ARCHIVED": 1}
+    assert stats.by_research_area == {"nlp": 3}
+    assert from_summary == aggregated
+    assert from_summary["status_breakdown"] == {"in-progress": 2, "published": 1, "archived": 1}
+    assert from_summary["average_progress"] == 53.33